@@ -1,53 +1,927 @@
 import os
 import sys
-import shutil
-import tempfile
-import requests
-import pandas as pd
-import numpy as np
+import argparse
 from time import sleep
 from random import randint
 from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.error import HTTPError, URLError
 
+# Heavy modules (pandas, numpy, requests, bs4, shutil, tempfile) are imported
+# inside the functions that use them so each mode only loads what it needs.
+# "python -X importtime" startup is tracked by the "bench startup" mode
+
+# Startup budgets (milliseconds) checked by bench_startup(), counting only
+# the modules a bare interpreter doesn't already import. The best of
+# STARTUP_RUNS runs is kept
+STARTUP_BUDGET_MS = {"help": 100, "import": 100}
+STARTUP_RUNS = 3
+# Modules that must not be loaded by the startup paths checked in the bench
+STARTUP_BANNED_MODULES = ["pandas", "numpy", "requests", "bs4"]
+# Bracket simulations per second bench_sim() expects from a single core
+SIM_BUDGET_PER_SEC = 1000000
+# Seconds a season's bootstrap intervals may take (also the bench budget)
+BOOTSTRAP_BUDGET_S = 5.0
+# Milliseconds validating a million raw stat rows may take (bench_validate())
+VALIDATE_BUDGET_MS = 500
+
+# Counting stat columns summed into team stats
+TEAM_COUNT_COLS = {
+    "BP": [
+        "PA",
+        "AB",
+        "R",
+        "H",
+        "2B",
+        "3B",
+        "HR",
+        "TB",
+        "RBI",
+        "SB",
+        "CS",
+        "SH",
+        "SF",
+        "SO",
+        "BB",
+        "IBB",
+        "HP",
+        "GDP",
+    ],
+    "PP": [
+        "W",
+        "L",
+        "SV",
+        "CG",
+        "SHO",
+        "BF",
+        "IP",
+        "H",
+        "HR",
+        "SO",
+        "BB",
+        "IBB",
+        "HB",
+        "WP",
+        "R",
+        "ER",
+    ],
+}
+
+# Parsed /input/ csvs and lookup tables built from them, keyed by file path
+# and reused until the file's mtime changes (see read_input_csv())
+INPUT_CACHE = {}
+LOOKUP_CACHE = {}
+# wOBA linear weights keyed by (year, league), reused while the league's
+# counting stat totals are unchanged (see get_linear_weights())
+LINEAR_WEIGHTS_CACHE = {}
+
+# Input files that each cached stage is built from (see StatCache). "org"
+# also depends on the year's raw stat file
+STAGE_INPUTS = {
+    "org": ["parkFactors.csv", "fipConst.csv", "teams.csv"],
+    "playerOut": [
+        "nameTranslations.csv",
+        "playerUrls.csv",
+        "playerUrlsFix.csv",
+        "teams.csv",
+    ],
+    "teamOut": ["teams.csv"],
+}
+# What an edit to each watched /input/ file invalidates: the stages to
+# rebuild, the stat types affected (every suffix of those types, see
+# STAT_SUFFIXES) and whether only the years whose rows changed (by the csv's
+# Year column) need rebuilding
+WATCH_INPUTS = {
+    "nameTranslations.csv": {
+        "stages": ["playerOut"],
+        "statTypes": ["BP", "PP"],
+        "byYear": False,
+    },
+    "playerUrls.csv": {
+        "stages": ["playerOut"],
+        "statTypes": ["BP", "PP"],
+        "byYear": False,
+    },
+    "playerUrlsFix.csv": {
+        "stages": ["playerOut"],
+        "statTypes": ["BP", "PP"],
+        "byYear": True,
+    },
+    "teams.csv": {
+        "stages": ["org", "playerOut", "teamOut"],
+        "statTypes": ["BP", "PP"],
+        "byYear": False,
+    },
+    "parkFactors.csv": {
+        "stages": ["org"],
+        "statTypes": ["BP", "PP"],
+        "byYear": True,
+    },
+    "fipConst.csv": {"stages": ["org"], "statTypes": ["PP"], "byYear": True},
+}
+# Warehouse table names by (suffix, player/team stats)
+WAREHOUSE_TABLES = {
+    ("BP", "player"): "player_bat",
+    ("PP", "player"): "player_pitch",
+    ("BP", "team"): "team_bat",
+    ("PP", "team"): "team_pitch",
+    ("BP", "partial"): "partial_bat",
+    ("PP", "partial"): "partial_pitch",
+}
+# Additive per player-season columns used to merge seasons: counting stats
+# plus league context weighted by playing time (see get_season_partials())
+PARTIAL_COLS = {
+    "BP": TEAM_COUNT_COLS["BP"]
+    + ["G", "PAxLgOBP", "ABxLgSLG", "PAxParkF"]
+    + ["wOBAxDenom", "PAxLgwOBA", "PAxwOBAScale", "PAxLgRPA"],
+    "PP": TEAM_COUNT_COLS["PP"]
+    + ["G", "IPxLgERAxPF", "IPxFIPConst", "IPxLgFIPxPF", "BFxLgkwERA"],
+}
+# Post season series codes used in npb.jp stat page URLs ("idb1s1_t.html")
+# in the order they're played
+SERIES_NAMES = {
+    "s1": "Climax Series First Stage",
+    "s2": "Climax Series Final Stage",
+    "ns": "Japan Series",
+}
+# Box score table headers mapped to raw stat columns
+BOX_SCORE_COLS = {
+    "BP": {
+        "打席": "PA",
+        "打数": "AB",
+        "得点": "R",
+        "安打": "H",
+        "二塁打": "2B",
+        "三塁打": "3B",
+        "本塁打": "HR",
+        "塁打": "TB",
+        "打点": "RBI",
+        "盗塁": "SB",
+        "盗塁刺": "CS",
+        "犠打": "SH",
+        "犠飛": "SF",
+        "四球": "BB",
+        "故意四球": "IBB",
+        "死球": "HP",
+        "三振": "SO",
+        "併殺打": "GDP",
+    },
+    "PP": {
+        "打者": "BF",
+        "投球回": "IP",
+        "安打": "H",
+        "本塁打": "HR",
+        "四球": "BB",
+        "故意四球": "IBB",
+        "死球": "HB",
+        "三振": "SO",
+        "暴投": "WP",
+        "失点": "R",
+        "自責点": "ER",
+    },
+}
+# Box score pitcher decision marks mapped to the stat they count towards
+BOX_SCORE_DECISIONS = {"○": "W", "●": "L", "S": "SV"}
+# Raw stat file checks (see validate_raw_stats()). Text npb.jp puts in
+# numeric columns: "+" IP (batters faced without an out) and "----" ERA
+RAW_SENTINELS = {"IP": ["+"], "ERA": ["----"]}
+# Inclusive value ranges (G is limited by the suffix's maxGames), every
+# other numeric raw column is a count (>= 0). "" is the column npb.jp splits
+# IP decimals into
+RAW_RANGES = {
+    "BP": {"AVG": (0, 1), "OBP": (0, 1), "SLG": (0, 4)},
+    "PP": {"PCT": (0, 1), "": (0.1, 0.2)},
+}
+# Raw columns that aren't counts (rates, IP and its decimals)
+RAW_NON_COUNT_COLS = ["AVG", "SLG", "OBP", "PCT", "ERA", "IP", ""]
+# Cross field invariants: a column compared (">=" or "==") with a weighted
+# sum of other columns
+RAW_INVARIANTS = {
+    "BP": [
+        ("PA", ">=", {"AB": 1, "BB": 1, "HP": 1, "SH": 1, "SF": 1}),
+        ("AB", ">=", {"H": 1}),
+        ("H", ">=", {"2B": 1, "3B": 1, "HR": 1}),
+        ("TB", "==", {"H": 1, "2B": 1, "3B": 2, "HR": 3}),
+    ],
+    "PP": [
+        ("BF", ">=", {"H": 1, "BB": 1, "HB": 1}),
+        ("R", ">=", {"ER": 1}),
+        ("H", ">=", {"HR": 1}),
+        ("G", ">=", {"W": 1, "L": 1}),
+        ("G", ">=", {"CG": 1}),
+    ],
+}
+# Expected record exponents: fixed Pythagorean (matches the standings
+# files' XPCT) and the Pythagenpat run environment exponent
+PYTHAG_EXP = 1.83
+PYTHAGENPAT_EXP = 0.287
+# Wins the higher and lower seed need to take each post season series. The
+# Final Stage is a best of 6 where the first place team starts with a win
+BRACKET_SERIES = {"s1": (2, 2), "s2": (3, 4), "ns": (4, 4)}
+# Simulated brackets drawn at once (bounds the memory of a simulation run)
+SIM_BATCH_SIZE = 1000000
+# Bootstrap resamples per player, drawn in chunks until done or out of time
+BOOTSTRAP_SAMPLES = 2000
+BOOTSTRAP_CHUNK = 250
+# Central interval width of the bootstrap columns (5% to 95%)
+BOOTSTRAP_LEVEL = 0.9
+# Plate appearance outcomes reconstructed from the counting stats
+BOOTSTRAP_OUTCOMES = {
+    "BP": ["1B", "2B", "3B", "HR", "BB", "HP", "SO", "SF", "SH", "Out"],
+    "PP": ["HR", "Hit", "BB", "HB", "SO", "Out"],
+}
+# Rollup cube grains mapped to their key columns. Every grain's cells are
+# sums of the finest cells (a player in one series)
+CUBE_GRAINS = {
+    "year": ["Year"],
+    "league": ["Year", "League"],
+    "team": ["Year", "League", "Team"],
+    "player": ["Year", "League", "Team", "PlayerID", "Name"],
+    "series": ["Year", "Series"],
+    "seriesLeague": ["Year", "Series", "League"],
+    "seriesTeam": ["Year", "Series", "League", "Team"],
+    "seriesPlayer": ["Year", "Series", "League", "Team", "PlayerID", "Name"],
+}
+# Bump when the warehouse tables change so stale seasons get reloaded
+WAREHOUSE_VERSION = 6
+# Bump when the calibration formulas change so stored calibrations are redone
+CALIBRATION_VERSION = 1
+# Regressed park factors blend a team's recent seasons (most recent first,
+# Marcel style weights) with this much weight on a neutral 1.000 park
+PARK_FACTOR_WEIGHTS = [5, 4, 3]
+PARK_FACTOR_NEUTRAL_WEIGHT = 3
+# fipConst.csv/parkFactors.csv league of applied calibrated rows, used over
+# the reg season "NPB" rows when a year has them
+CALIBRATED_LEAGUE = "Post"
+# Stat file suffixes (P post season, R reg season, F farm) and what drives
+# them: the BP/PP schema their files use, their fipConst.csv/parkFactors.csv
+# leagues in order of preference, the teams.csv levels and league column of
+# their teams and a player's most games played (raw file checks)
+STAT_SUFFIXES = {
+    "BP": {
+        "stats": "BP",
+        "name": "post season batting",
+        "constants": [CALIBRATED_LEAGUE, "NPB"],
+        "levels": ["NPB"],
+        "leagueCol": "League",
+        "maxGames": 9,
+    },
+    "PP": {
+        "stats": "PP",
+        "name": "post season pitching",
+        "constants": [CALIBRATED_LEAGUE, "NPB"],
+        "levels": ["NPB"],
+        "leagueCol": "League",
+        "maxGames": 9,
+    },
+    "BR": {
+        "stats": "BP",
+        "name": "reg season batting",
+        "constants": ["NPB"],
+        "levels": ["NPB"],
+        "leagueCol": "League",
+        "maxGames": 143,
+    },
+    "PR": {
+        "stats": "PP",
+        "name": "reg season pitching",
+        "constants": ["NPB"],
+        "levels": ["NPB"],
+        "leagueCol": "League",
+        "maxGames": 143,
+    },
+    "BF": {
+        "stats": "BP",
+        "name": "farm batting",
+        "constants": ["Farm"],
+        "levels": ["NPB", "Farm"],
+        "leagueCol": "FarmLeague",
+        "maxGames": 150,
+    },
+    "PF": {
+        "stats": "PP",
+        "name": "farm pitching",
+        "constants": ["Farm"],
+        "levels": ["NPB", "Farm"],
+        "leagueCol": "FarmLeague",
+        "maxGames": 150,
+    },
+}
+# Columns indexed in every warehouse table (if the table has them)
+WAREHOUSE_INDEXES = ["PlayerID", "Team", "Year", "League"]
+# Leaderboard qualification per team game (NPB's 3.1 PA and 1 IP rules)
+LEADER_PA_PER_GAME = 3.1
+LEADER_IP_PER_GAME = 1.0
+# Leaderboard stats mapped to whether lower values lead. Counting stats
+# (TEAM_COUNT_COLS) list every player, rate stats only qualified players
+LEADER_STATS = {
+    "BP": {
+        "AVG": False,
+        "OBP": False,
+        "SLG": False,
+        "OPS": False,
+        "OPS+": False,
+        "wOBA": False,
+        "wRC+": False,
+        "ISO": False,
+        "BABIP": False,
+        "K%": True,
+        "BB%": False,
+        "BB/K": False,
+        "H": False,
+        "HR": False,
+        "RBI": False,
+        "R": False,
+        "SB": False,
+        "BB": False,
+    },
+    "PP": {
+        "ERA": True,
+        "FIP": True,
+        "kwERA": True,
+        "WHIP": True,
+        "ERA+": False,
+        "FIP-": True,
+        "kwERA-": True,
+        "HR%": True,
+        "K%": False,
+        "BB%": True,
+        "K-BB%": False,
+        "W": False,
+        "SV": False,
+        "SO": False,
+        "IP": False,
+    },
+}
+# Number formats of the series leaderboards (built from cube sums, season
+# leaderboards use the final files' formatting)
+LEADER_FORMATS = {
+    "BP": {
+        "AVG": "{:.3f}",
+        "OBP": "{:.3f}",
+        "SLG": "{:.3f}",
+        "OPS": "{:.3f}",
+        "OPS+": "{:.0f}",
+        "wOBA": "{:.3f}",
+        "wRC+": "{:.0f}",
+        "ISO": "{:.3f}",
+        "BABIP": "{:.3f}",
+        "K%": "{:.1%}",
+        "BB%": "{:.1%}",
+        "BB/K": "{:.2f}",
+    },
+    "PP": {
+        "ERA": "{:.2f}",
+        "FIP": "{:.2f}",
+        "kwERA": "{:.2f}",
+        "WHIP": "{:.2f}",
+        "ERA+": "{:.0f}",
+        "FIP-": "{:.0f}",
+        "kwERA-": "{:.0f}",
+        "HR%": "{:.1%}",
+        "K%": "{:.1%}",
+        "BB%": "{:.1%}",
+        "K-BB%": "{:.1%}",
+        "IP": "{:.1f}",
+    },
+}
+# Bump when the exported JSON layout changes
+EXPORT_VERSION = 1
+# The npb/ tables exported by export mode ([year][table].csv)
+EXPORT_TABLES = ["StatsFinalBP", "StatsFinalPP", "TeamBP", "TeamPP"]
+# Exported name columns that hold <a> tags, split into name and link fields
+EXPORT_LINK_COLS = ["Player", "Pitcher", "Team"]
+# Final file columns left out of the export (name translation helpers)
+EXPORT_DROP_COLS = ["keys"]
+# Bump when the site page template changes so every page is re-rendered
+SITE_VERSION = 1
+# Static site page names by (suffix, player/team stats)
+SITE_PAGES = {
+    ("BP", "player"): "Batting",
+    ("PP", "player"): "Pitching",
+    ("BP", "team"): "Team Batting",
+    ("PP", "team"): "Team Pitching",
+}
+# Publisher batching and retry settings (see run_publish())
+PUBLISH_BATCH_ROWS = 200
+PUBLISH_RETRIES = 3
+PUBLISH_BACKOFF_S = 0.5
+PUBLISH_TIMEOUT_S = 30
+# Environment variable holding the publish password (a WordPress
+# application password), never passed on the command line
+PUBLISH_PASSWORD_ENV = "NPB_PUBLISH_PASSWORD"
+# Default Unix socket used by the daemon and client modes
+DAEMON_SOCKET = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "stats", "npbDaemon.sock"
+)
+# Site page templates (see render_site_page()). The script sorts by moving
+# rows into a column's precomputed order, reversing it (blanks kept last)
+# for the other direction
+SITE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; font-size: 0.9em; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 6px; text-align: right; }}
+th {{ cursor: pointer; background: #eee; position: sticky; top: 0; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p><a href="../index.html">All seasons</a></p>
+<table>
+<thead><tr>{head}</tr></thead>
+<tbody>
+{rows}
+</tbody>
+</table>
+<script>
+const SORT = {sort};
+const body = document.querySelector("tbody");
+const rows = Array.from(body.rows);
+let current = null;
+let desc = false;
+function sortBy(th) {{
+  const index = SORT[th.dataset.col];
+  desc = current === th.dataset.col ? !desc : index.first === "desc";
+  current = th.dataset.col;
+  let order = index.order;
+  if (desc) {{
+    const valid = order.slice(0, index.valid).reverse();
+    order = valid.concat(order.slice(index.valid));
+  }}
+  order.forEach(row => body.appendChild(rows[row]));
+}}
+const headers = document.querySelectorAll("th");
+headers.forEach(th => th.addEventListener("click", () => sortBy(th)));
+</script>
+</body>
+</html>
+"""
+SITE_INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>NPB Post Season Stats</title>
+</head>
+<body>
+<h1>NPB Post Season Stats</h1>
+<ul>
+{links}
+</ul>
+</body>
+</html>
+"""
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.mode == "bench":
+        sys.exit(run_benchmarks(args.names))
+    if args.mode == "client":
+        sys.exit(run_client(args))
 
-def main():
     print("NPB Post Season Statistic Scraper")
     # Open the directory to store the scraped stat csv files
     relDir = os.path.dirname(__file__)
     statsDir = os.path.join(relDir, "stats")
     if not (os.path.exists(statsDir)):
         os.mkdir(statsDir)
+    if args.mode == "daemon":
+        run_daemon(statsDir, args.socket)
+        return
+    if args.mode == "watch":
+        run_watch(statsDir, args.interval, args.debounce)
+        return
+    if args.mode == "warehouse":
+        run_warehouse(statsDir, args)
+        return
+    if args.mode == "career":
+        run_career(statsDir, args)
+        return
+    if args.mode == "leaders":
+        run_leaders(statsDir, args)
+        return
+    if args.mode == "cube":
+        run_cube(statsDir, args)
+        return
+    if args.mode == "rankings":
+        run_rankings(statsDir, args)
+        return
+    if args.mode == "export":
+        run_export(statsDir, args)
+        return
+    if args.mode == "site":
+        run_site(statsDir, args)
+        return
+    if args.mode == "reparse":
+        sys.exit(run_reparse(statsDir, args))
+    if args.mode == "publish":
+        sys.exit(run_publish(statsDir, args))
+    if args.mode == "publish-stub":
+        run_publish_stub(args.port, args.fail_every)
+        return
+    if args.mode == "games":
+        run_games(statsDir, args)
+        return
+    if args.mode == "standings":
+        run_standings(statsDir, args)
+        return
+    if args.mode == "sim":
+        run_sim(statsDir, args)
+        return
+    if args.mode == "calibrate":
+        run_calibrate(statsDir, args)
+        return
 
     # Create year directory
-    scrapeYear = get_scrape_year()
+    scrapeYear = get_scrape_year(args.year)
     yearDir = os.path.join(statsDir, scrapeYear)
     if not (os.path.exists(yearDir)):
         os.mkdir(yearDir)
 
-    if get_user_choice("P") == "Y":
-        get_playoff_stats(yearDir, "BP", scrapeYear)
-        get_playoff_stats(yearDir, "PP", scrapeYear)
-    postBatPlayerStats = PlayerData(statsDir, yearDir, "BP", scrapeYear)
-    postPitchPlayerStats = PlayerData(statsDir, yearDir, "PP", scrapeYear)
-    postBatTeamStats = TeamData(
-        postBatPlayerStats.df, statsDir, yearDir, "BP", scrapeYear
-    )
-    postPitchTeamStats = TeamData(
-        postPitchPlayerStats.df, statsDir, yearDir, "PP", scrapeYear
+    if args.mode == "live":
+        run_live(
+            statsDir,
+            scrapeYear,
+            args.eliminated,
+            args.min_interval,
+            args.max_interval,
+        )
+        return
+
+    scrapeYN = args.scrape
+    if scrapeYN is None:
+        scrapeYN = get_user_choice("P")
+    if scrapeYN == "Y":
+        for suffix in args.suffixes:
+            get_playoff_stats(yearDir, suffix, scrapeYear)
+    # Organize player/team stats and write the alt and final files
+    regenerate_suffixes(
+        statsDir,
+        scrapeYear,
+        args.suffixes,
+        args.jobs,
+        args.uncertainty,
+        args.skip_unchanged,
+        args.write_cube,
     )
-    postBatPlayerStats.output_final()
-    postPitchPlayerStats.output_final()
-    postBatTeamStats.output_final()
-    postPitchTeamStats.output_final()
 
     # Asking user to make an upload zip for manual uploads
     # TODO: Remove choice and auto output zips?
-    zipYN = get_user_choice("Z")
+    zipYN = args.zip
+    if zipYN is None:
+        zipYN = get_user_choice("Z")
     if zipYN == "Y":
         make_zip(yearDir, scrapeYear)
-    input("Press Enter to exit. ")
+    # Scheduled/batch runs pass the year in and shouldn't wait on the user
+    if args.year is None:
+        input("Press Enter to exit. ")
+
+
+def parse_args(argv=None):
+    """Reads command line arguments. Running without arguments keeps the
+    original interactive prompts
+
+    Parameters:
+    argv (list - string): The arguments to parse (default None reads sys.argv)
+
+    Returns:
+    args (argparse Namespace): The parsed arguments"""
+    parser = argparse.ArgumentParser(
+        description="NPB Post Season Statistic Scraper"
+    )
+    parser.add_argument(
+        "-y",
+        "--year",
+        help="NPB year to scrape/organize (prompts for one if omitted)",
+    )
+    parser.add_argument(
+        "-s",
+        "--scrape",
+        choices=["Y", "N"],
+        help="Y to scrape npb.jp, N to only reorganize existing raw files",
+    )
+    parser.add_argument(
+        "-z",
+        "--zip",
+        choices=["Y", "N"],
+        help="Y to output the upload zip",
+    )
+    parser.add_argument(
+        "-u",
+        "--uncertainty",
+        type=int,
+        nargs="?",
+        const=os.cpu_count(),
+        metavar="WORKERS",
+        help="Add bootstrap intervals to the AltView files (uses every core "
+        "unless WORKERS is given)",
+    )
+    parser.add_argument(
+        "-k",
+        "--skip-unchanged",
+        action="store_true",
+        help="Leave final and alt files whose contents didn't change as they "
+        "are (changesets are written either way)",
+    )
+    parser.add_argument(
+        "--write-cube",
+        action="store_true",
+        help="Also store the year's rollup cubes ([year]Cube[suffix].csv) "
+        "for cube mode",
+    )
+    parser.add_argument(
+        "--suffixes",
+        nargs="+",
+        choices=list(STAT_SUFFIXES),
+        default=["BP", "PP"],
+        help="Stat files to scrape/organize: BP/PP post season, BR/PR reg "
+        "season and BF/PF farm batting/pitching (default BP PP)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Processes that organize the suffixes in parallel (default 1)",
+    )
+    subparsers = parser.add_subparsers(dest="mode")
+    benchParser = subparsers.add_parser(
+        "bench", help="Run the benchmark suite"
+    )
+    benchParser.add_argument(
+        "names",
+        nargs="*",
+        help="Benchmarks to run (default runs all of them)",
+    )
+    daemonParser = subparsers.add_parser(
+        "daemon",
+        help="Keep stats in memory and serve regenerate/scrape/query "
+        "commands over a Unix socket",
+    )
+    daemonParser.add_argument(
+        "--socket", default=DAEMON_SOCKET, help="Unix socket path"
+    )
+    watchParser = subparsers.add_parser(
+        "watch",
+        help="Rebuild only the affected outputs when input or raw stat files "
+        "are edited",
+    )
+    watchParser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between file checks",
+    )
+    watchParser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="Seconds without new edits before rebuilding",
+    )
+    liveParser = subparsers.add_parser(
+        "live",
+        help="Poll npb.jp during the post season and rebuild outputs after "
+        "every game",
+    )
+    liveParser.add_argument(
+        "--eliminated",
+        nargs="*",
+        default=[],
+        help="Teams knocked out of the post season (no longer polled)",
+    )
+    liveParser.add_argument(
+        "--min-interval",
+        type=float,
+        default=120.0,
+        help="Seconds between polls of a page that just changed",
+    )
+    liveParser.add_argument(
+        "--max-interval",
+        type=float,
+        default=1800.0,
+        help="Longest wait between polls of a page that stopped changing",
+    )
+    warehouseParser = subparsers.add_parser(
+        "warehouse",
+        help="Load organized seasons into the SQLite warehouse or query it",
+    )
+    warehouseParser.add_argument(
+        "action",
+        choices=["load", "player", "team", "totals"],
+        help="load seasons, or look up a player's/team's history or a "
+        "player's batting totals across seasons",
+    )
+    warehouseParser.add_argument(
+        "name", nargs="?", help="Player name/ID or team name to look up"
+    )
+    warehouseParser.add_argument(
+        "--years", nargs="*", help="Seasons to load (default all)"
+    )
+    warehouseParser.add_argument(
+        "--suffix",
+        choices=["BP", "PP"],
+        default="BP",
+        help="Look up batting or pitching stats",
+    )
+    warehouseParser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reload seasons even if they are unchanged",
+    )
+    careerParser = subparsers.add_parser(
+        "career",
+        help="Career/cross-season post season leaderboards",
+    )
+    careerParser.add_argument(
+        "--suffix",
+        choices=["BP", "PP"],
+        default="BP",
+        help="Batting or pitching stats",
+    )
+    careerParser.add_argument(
+        "--by", choices=["player", "team"], default="player"
+    )
+    careerParser.add_argument(
+        "--years", nargs="*", help="Seasons to merge (default all)"
+    )
+    careerParser.add_argument(
+        "--sort", help="Stat to rank by (default OPS+ or ERA+)"
+    )
+    careerParser.add_argument(
+        "--min",
+        type=float,
+        default=0,
+        help="Minimum PA (batting) or IP (pitching) to be listed",
+    )
+    careerParser.add_argument(
+        "--top", type=int, default=25, help="Rows to print"
+    )
+    leadersParser = subparsers.add_parser(
+        "leaders",
+        help="Write qualified season and series leaderboards for every stat",
+    )
+    leadersParser.add_argument(
+        "years", nargs="*", help="Stat years (default every scraped year)"
+    )
+    leadersParser.add_argument(
+        "--top", type=int, default=10, help="Leaders per stat"
+    )
+    rankingsParser = subparsers.add_parser(
+        "rankings",
+        help="Rank players against every indexed post season",
+    )
+    rankingsParser.add_argument(
+        "years", nargs="*", help="Years to rank (default every scraped year)"
+    )
+    publishParser = subparsers.add_parser(
+        "publish",
+        help="Push changed tables/rows of a year to a REST endpoint",
+    )
+    publishParser.add_argument("publishYear", help="The stat year")
+    publishParser.add_argument(
+        "--endpoint",
+        required=True,
+        help="Base URL of the tables API (e.g. https://site/wp-json/npb/v1)",
+    )
+    publishParser.add_argument(
+        "--user",
+        help="User for basic auth, the password is read from "
+        + PUBLISH_PASSWORD_ENV,
+    )
+    publishParser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent requests"
+    )
+    publishParser.add_argument(
+        "--retries",
+        type=int,
+        default=PUBLISH_RETRIES,
+        help="Retries of a failed request",
+    )
+    publishParser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the requests instead of sending them",
+    )
+    stubParser = subparsers.add_parser(
+        "publish-stub",
+        help="Serve a local stand-in tables API to publish to",
+    )
+    stubParser.add_argument("--port", type=int, default=8790)
+    stubParser.add_argument(
+        "--fail-every",
+        type=int,
+        default=0,
+        help="Answer every Nth request with a 503 to exercise retries",
+    )
+    reparseParser = subparsers.add_parser(
+        "reparse",
+        help="Rebuild raw stat files from archived pages (no network access)",
+    )
+    reparseParser.add_argument(
+        "years",
+        nargs="*",
+        help="Years to rebuild (default every archived year)",
+    )
+    reparseParser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="Processes to use"
+    )
+    siteParser = subparsers.add_parser(
+        "site", help="Build a static sortable HTML stats site"
+    )
+    siteParser.add_argument(
+        "years", nargs="*", help="Years to build (default every scraped year)"
+    )
+    siteParser.add_argument(
+        "--workers", type=int, default=1, help="Processes to render pages in"
+    )
+    exportParser = subparsers.add_parser(
+        "export",
+        help="Export the npb/ tables as precompressed JSON/NDJSON",
+    )
+    exportParser.add_argument(
+        "years", nargs="*", help="Years to export (default every npb/ year)"
+    )
+    standingsParser = subparsers.add_parser(
+        "standings",
+        help="Expected records and head to head matrices from standings",
+    )
+    standingsParser.add_argument(
+        "years", nargs="*", help="Standings years (default every year found)"
+    )
+    simParser = subparsers.add_parser(
+        "sim", help="Simulate Climax Series and Japan Series odds"
+    )
+    simParser.add_argument("simYear", help="The standings year")
+    simParser.add_argument(
+        "--sims", type=int, default=1000000, help="Brackets to simulate"
+    )
+    simParser.add_argument(
+        "--workers", type=int, default=1, help="Processes to simulate in"
+    )
+    simParser.add_argument(
+        "--seed", type=int, help="Seed for reproducible results"
+    )
+    calibrateParser = subparsers.add_parser(
+        "calibrate",
+        help="Derive post season FIP constants and regressed park factors",
+    )
+    calibrateParser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Write the calibrated values to fipConst.csv/parkFactors.csv",
+    )
+    calibrateParser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recalibrate even if the inputs are unchanged",
+    )
+    gamesParser = subparsers.add_parser(
+        "games",
+        help="Ingest new post season box scores listed in gameUrls.csv",
+    )
+    gamesParser.add_argument("gamesYear", help="The stat year")
+    cubeParser = subparsers.add_parser(
+        "cube", help="Show rate stats at any rollup cube grain"
+    )
+    cubeParser.add_argument("cubeYear", help="The stat year")
+    cubeParser.add_argument(
+        "grain", choices=list(CUBE_GRAINS), help="The cube grain to show"
+    )
+    cubeParser.add_argument(
+        "--suffix",
+        choices=["BP", "PP"],
+        default="BP",
+        help="Batting or pitching stats",
+    )
+    clientParser = subparsers.add_parser(
+        "client", help="Send a command to a running daemon"
+    )
+    clientParser.add_argument(
+        "cmd",
+        choices=["regenerate", "scrape", "query", "status", "shutdown"],
+    )
+    clientParser.add_argument("cmdYear", nargs="?", help="NPB year")
+    clientParser.add_argument(
+        "--suffix",
+        choices=list(STAT_SUFFIXES),
+        help="Stat file to query (default BP) or regenerate/scrape (default "
+        "BP and PP)",
+    )
+    clientParser.add_argument(
+        "--table",
+        choices=["player", "team"],
+        default="player",
+        help="Query player or team stats",
+    )
+    clientParser.add_argument("--player", help="Player name to query")
+    clientParser.add_argument("--team", help="Team name to query")
+    clientParser.add_argument(
+        "--socket", default=DAEMON_SOCKET, help="Unix socket path"
+    )
+    return parser.parse_args(argv)
 
 
 class Stats:
@@ -56,23 +930,33 @@ class Stats:
         self.suffix = suffix
         self.year = year
         self.yearDir = yearDir
+        # "BP" or "PP", the schema of the suffix's stat files
+        self.statType = get_stat_type(suffix)
+        # Leave output files with unchanged contents as they are (see
+        # write_final_file())
+        self.skipUnchanged = False
 
 
 class PlayerData(Stats):
     def __init__(self, statsDir, yearDir, suffix, year):
         """PlayerData new variables:
         df (pandas dataframe): Holds an entire NPB league's individual
-        batting/pitching stats"""
+        batting/pitching stats
+        rawDf (pandas dataframe): The raw stats that passed the data quality
+        checks, kept so the rollup cube doesn't read the raw file again
+        intervals (pandas dataframe): Bootstrap interval columns added to the
+        AltView output (see bootstrap_intervals()), None leaves them out"""
         super().__init__(statsDir, yearDir, suffix, year)
-        # Initialize data frame to store stats
-        self.df = pd.read_csv(
-            self.yearDir + "/" + year + "StatsRaw" + suffix + ".csv"
-        )
+        self.intervals = None
+        # Initialize data frame to store stats (rows failing the data quality
+        # checks are quarantined)
+        self.rawDf = read_raw_stats(self.yearDir, suffix, year)
+        self.df = self.rawDf.copy()
         # Modify df for correct stats
         # self.post_season_merge()
-        if self.suffix == "BP":
+        if self.statType == "BP":
             self.org_bat()
-        elif self.suffix == "PP":
+        elif self.statType == "PP":
             self.org_pitch()
 
     def __str__(self):
@@ -83,8 +967,9 @@ class PlayerData(Stats):
 
     def output_final(self):
         """Outputs final files for upload using the filtered and organized
-        stat dataframes (NOTE: IP and PA drop constants are determined in this
-        function) (CONVERSION OF writePlayerStats())
+        stat dataframes (NOTE: leaderboard IP and PA qualification constants
+        are LEADER_IP_PER_GAME and LEADER_PA_PER_GAME, see output_leaders())
+        (CONVERSION OF writePlayerStats())
 
         Parameters: N/A
 
@@ -99,14 +984,17 @@ class PlayerData(Stats):
             os.mkdir(uploadDir)
 
         # Translate player names
-        if self.suffix == "BP":
+        if self.statType == "BP":
             translateCol = "Player"
-        elif self.suffix == "PP":
+        elif self.statType == "PP":
             translateCol = "Pitcher"
         self.df = translate_players(self.df, translateCol)
         # Print organized dataframe to file
         newCsvAlt = altDir + "/" + self.year + "AltView" + self.suffix + ".csv"
-        self.df.to_string(newCsvAlt)
+        altDf = self.df
+        if self.intervals is not None:
+            altDf = self.df.join(self.intervals)
+        write_output_text(newCsvAlt, altDf.to_string(), self.skipUnchanged)
         # Make deep copy of original df to avoid HTML in df's team/player names
         finalDf = self.df.copy()
         # Convert player/team names to HTML that contains appropriate URLs
@@ -117,10 +1005,16 @@ class PlayerData(Stats):
         newCsvFinal = (
             uploadDir + "/" + self.year + "StatsFinal" + self.suffix + ".csv"
         )
-        finalDf.to_csv(newCsvFinal, index=False)
+        write_final_file(
+            finalDf,
+            newCsvFinal,
+            [translateCol, "Team"],
+            os.path.join(self.yearDir, "changes"),
+            self.skipUnchanged,
+        )
 
         # AltView, Final file output
-        if self.suffix == "PP":
+        if self.statType == "PP":
             print(
                 "An alternative view of the pitching results will be stored "
                 "in: " + newCsvAlt
@@ -129,7 +1023,7 @@ class PlayerData(Stats):
                 "The final organized pitching results will be stored in: "
                 + newCsvFinal
             )
-        elif self.suffix == "BP":
+        elif self.statType == "BP":
             print(
                 "An alternative view of the batting results will be stored "
                 "in: " + newCsvAlt
@@ -146,18 +1040,7 @@ class PlayerData(Stats):
         Parameters: N/A
 
         Returns: N/A"""
-        # Some IP entries can be '+', replace with 0 for conversions and
-        # calculations
-        self.df["IP"] = self.df["IP"].astype(str).replace("+", "0")
-        # Convert all NaN to 0 (as floats)
-        if self.suffix == "PP":
-            self.df.iloc[:, 11] = self.df.iloc[:, 11].fillna(0)
-            self.df.iloc[:, 11] = self.df.iloc[:, 11].astype(float)
-            # Combine the incorrectly split IP stat columns
-            self.df["IP"] = self.df["IP"].astype(float)
-            self.df["IP"] = self.df["IP"] + self.df.iloc[:, 11]
-            # Drop unnamed column that held IP column decimals
-            self.df.drop(self.df.columns[11], axis=1, inplace=True)
+        self.df = combine_raw_ip_columns(self.df, self.suffix)
         # Combine duplicate player entries
         agg_functions = {
             "Pitcher": "first",
@@ -184,9 +1067,10 @@ class PlayerData(Stats):
             "ERA": "first",
             "Team": "first",
         }
-        self.df = self.df.groupby(self.df["Pitcher"], as_index=False).agg(
-            agg_functions
-        )
+        # Same named players of different teams stay apart
+        self.df = self.df.groupby(
+            [self.df["Pitcher"], self.df["Team"]], as_index=False
+        ).agg(agg_functions)
 
         # Translate player names TODO
 
@@ -370,11 +1254,12 @@ class PlayerData(Stats):
             "OBP": "first",
             "Team": "first",
         }
-        self.df = self.df.groupby(self.df["Player"], as_index=False).agg(
-            agg_functions
-        )
+        # Same named players of different teams stay apart
+        self.df = self.df.groupby(
+            [self.df["Player"], self.df["Team"]], as_index=False
+        ).agg(agg_functions)
         # Recalculate AVG, SLG, OBP
-        if self.suffix == "BP":
+        if self.statType == "BP":
             self.df["AVG"] = self.df["H"] / self.df["AB"]
             self.df["SLG"] = (
                 (self.df["H"] - self.df["2B"] - self.df["3B"] - self.df["HR"])
@@ -421,6 +1306,12 @@ class PlayerData(Stats):
             0,
         )
         self.df["OPS+"] = self.df["OPS+"] / self.df["ParkF"]
+        # wOBA weights come from each player's league totals (the temp
+        # "League" column is dropped by the reordering below)
+        self.df = select_league(self.df, self.suffix)
+        self.df = calc_woba_stats(
+            self.df, get_league_weights(self.df, self.year)
+        )
         self.df["ISO"] = round(self.df["SLG"] - self.df["AVG"], 3)
         self.df["K%"] = round(self.df["SO"] / self.df["PA"], 3)
         self.df["BB%"] = round(self.df["BB"] / self.df["PA"], 3)
@@ -452,6 +1343,9 @@ class PlayerData(Stats):
             "BB%": "{:.1%}",
             "K%": "{:.1%}",
             "OPS+": "{:.0f}",
+            "wOBA": "{:.3f}",
+            "wRAA": "{:.1f}",
+            "wRC+": "{:.0f}",
             "AVG": "{:.3f}",
             "OBP": "{:.3f}",
             "SLG": "{:.3f}",
@@ -467,6 +1361,8 @@ class PlayerData(Stats):
         self.df["BB/K"] = self.df["BB/K"].str.replace("nan", "")
         self.df["BABIP"] = self.df["BABIP"].astype(str)
         self.df["BABIP"] = self.df["BABIP"].str.replace("nan", "")
+        for col in ["wOBA", "wRAA", "wRC+"]:
+            self.df[col] = self.df[col].astype(str).str.replace("nan", "")
         # Replace BB/K infs with '1.00' (same format as MLB website)
         self.df["BB/K"] = self.df["BB/K"].str.replace("inf", "1.00")
         # Column reordering
@@ -497,6 +1393,9 @@ class PlayerData(Stats):
                 "SLG",
                 "OPS",
                 "OPS+",
+                "wOBA",
+                "wRAA",
+                "wRC+",
                 "ISO",
                 "BABIP",
                 "TTO%",
@@ -512,18 +1411,65 @@ class PlayerData(Stats):
 
 
 class TeamData(Stats):
-    def __init__(self, playerDf, statsDir, yearDir, suffix, year):
+    def __init__(self, playerDf, statsDir, yearDir, suffix, year, cube=None):
         """TeamData new variables:
         playerDf (pandas dataframe): Holds an entire NPB league's individual
-        batting/pitching stats"""
+        batting/pitching stats
+        cube (RollupCube): The season's rollup cube, the team and league
+        average rate stats are read from it (default None builds it from
+        playerDf)"""
         super().__init__(statsDir, yearDir, suffix, year)
         self.playerDf = playerDf.copy()
+        # Team/league counting stat totals that later updates adjust by delta
+        self.store = TeamAggregateStore(self.playerDf, self.statType)
+        self.cube = cube
+        if cube is None:
+            self.cube = build_org_cube(self.playerDf, suffix, year)
         # Initialize df for teams stats
-        if self.suffix == "BP":
+        if self.statType == "BP":
             self.org_team_bat()
-        elif self.suffix == "PP":
+        elif self.statType == "PP":
             self.org_team_pitch()
 
+    def update_team(self, team, playerDf, cube=None):
+        """Updates a single team's counting stat totals from a re-organized
+        player dataframe and recomputes the team stat rows from the totals
+        without summing any other team again
+
+        Parameters:
+        team (string): The team whose player rows changed
+        playerDf (pandas dataframe): The re-organized player stats
+        cube (RollupCube): The season's new rollup cube (default None builds
+        it from playerDf)
+
+        Returns: N/A"""
+        self.playerDf = playerDf.copy()
+        self.store.update_team(team, self.playerDf)
+        self.cube = cube
+        if cube is None:
+            self.cube = build_org_cube(self.playerDf, self.suffix, self.year)
+        if self.statType == "BP":
+            self.org_team_bat()
+        elif self.statType == "PP":
+            self.org_team_pitch()
+
+    def get_cube_rates(self, index):
+        """Reads the rate stats of the team rows from the cube's team grain
+        and those of the "League Average" row from RollupCube.league_rates()
+
+        Parameters:
+        index (pandas index): The team stat rows, "League Average" last
+
+        Returns:
+        rateDf (pandas dataframe): The rows' rate stats indexed like index"""
+        import pandas as pd
+
+        teamRates = self.cube.rates("team").set_index("Team")
+        leagueRates = self.cube.league_rates()
+        leagueRates.index = ["League Average"]
+        rateDf = pd.concat([teamRates.reindex(index[:-1]), leagueRates])
+        return rateDf
+
     def __str__(self):
         """Outputs the Alt view of the associated dataframe (no HTML
         team or player names, no csv formatting, shows entire df instead of
@@ -544,14 +1490,12 @@ class TeamData(Stats):
         if not (os.path.exists(altDir)):
             os.mkdir(altDir)
         # Make dirs that will store files uploaded to yakyucosmo.com
-        uploadDir = self.yearDir
-        if self.suffix == "PP" or self.suffix == "BP":
-            uploadDir = os.path.join(self.yearDir, "npb")
-            if not (os.path.exists(uploadDir)):
-                os.mkdir(uploadDir)
+        uploadDir = os.path.join(self.yearDir, "npb")
+        if not (os.path.exists(uploadDir)):
+            os.mkdir(uploadDir)
         # Print organized dataframe to file
         newCsvAlt = altDir + "/" + self.year + "TeamAlt" + self.suffix + ".csv"
-        self.df.to_string(newCsvAlt)
+        write_output_text(newCsvAlt, self.df.to_string(), self.skipUnchanged)
         # Make output copy to avoid modifying original df
         finalDf = self.df.copy()
         # Insert HTML code for team names
@@ -560,18 +1504,23 @@ class TeamData(Stats):
         newCsvFinal = (
             uploadDir + "/" + self.year + "Team" + self.suffix + ".csv"
         )
-        finalDf.to_csv(newCsvFinal, index=False)
+        write_final_file(
+            finalDf,
+            newCsvFinal,
+            ["Team"],
+            os.path.join(self.yearDir, "changes"),
+            self.skipUnchanged,
+        )
 
         # Pitching TeamAlt and Team file location outputs
-        if self.suffix == "PP" or self.suffix == "BP":
-            print(
-                "The final organized team pitching results will be stored "
-                "in: " + newCsvFinal
-            )
-            print(
-                "An alternative view of team pitching results will be stored "
-                "in: " + newCsvAlt
-            )
+        print(
+            "The final organized team pitching results will be stored "
+            "in: " + newCsvFinal
+        )
+        print(
+            "An alternative view of team pitching results will be stored "
+            "in: " + newCsvAlt
+        )
 
     def org_team_bat(self):
         """Outputs batting team stat files using the organized player stat
@@ -580,199 +1529,43 @@ class TeamData(Stats):
         Parameters: N/A
 
         Returns: N/A"""
-        # Initialize new row list with all possible teams
-        rowArr = [
-            "Hanshin Tigers",
-            "Hiroshima Carp",
-            "DeNA BayStars",
-            "Yomiuri Giants",
-            "Yakult Swallows",
-            "Chunichi Dragons",
-            "ORIX Buffaloes",
-            "Lotte Marines",
-            "SoftBank Hawks",
-            "Rakuten Eagles",
-            "Seibu Lions",
-            "Nipponham Fighters",
-        ]
-
-        # Initialize a list and put team columns in first
-        # REFACTOR (?)
-        colArr = [
-            "Team",
-            "PA",
-            "AB",
-            "R",
-            "H",
-            "2B",
-            "3B",
-            "HR",
-            "TB",
-            "RBI",
-            "SB",
-            "CS",
-            "SH",
-            "SF",
-            "SO",
-            "BB",
-            "IBB",
-            "HP",
-            "GDP",
+        import pandas as pd
+
+        # Team counting stat totals, skipping teams that didn't play (PA = 0)
+        levels = STAT_SUFFIXES[self.suffix]["levels"]
+        teams = get_team_registry(self.year, levels)["Team"]
+        teamDf = self.store.sums.reindex(teams, fill_value=0)
+        teamDf = teamDf[teamDf["PA"] != 0]
+        # League stat totals (last row to be appended to the dataframe)
+        teamConst = len(teams)
+        leagueRow = round(self.store.league / teamConst, 0)
+        teamDf = pd.concat([teamDf, leagueRow.to_frame("League Average").T])
+        # Rate stats come from the rollup cube, TTO% from the counting stats
+        # as listed (the league average row's are averaged)
+        rateDf = self.get_cube_rates(teamDf.index)
+        rateDf["TTO%"] = (
+            teamDf["BB"] + teamDf["SO"] + teamDf["HR"]
+        ) / teamDf["PA"]
+        for col in [
             "AVG",
             "OBP",
             "SLG",
             "OPS",
             "OPS+",
+            "wOBA",
+            "wRAA",
+            "wRC+",
             "ISO",
             "BABIP",
             "TTO%",
             "K%",
             "BB%",
             "BB/K",
-        ]
-        teamBatList = []
-        teamBatList.append(colArr)
-
-        # Form team stat rows
-        # REFACTOR (?)
-        for row in rowArr:
-            newTeamStat = [row]
-            tempStatDf = self.playerDf[self.playerDf.Team == row]
-            # Skip teams that didn't play (PA = 0)
-            if tempStatDf["PA"].sum() == 0:
-                continue
-            newTeamStat.append(tempStatDf["PA"].sum())
-            newTeamStat.append(tempStatDf["AB"].sum())
-            newTeamStat.append(tempStatDf["R"].sum())
-            newTeamStat.append(tempStatDf["H"].sum())
-            newTeamStat.append(tempStatDf["2B"].sum())
-            newTeamStat.append(tempStatDf["3B"].sum())
-            newTeamStat.append(tempStatDf["HR"].sum())
-            newTeamStat.append(tempStatDf["TB"].sum())
-            newTeamStat.append(tempStatDf["RBI"].sum())
-            newTeamStat.append(tempStatDf["SB"].sum())
-            newTeamStat.append(tempStatDf["CS"].sum())
-            newTeamStat.append(tempStatDf["SH"].sum())
-            newTeamStat.append(tempStatDf["SF"].sum())
-            newTeamStat.append(tempStatDf["SO"].sum())
-            newTeamStat.append(tempStatDf["BB"].sum())
-            newTeamStat.append(tempStatDf["IBB"].sum())
-            newTeamStat.append(tempStatDf["HP"].sum())
-            newTeamStat.append(tempStatDf["GDP"].sum())
-            totalH = tempStatDf["H"].sum()
-            total2B = tempStatDf["2B"].sum()
-            total3B = tempStatDf["3B"].sum()
-            totalHR = tempStatDf["HR"].sum()
-            totalSF = tempStatDf["SF"].sum()
-            totalBB = tempStatDf["BB"].sum()
-            totalHP = tempStatDf["HP"].sum()
-            totalAB = tempStatDf["AB"].sum()
-            totalAVG = round((totalH / totalAB), 3)
-            newTeamStat.append(totalAVG)
-            totalOBP = round(
-                (
-                    (totalH + totalBB + totalHP)
-                    / (totalAB + totalBB + totalHP + totalSF)
-                ),
-                3,
-            )
-            newTeamStat.append(totalOBP)
-            tempSLG1 = totalH - total2B - total3B - totalHR
-            tempSLG2 = (2 * total2B) + (3 * total3B) + (4 * totalHR)
-            totalSLG = round((((tempSLG1 + tempSLG2) / totalAB)), 3)
-            newTeamStat.append(totalSLG)
-            totalOPS = round((totalOBP + totalSLG), 3)
-            newTeamStat.append(totalOPS)
-            teamBatList.append(newTeamStat)
-
-        teamConst = 12
-        # Getting league stat totals (last row to be appended to the dataframe)
-        newTeamStat = ["League Average"]
-        newTeamStat.append(round(self.playerDf["PA"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["AB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["R"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["H"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["2B"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["3B"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["HR"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["TB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["RBI"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["CS"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SH"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SF"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SO"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["BB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["IBB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["HP"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["GDP"].sum() / teamConst, 0))
-        totalH = self.playerDf["H"].sum()
-        total2B = self.playerDf["2B"].sum()
-        total3B = self.playerDf["3B"].sum()
-        totalHR = self.playerDf["HR"].sum()
-        totalSF = self.playerDf["SF"].sum()
-        totalBB = self.playerDf["BB"].sum()
-        totalHP = self.playerDf["HP"].sum()
-        totalAB = self.playerDf["AB"].sum()
-        totalAVG = round((totalH / totalAB), 3)
-        newTeamStat.append(totalAVG)
-        totalOBP = round(
-            (
-                (totalH + totalBB + totalHP)
-                / (totalAB + totalBB + totalHP + totalSF)
-            ),
-            3,
-        )
-        newTeamStat.append(totalOBP)
-        totalSLG = round(
-            (
-                (
-                    (
-                        (totalH - total2B - total3B - totalHR)
-                        + (2 * total2B)
-                        + (3 * total3B)
-                        + (4 * totalHR)
-                    )
-                    / totalAB
-                )
-            ),
-            3,
-        )
-        newTeamStat.append(totalSLG)
-        totalOPS = round((totalOBP + totalSLG), 3)
-        newTeamStat.append(totalOPS)
-        teamBatList.append(newTeamStat)
-
-        # Initialize new team stat dataframe
-        self.df = pd.DataFrame(teamBatList)
-        # Import adds extra top row of numbers which misaligns columns
-        # Replace with proper row and drop extra number row
-        self.df.columns = self.df.iloc[0]
-        self.df.drop(index=0, axis=1, inplace=True)
-        # Create park factors for any remaining team stats
-        self.df = select_park_factor(self.df, self.suffix, self.year)
-
-        # Total OPS of the teams / total OPS of the league
-        self.df["OPS+"] = round(
-            100
-            * ((self.df["OBP"] / totalOBP) + (self.df["SLG"] / totalSLG) - 1),
-            0,
-        )
-        self.df["OPS+"] = self.df["OPS+"] / self.df["ParkF"]
-        self.df["ISO"] = round(self.df["SLG"] - self.df["AVG"], 3)
-        self.df["K%"] = round(self.df["SO"] / self.df["PA"], 3)
-        self.df["BB%"] = round(self.df["BB"] / self.df["PA"], 3)
-        self.df["BB/K"] = round(self.df["BB"] / self.df["SO"], 2)
-        self.df["TTO%"] = (
-            self.df["BB"] + self.df["SO"] + self.df["HR"]
-        ) / self.df["PA"]
-        self.df["TTO%"] = self.df["TTO%"].apply("{:.1%}".format)
-        numer = self.df["H"] - self.df["HR"]
-        denom = self.df["AB"] - self.df["SO"] - self.df["HR"] + self.df["SF"]
-        self.df["BABIP"] = round((numer / denom), 3)
+        ]:
+            teamDf[col] = rateDf[col]
+        teamDf["TTO%"] = teamDf["TTO%"].apply("{:.1%}".format)
+        self.df = teamDf.rename_axis("Team").reset_index()
 
-        # Remove temp Park Factor column
-        self.df.drop("ParkF", axis=1, inplace=True)
         # Number formatting
         formatMapping = {
             "BB%": "{:.1%}",
@@ -785,6 +1578,9 @@ class TeamData(Stats):
             "BABIP": "{:.3f}",
             "BB/K": "{:.2f}",
             "OPS+": "{:.0f}",
+            "wOBA": "{:.3f}",
+            "wRAA": "{:.1f}",
+            "wRC+": "{:.0f}",
             "PA": "{:.0f}",
             "AB": "{:.0f}",
             "2B": "{:.0f}",
@@ -817,164 +1613,37 @@ class TeamData(Stats):
         Parameters: N/A
 
         Returns: N/A"""
-        # IP column ".1 .2 .3" calculation fix
-        self.playerDf["IP"] = convert_ip_column_in(self.playerDf)
-        # Initialize new row list with all possible teams
-        rowArr = [
-            "Hanshin Tigers",
-            "Hiroshima Carp",
-            "DeNA BayStars",
-            "Yomiuri Giants",
-            "Yakult Swallows",
-            "Chunichi Dragons",
-            "ORIX Buffaloes",
-            "Lotte Marines",
-            "SoftBank Hawks",
-            "Rakuten Eagles",
-            "Seibu Lions",
-            "Nipponham Fighters",
-        ]
-
-        # Initialize a list and put columns in first
-        teamPitList = [
-            [
-                "Team",
-                "W",
-                "L",
-                "SV",
-                "CG",
-                "SHO",
-                "BF",
-                "IP",
-                "H",
-                "HR",
-                "SO",
-                "BB",
-                "IBB",
-                "HB",
-                "WP",
-                "R",
-                "ER",
-                "ERA",
-                "FIP",
-                "kwERA",
-                "WHIP",
-                "ERA+",
-                "FIP-",
-                "kwERA-",
-                "Diff",
-                "HR%",
-                "K%",
-                "BB%",
-                "K-BB%",
-            ]
-        ]
-
-        # Form team stat rows and collect all COUNTING stats
-        # TODO: REFACTOR (?)
-        teamConst = 0
-        for row in rowArr:
-            newTeamStat = [row]
-            tempStatDf = self.playerDf[self.playerDf.Team == row]
-            if tempStatDf["IP"].sum() == 0:
-                continue
-            newTeamStat.append(tempStatDf["W"].sum())
-            newTeamStat.append(tempStatDf["L"].sum())
-            newTeamStat.append(tempStatDf["SV"].sum())
-            newTeamStat.append(tempStatDf["CG"].sum())
-            newTeamStat.append(tempStatDf["SHO"].sum())
-            newTeamStat.append(tempStatDf["BF"].sum())
-            newTeamStat.append(tempStatDf["IP"].sum())
-            newTeamStat.append(tempStatDf["H"].sum())
-            newTeamStat.append(tempStatDf["HR"].sum())
-            newTeamStat.append(tempStatDf["SO"].sum())
-            newTeamStat.append(tempStatDf["BB"].sum())
-            newTeamStat.append(tempStatDf["IBB"].sum())
-            newTeamStat.append(tempStatDf["HB"].sum())
-            newTeamStat.append(tempStatDf["WP"].sum())
-            newTeamStat.append(tempStatDf["R"].sum())
-            newTeamStat.append(tempStatDf["ER"].sum())
-            teamPitList.append(newTeamStat)
-            teamConst = teamConst + 1
-
-        # Getting league stat averages for rate stats (last row to be appended)
-        newTeamStat = ["League Average"]
-        newTeamStat.append(round(self.playerDf["W"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["L"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SV"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["CG"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SHO"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["BF"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["IP"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["H"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["HR"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["SO"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["BB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["IBB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["HB"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["WP"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["R"].sum() / teamConst, 0))
-        newTeamStat.append(round(self.playerDf["ER"].sum() / teamConst, 0))
-        teamPitList.append(newTeamStat)
-
-        # League totals that are needed for other calculations
-        totalIP = self.playerDf["IP"].sum()
-        totalHR = self.playerDf["HR"].sum()
-        totalSO = self.playerDf["SO"].sum()
-        totalBB = self.playerDf["BB"].sum()
-        totalHB = self.playerDf["HB"].sum()
-        totalER = self.playerDf["ER"].sum()
-        totalBF = self.playerDf["BF"].sum()
-        totalERA = 9 * (totalER / totalIP)
-
-        # Initialize new team stat dataframe
-        self.df = pd.DataFrame(teamPitList)
-        # Import adds extra top row of numbers which misaligns columns,
-        # replace with proper row and drop extra number row
-        self.df.columns = self.df.iloc[0]
-        self.df.drop(index=0, axis=1, inplace=True)
-        # Create park factor col to use for any remaining team stats
-        self.df = select_park_factor(self.df, self.suffix, self.year)
-        # League totals have park factor as 1.000
-        self.df["ParkF"] = self.df["ParkF"].replace(0.000, 1.000)
-
-        # Calculations for RATE stats
-        self.df["ERA"] = round(9 * (self.df["ER"] / self.df["IP"]), 2)
-        self.df["ERA+"] = 100 * (totalERA * self.df["ParkF"]) / self.df["ERA"]
-        self.df["kwERA"] = round(
-            (4.80 - (10 * ((self.df["SO"] - self.df["BB"]) / self.df["BF"]))),
-            2,
-        )
-        totalkwERA = round((4.80 - (10 * ((totalSO - totalBB) / totalBF))), 2)
-        self.df["K%"] = round(self.df["SO"] / self.df["BF"], 3)
-        self.df["BB%"] = round(self.df["BB"] / self.df["BF"], 3)
-        self.df["K-BB%"] = round(self.df["K%"] - self.df["BB%"], 3)
-        temp1 = 13 * self.df["HR"]
-        temp2 = 3 * (self.df["BB"] + self.df["HB"])
-        temp3 = 2 * self.df["SO"]
-        self.df["FIP"] = round(
-            ((temp1 + temp2 - temp3) / self.df["IP"])
-            + select_fip_const(self.suffix, self.year),
-            2,
-        )
-        temp1 = 13 * totalHR
-        temp2 = 3 * (totalBB + totalHB)
-        temp3 = 2 * totalSO
-        totalFIP = ((temp1 + temp2 - temp3) / totalIP) + select_fip_const(
-            self.suffix, self.year
-        )
-        self.df["FIP-"] = round(
-            (100 * (self.df["FIP"] / (totalFIP * self.df["ParkF"]))), 0
-        )
-        self.df["WHIP"] = round(
-            (self.df["BB"] + self.df["H"]) / self.df["IP"], 2
-        )
-        self.df["Diff"] = self.df["ERA"] - self.df["FIP"]
-        self.df["HR%"] = self.df["HR"] / self.df["BF"]
-        self.df["kwERA-"] = round((100 * (self.df["kwERA"] / totalkwERA)), 0)
+        import pandas as pd
+
+        # Team COUNTING stat totals, skipping teams that didn't pitch
+        levels = STAT_SUFFIXES[self.suffix]["levels"]
+        teams = get_team_registry(self.year, levels)["Team"]
+        teamDf = self.store.sums.reindex(teams, fill_value=0)
+        teamDf = teamDf[teamDf["IP"] != 0]
+        teamConst = len(teamDf)
+        # League stat averages for rate stats (last row to be appended)
+        leagueRow = round(self.store.league / teamConst, 0)
+        teamDf = pd.concat([teamDf, leagueRow.to_frame("League Average").T])
+        # RATE stats come from the rollup cube
+        rateDf = self.get_cube_rates(teamDf.index)
+        rateDf["Diff"] = rateDf["ERA"] - rateDf["FIP"]
+        for col in [
+            "ERA",
+            "FIP",
+            "kwERA",
+            "WHIP",
+            "ERA+",
+            "FIP-",
+            "kwERA-",
+            "Diff",
+            "HR%",
+            "K%",
+            "BB%",
+            "K-BB%",
+        ]:
+            teamDf[col] = rateDf[col]
+        self.df = teamDf.rename_axis("Team").reset_index()
 
-        # Remove temp Park Factor column
-        self.df.drop("ParkF", axis=1, inplace=True)
         # Number formatting
         formatMapping = {
             "BB%": "{:.1%}",
@@ -986,7 +1655,7 @@ class TeamData(Stats):
             "WHIP": "{:.2f}",
             "kwERA": "{:.2f}",
             "ERA": "{:.2f}",
-            "kwERA-": "{:.1f}",
+            "kwERA-": "{:.0f}",
             "ERA+": "{:.0f}",
             "FIP-": "{:.0f}",
             "W": "{:.0f}",
@@ -1013,694 +1682,6104 @@ class TeamData(Stats):
         self.df = select_league(self.df, self.suffix)
 
 
-def get_playoff_stats(yearDir, suffix, year):
-    """The main stat scraping function that produces Raw stat files.
-    Saving Raw stat files allows for scraping and stat organization to be
-    independent of each other. No scraping should be needed to make changes to
-    final files
+class TeamAggregateStore:
+    def __init__(self, playerDf, suffix):
+        """TeamAggregateStore variables:
+        suffix (string): "BP" or "PP"
+        cols (list - string): The counting stat columns that are summed
+        sums (pandas dataframe): Counting stat totals indexed by team
+        league (pandas series): League counting stat totals
 
-    Parameters:
-    yearDir (string): The directory that stores the raw, scraped NPB stats
-    suffix (string): Determines header row of csv file and indicates the stats
-    that the URLs point to:
-    "BP" = post season batting stat URLs passed in
-    "PP" = post season pitching stat URLs passed in
-    year (string): The desired npb year to scrape
+        Keeps team and league counting stat totals so a change to one team's
+        player rows only updates that team's sums and the league totals by
+        the difference"""
+        self.suffix = suffix
+        self.cols = TEAM_COUNT_COLS[suffix]
+        countDf = self.get_counts(playerDf)
+        self.sums = countDf.groupby("Team")[self.cols].sum()
+        self.league = countDf[self.cols].sum()
 
-    Returns: N/A"""
-    # Make output file
-    outputFile = make_raw_player_file(yearDir, suffix, year)
-    # Grab URLs to scrape
-    urlArr = get_stat_urls(suffix, year)
-    # Create header row
-    if suffix == "BP":
-        outputFile.write(
-            "Player,G,PA,AB,R,H,2B,3B,HR,TB,RBI,SB,CS,SH,SF,BB,"
-            "IBB,HP,SO,GDP,AVG,SLG,OBP,Team,\n"
-        )
-    if suffix == "PP":
-        outputFile.write(
-            "Pitcher,G,W,L,SV,HLD,CG,SHO,PCT,BF,IP,,H,HR,BB,IBB,"
-            "HB,SO,WP,BK,R,ER,ERA,Team,\n"
-        )
+    def get_counts(self, playerDf):
+        """Selects the counting stat columns of player rows (IP converted to
+        thirds for pitching)
 
-    # Loop through all team stat pages in urlArr
-    for url in urlArr:
-        # Make GET request
-        r = get_url(url)
-        # Create the soup for parsing the html content
-        soup = BeautifulSoup(r.content, "html.parser")
-        # Since header row was created, skip to stat rows
-        iterSoup = iter(soup.table)
-        # Left handed pitcher/batter and switch hitter row skip
-        next(iterSoup)
-        # npb.jp header row skip
-        next(iterSoup)
-
-        # Extract table rows from npb.jp team stats
-        for tableRow in iterSoup:
-            # Skip first column for left handed batter/pitcher or switch hitter
-            iterTable = iter(tableRow)
-            next(iterTable)
-            # Write output in csv file format
-            for entry in iterTable:
-                # Remove commas in first and last names
-                entryText = entry.get_text()
-                if entryText.find(","):
-                    entryText = entryText.replace(",", "")
-                # Write output in csv file format
-                outputFile.write(entryText + ",")
-
-            # Get team
-            titleDiv = soup.find(id="stdivtitle")
-            yearTitleStr = titleDiv.h1.get_text()
-            # Correct team name formatting
-            yearTitleStr = yearTitleStr.replace(year, "")
-            if yearTitleStr.find("年度 阪神タイガース"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 阪神タイガース", "Hanshin Tigers"
-                )
-            if yearTitleStr.find("年度 千葉ロッテマリーンズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 千葉ロッテマリーンズ", "Lotte Marines"
-                )
-            if yearTitleStr.find("年度 福岡ソフトバンクホークス"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 福岡ソフトバンクホークス", "SoftBank Hawks"
-                )
-            if yearTitleStr.find("年度 北海道日本ハムファイターズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 北海道日本ハムファイターズ", "Nipponham Fighters"
-                )
-            if yearTitleStr.find("年度 読売ジャイアンツ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 読売ジャイアンツ", "Yomiuri Giants"
-                )
-            if yearTitleStr.find("年度 横浜DeNAベイスターズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 横浜DeNAベイスターズ", "DeNA BayStars"
-                )
-            if yearTitleStr.find("年度 オリックス・バファローズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 オリックス・バファローズ", "ORIX Buffaloes"
+        Parameters:
+        playerDf (pandas dataframe): Organized player stats
+
+        Returns:
+        countDf (pandas dataframe): Team and counting stat columns"""
+        countDf = playerDf[["Team"] + self.cols].copy()
+        if self.suffix == "PP":
+            # IP column ".1 .2 .3" calculation fix
+            countDf["IP"] = convert_ip_column_in(countDf)
+        return countDf
+
+    def update_team(self, team, playerDf):
+        """Replaces a team's totals with the sums of its new player rows and
+        shifts the league totals by the difference
+
+        Parameters:
+        team (string): The team to update
+        playerDf (pandas dataframe): Organized player stats containing the
+        team's new rows (other teams' rows are ignored)
+
+        Returns: N/A"""
+        countDf = self.get_counts(playerDf[playerDf["Team"] == team])
+        newSums = countDf[self.cols].sum()
+        if team in self.sums.index:
+            # Copy, the row can be a view that the assignment below updates
+            oldSums = self.sums.loc[team].copy()
+        else:
+            oldSums = 0
+        self.sums.loc[team] = newSums
+        self.league = self.league + (newSums - oldSums)
+
+
+class RollupCube:
+    def __init__(self, cubeDf, suffix):
+        """RollupCube variables:
+        df (pandas dataframe): Every cell of the cube, one row per cell with
+        its "Grain", the CUBE_GRAINS key columns (blank if not part of the
+        cell's grain) and the summed PARTIAL_COLS
+        suffix (string): Any STAT_SUFFIXES suffix
+        cells (dict): Grain names mapped to that grain's cells indexed by
+        the grain's key columns"""
+        self.df = cubeDf
+        self.suffix = suffix
+        self.cells = {}
+        for grain, keyCols in CUBE_GRAINS.items():
+            grainDf = cubeDf[cubeDf["Grain"] == grain]
+            self.cells[grain] = grainDf.set_index(keyCols)[
+                PARTIAL_COLS[get_stat_type(suffix)]
+            ]
+
+    def cell(self, grain, key):
+        """Returns one cell's summed counting stats
+
+        Parameters:
+        grain (string): A CUBE_GRAINS grain
+        key (tuple): The cell's values of the grain's key columns
+
+        Returns:
+        sums (pandas series): The cell's PARTIAL_COLS sums"""
+        if not isinstance(key, tuple):
+            key = (key,)
+        sums = self.cells[grain].loc[key]
+        return sums
+
+    def rates(self, grain, key=None):
+        """Derives rate and league relative stats for a grain's cells (or a
+        single cell) from the stored sums, without touching player rows
+
+        Parameters:
+        grain (string): A CUBE_GRAINS grain
+        key (tuple): A single cell's key (default None derives every cell)
+
+        Returns:
+        df (pandas dataframe): The cells' sums and rate stats"""
+        if key is None:
+            df = self.cells[grain].reset_index()
+        else:
+            df = self.cell(grain, key).to_frame().T.astype(float)
+        by = "player" if grain in ["player", "seriesPlayer"] else "team"
+        df = calc_partial_rates(df.copy(), self.suffix, by)
+        return df
+
+    def league_rates(self):
+        """Derives the season's rate stats against itself (the year grain
+        with neutral park factors), so its league relative stats are 100
+
+        Parameters: N/A
+
+        Returns:
+        df (pandas dataframe): The year cell's sums and rate stats"""
+        df = self.cells["year"].reset_index()
+        if get_stat_type(self.suffix) == "BP":
+            df["PAxParkF"] = df["PA"]
+        else:
+            # The league's own ERA and FIP times IP
+            df["IPxLgERAxPF"] = 9 * df["ER"]
+            df["IPxLgFIPxPF"] = (
+                (13 * df["HR"])
+                + (3 * (df["BB"] + df["HB"]))
+                - (2 * df["SO"])
+                + df["IPxFIPConst"]
+            )
+        df = calc_partial_rates(df, self.suffix, "team")
+        return df
+
+    def write(self, cubeFile):
+        """Stores the cube's cells as a csv"""
+        self.df.to_csv(cubeFile, index=False)
+
+
+def build_rollup_cube(partialDf, suffix):
+    """Builds a season's rollup cube: the finest cells (a player in one
+    series) are grouped once from the player partials and every grain is
+    summed from those cells
+
+    Parameters:
+    partialDf (pandas dataframe): Per-player per-series partials (see
+    get_season_partials() and get_split_player_df())
+    suffix (string): Any STAT_SUFFIXES suffix
+
+    Returns:
+    cube (RollupCube): The season's cube"""
+    import pandas as pd
+
+    statType = get_stat_type(suffix)
+    cols = PARTIAL_COLS[statType]
+    # Every grain's rows use the finest cells' key columns
+    allKeys = CUBE_GRAINS["seriesPlayer"]
+    cellDf = partialDf.groupby(allKeys, dropna=False)[cols].sum()
+    grainDfs = []
+    for grain, keyCols in CUBE_GRAINS.items():
+        sums = cellDf.groupby(level=keyCols, dropna=False).sum()
+        grainDf = sums.reset_index().reindex(columns=allKeys + cols)
+        grainDf.insert(0, "Grain", grain)
+        grainDfs.append(grainDf)
+    cubeDf = pd.concat(grainDfs, ignore_index=True)
+    cube = RollupCube(cubeDf, suffix)
+    return cube
+
+
+def build_org_cube(orgDf, suffix, year):
+    """Builds a season's rollup cube from organized player stats, all in a
+    single "" series
+
+    Parameters:
+    orgDf (pandas dataframe): Organized (untranslated) player stats
+    suffix (string): Any STAT_SUFFIXES suffix
+    year (string): The stat year
+
+    Returns:
+    cube (RollupCube): The season's cube"""
+    playerDf = get_warehouse_player_df(orgDf, suffix, year)
+    playerDf["Series"] = ""
+    cube = build_rollup_cube(
+        get_season_partials(playerDf, suffix, year), suffix
+    )
+    return cube
+
+
+def read_rollup_cube(cubeFile, suffix):
+    """Reads a stored season cube (see RollupCube.write()), or returns None
+    if the cube was written before a PARTIAL_COLS column was added"""
+    import pandas as pd
+
+    cubeDf = pd.read_csv(
+        cubeFile, dtype={"PlayerID": str, "Series": str}, keep_default_na=False
+    )
+    statType = get_stat_type(suffix)
+    if not set(PARTIAL_COLS[statType]).issubset(cubeDf.columns):
+        return None
+    cube = RollupCube(cubeDf, suffix)
+    return cube
+
+
+class RankingIndex:
+    def __init__(self, indexFile, suffix):
+        """RankingIndex variables:
+        indexFile (string): The .npz file the index is stored in
+        suffix (string): "BP" or "PP"
+        population (dict): LEADER_STATS stats mapped to the sorted values of
+        every indexed season (rate stats only from qualified players)
+        seasons (dict): Years mapped to (stamp, {stat: sorted values}) so a
+        changed season can be taken back out of the population
+        changed (bool): Whether the index differs from indexFile"""
+        import numpy as np
+
+        self.indexFile = indexFile
+        self.suffix = suffix
+        self.population = {
+            stat: np.empty(0) for stat in LEADER_STATS[suffix]
+        }
+        self.seasons = {}
+        self.changed = False
+        if os.path.exists(indexFile):
+            with np.load(indexFile) as stored:
+                for stat in self.population:
+                    key = get_stat_file_name(stat)
+                    self.population[stat] = stored["pop_" + key]
+                for yearStamp in stored["stamps"]:
+                    year, stamp = str(yearStamp).split("|", 1)
+                    self.seasons[year] = (
+                        stamp,
+                        {
+                            stat: stored[year + "_" + get_stat_file_name(stat)]
+                            for stat in self.population
+                        },
+                    )
+
+    def add_season(self, year, stamp, df, qualified):
+        """Merges a season's values into the population with binary search
+        insertion (a season already indexed with the same stamp is skipped,
+        one with another stamp is replaced)
+
+        Parameters:
+        year (string): The stat year
+        stamp (string): Identifies the inputs the season was built from
+        df (pandas dataframe): The season's numeric player stats
+        qualified (numpy array - bool): Rate stat qualification of df's rows
+        (see get_qualified())
+
+        Returns:
+        added (bool): Whether the population changed"""
+        import numpy as np
+
+        if year in self.seasons:
+            if self.seasons[year][0] == stamp:
+                return False
+            self.remove_season(year)
+        seasonValues = {}
+        for stat in self.population:
+            values = df[stat].to_numpy(dtype=float)
+            mask = ~np.isnan(values)
+            if stat not in TEAM_COUNT_COLS[self.suffix]:
+                mask = mask & qualified
+            values = np.sort(values[mask])
+            population = self.population[stat]
+            self.population[stat] = np.insert(
+                population, np.searchsorted(population, values), values
+            )
+            seasonValues[stat] = values
+        self.seasons[year] = (stamp, seasonValues)
+        self.changed = True
+        return True
+
+    def remove_season(self, year):
+        """Takes a season's values back out of the population. Equal values
+        are told apart by their order within the season's sorted values"""
+        import numpy as np
+
+        for stat, values in self.seasons.pop(year)[1].items():
+            population = self.population[stat]
+            nthEqual = np.arange(len(values)) - np.searchsorted(values, values)
+            positions = np.searchsorted(population, values) + nthEqual
+            self.population[stat] = np.delete(population, positions)
+        self.changed = True
+
+    def rank(self, df, qualified):
+        """Ranks rows against the population: percentiles (midrank, 0-100)
+        and z-scores, both oriented so higher is better (lower is better
+        stats in LEADER_STATS are flipped). Unqualified rows get no rate
+        stat rankings
+
+        Parameters:
+        df (pandas dataframe): Numeric player stats
+        qualified (numpy array - bool): Rate stat qualification of df's rows
+
+        Returns:
+        rankDf (pandas dataframe): "[stat] Pct" and "[stat] Z" columns for
+        every LEADER_STATS stat, indexed like df"""
+        import numpy as np
+        import pandas as pd
+
+        rankCols = {}
+        for stat, lowerBetter in LEADER_STATS[self.suffix].items():
+            population = self.population[stat]
+            values = df[stat].to_numpy(dtype=float)
+            pct = np.full(len(values), np.nan)
+            zScore = np.full(len(values), np.nan)
+            mask = ~np.isnan(values)
+            if stat not in TEAM_COUNT_COLS[self.suffix]:
+                mask = mask & qualified
+            if len(population):
+                below = np.searchsorted(population, values[mask], "left")
+                notAbove = np.searchsorted(population, values[mask], "right")
+                pct[mask] = 50 * (below + notAbove) / len(population)
+                spread = population.std()
+                if spread > 0:
+                    zScore[mask] = (values[mask] - population.mean()) / spread
+            if lowerBetter:
+                pct = 100 - pct
+                zScore = -zScore
+            rankCols[stat + " Pct"] = np.round(pct, 1)
+            rankCols[stat + " Z"] = np.round(zScore, 2)
+        rankDf = pd.DataFrame(rankCols, index=df.index)
+        return rankDf
+
+    def save(self):
+        """Stores the index (only if it changed)"""
+        import numpy as np
+
+        if not self.changed:
+            return
+        arrays = {}
+        for stat, values in self.population.items():
+            arrays["pop_" + get_stat_file_name(stat)] = values
+        for year, (stamp, seasonValues) in self.seasons.items():
+            for stat, values in seasonValues.items():
+                arrays[year + "_" + get_stat_file_name(stat)] = values
+        arrays["stamps"] = np.array(
+            [year + "|" + stamp for year, (stamp, _) in self.seasons.items()]
+        )
+        # Written beside the index then swapped in so readers never see a
+        # partial file
+        tempFile = self.indexFile + ".tmp.npz"
+        np.savez(tempFile, **arrays)
+        os.replace(tempFile, self.indexFile)
+        self.changed = False
+
+
+class StatCache:
+    def __init__(
+        self,
+        statsDir,
+        intervalWorkers=None,
+        skipUnchanged=False,
+        writeCube=False,
+    ):
+        """StatCache variables:
+        statsDir (string): The directory that holds every year directory
+        intervalWorkers (int): Processes used for the bootstrap interval
+        columns of the AltView files (default None leaves them out)
+        skipUnchanged (bool): Leave final/alt files whose contents didn't
+        change untouched
+        writeCube (bool): Also write each regenerated year's rollup cube
+        ([year]Cube[suffix].csv, see output_cube())
+        entries (dict): (year, suffix) keys mapped to the year's PlayerData
+        ("player"), TeamData ("team"), untranslated organized player df
+        ("orgDf"), RollupCube ("cube") and the input file stamps each stage
+        was last built from
+
+        Keeps organized stats in memory so repeated regeneration (daemon and
+        watch modes) only rebuilds the stages whose input files changed"""
+        self.statsDir = statsDir
+        self.intervalWorkers = intervalWorkers
+        self.skipUnchanged = skipUnchanged
+        self.writeCube = writeCube
+        self.entries = {}
+
+    def get_stamp(self, stage, year, suffix):
+        """Collects the modification times of every file a stage depends on
+
+        Parameters:
+        stage (string): "org", "playerOut" or "teamOut"
+        year (string): The stat year
+        suffix (string): Any STAT_SUFFIXES suffix
+
+        Returns:
+        stamp (tuple): mtimes of the stage's input files (None if missing)"""
+        relDir = os.path.dirname(__file__)
+        fileList = [relDir + "/input/" + name for name in STAGE_INPUTS[stage]]
+        if stage == "org":
+            yearDir = os.path.join(self.statsDir, year)
+            fileList.append(
+                yearDir + "/" + year + "StatsRaw" + suffix + ".csv"
+            )
+        stamp = []
+        for fileName in fileList:
+            if os.path.exists(fileName):
+                stamp.append(os.stat(fileName).st_mtime_ns)
+            else:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def load(self, year, suffix, force=None):
+        """Returns the cached PlayerData/TeamData for a year, organizing the
+        raw stat file again only if it or the org stage inputs changed
+
+        Parameters:
+        year (string): The stat year
+        suffix (string): Any STAT_SUFFIXES suffix
+        force (bool): True rebuilds even if nothing changed, False only
+        builds missing entries. Default None compares the org stage stamps
+
+        Returns:
+        entry (dict): The cache entry for (year, suffix)"""
+        stamp = self.get_stamp("org", year, suffix)
+        entry = self.entries.get((year, suffix))
+        if entry is None:
+            rebuild = True
+        elif force is None:
+            rebuild = entry["org"] != stamp
+        else:
+            rebuild = force
+        if rebuild:
+            yearDir = os.path.join(self.statsDir, year)
+            playerData = PlayerData(self.statsDir, yearDir, suffix, year)
+            cube = self.build_cube(playerData)
+            teamData = TeamData(
+                playerData.df, self.statsDir, yearDir, suffix, year, cube
+            )
+            entry = {
+                "player": playerData,
+                "team": teamData,
+                "orgDf": playerData.df.copy(),
+                "org": stamp,
+                "cube": cube,
+                "playerOut": None,
+                "teamOut": None,
+            }
+            self.entries[(year, suffix)] = entry
+        entry["org"] = stamp
+        return entry
+
+    def regenerate(self, year, suffixes=("BP", "PP"), stages=None):
+        """Rebuilds and writes the alt and final files of a year, skipping
+        every stage whose inputs are unchanged since the last regeneration
+
+        Parameters:
+        year (string): The stat year
+        suffixes (tuple - string): The stat types to regenerate
+        stages (list - string): Rebuild exactly these stages ("org",
+        "playerOut", "teamOut") instead of comparing stamps. Rebuilding
+        "org" also rebuilds both output stages
+
+        Returns:
+        rebuilt (list - string): "[suffix] [stage]" of every rebuilt stage"""
+        rebuilt = []
+        for suffix in suffixes:
+            oldEntry = self.entries.get((year, suffix))
+            if stages is None:
+                entry = self.load(year, suffix)
+            else:
+                entry = self.load(year, suffix, "org" in stages)
+            orgRebuilt = entry is not oldEntry
+            if orgRebuilt:
+                rebuilt.append(suffix + " org")
+                if self.writeCube:
+                    self.output_cube(year, suffix)
+            for stage in ["playerOut", "teamOut"]:
+                stamp = self.get_stamp(stage, year, suffix)
+                if orgRebuilt:
+                    needed = True
+                elif stages is None:
+                    needed = entry[stage] != stamp
+                else:
+                    needed = stage in stages
+                if needed and stage == "playerOut":
+                    # Output translates names in place, start from organized df
+                    entry["player"].df = entry["orgDf"].copy()
+                    if self.intervalWorkers is not None:
+                        entry["player"].intervals = bootstrap_intervals(
+                            entry["orgDf"], suffix, year, self.intervalWorkers
+                        )
+                    entry["player"].skipUnchanged = self.skipUnchanged
+                    entry["player"].output_final()
+                elif needed:
+                    entry["team"].skipUnchanged = self.skipUnchanged
+                    entry["team"].output_final()
+                if needed:
+                    rebuilt.append(suffix + " " + stage)
+                entry[stage] = stamp
+        return rebuilt
+
+    def update_teams(self, year, suffix, teams):
+        """Re-organizes a year's player stats after some teams' raw rows
+        changed and updates only those teams' aggregates before writing the
+        outputs again
+
+        Parameters:
+        year (string): The stat year
+        suffix (string): Any STAT_SUFFIXES suffix
+        teams (list - string): The teams whose raw rows changed
+
+        Returns:
+        rebuilt (list - string): "[suffix] [stage]" of every rebuilt stage"""
+        entry = self.entries.get((year, suffix))
+        if entry is None:
+            return self.regenerate(year, (suffix,))
+        yearDir = os.path.join(self.statsDir, year)
+        playerData = PlayerData(self.statsDir, yearDir, suffix, year)
+        entry["player"] = playerData
+        entry["orgDf"] = playerData.df.copy()
+        entry["org"] = self.get_stamp("org", year, suffix)
+        entry["cube"] = self.build_cube(playerData)
+        for team in teams:
+            entry["team"].update_team(team, playerData.df, entry["cube"])
+        if self.writeCube:
+            self.output_cube(year, suffix)
+        rebuilt = [suffix + " org (" + ", ".join(teams) + ")"]
+        rebuilt = rebuilt + self.regenerate(
+            year, (suffix,), ["playerOut", "teamOut"]
+        )
+        return rebuilt
+
+    def mark_current(self):
+        """Treats every cached stage as up to date with the current input
+        files. Used by watch mode once it has rebuilt everything a batch of
+        edits affected, so unaffected years aren't rebuilt later
+
+        Parameters: N/A
+
+        Returns: N/A"""
+        for (year, suffix), entry in self.entries.items():
+            for stage in ["org", "playerOut", "teamOut"]:
+                entry[stage] = self.get_stamp(stage, year, suffix)
+
+    def build_cube(self, playerData):
+        """Builds a year's rollup cube from the raw stats a PlayerData has
+        already read, split by series
+
+        Parameters:
+        playerData (PlayerData): The year's organized player stats
+
+        Returns:
+        cube (RollupCube): The year's cube"""
+        splitDf = get_split_player_df(
+            playerData.yearDir,
+            playerData.suffix,
+            playerData.year,
+            playerData.rawDf,
+        )
+        cube = build_rollup_cube(
+            get_season_partials(splitDf, playerData.suffix, playerData.year),
+            playerData.suffix,
+        )
+        return cube
+
+    def output_cube(self, year, suffix):
+        """Stores a loaded year's rollup cube with the year's stats
+        ([year]Cube[suffix].csv)
+
+        Parameters:
+        year (string): The stat year
+        suffix (string): Any STAT_SUFFIXES suffix
+
+        Returns:
+        cube (RollupCube): The year's cube"""
+        cube = self.load(year, suffix)["cube"]
+        cubeFile = os.path.join(
+            self.statsDir, year, year + "Cube" + suffix + ".csv"
+        )
+        cube.write(cubeFile)
+        return cube
+
+    def output_leaders(self, year, top=10):
+        """Writes a year's batting and pitching leaderboards. Qualification
+        uses the team games of the year's batting stats for both stat types.
+        Years split by series also get per-series leaderboards qualified by
+        each team's games in that series
+
+        Parameters:
+        year (string): The stat year
+        top (int): Leaders per stat (ties at the cutoff are kept)
+
+        Returns:
+        leaderFiles (list - string): The written leaderboard csv files"""
+        batDf = convert_stats_to_numeric(self.load(year, "BP")["orgDf"].copy())
+        teamGames = get_team_games(batDf)
+        yearDir = os.path.join(self.statsDir, year)
+        leaderFiles = []
+        seriesDfs = {}
+        for suffix in ["BP", "PP"]:
+            entry = self.load(year, suffix)
+            leaderFiles = leaderFiles + output_leaders(
+                entry["orgDf"], suffix, year, yearDir, teamGames, top
+            )
+            seriesDf = entry["cube"].rates("seriesPlayer")
+            seriesDfs[suffix] = seriesDf[seriesDf["Series"] != ""]
+        seriesGames = get_team_games(seriesDfs["BP"], ("Series", "Team"))
+        for suffix, seriesDf in seriesDfs.items():
+            leaderFiles = leaderFiles + output_series_leaders(
+                seriesDf, suffix, year, yearDir, seriesGames, top
+            )
+        return leaderFiles
+
+    def get_site_tables(self, year):
+        """Builds a year's site tables from the organized frames: display
+        strings like the final files, with names and links split apart (see
+        split_html_links())
+
+        Parameters:
+        year (string): The stat year
+
+        Returns:
+        tables (dict): SITE_PAGES page names mapped to (suffix, dataframe)"""
+        tables = {}
+        for suffix in ["BP", "PP"]:
+            entry = self.load(year, suffix)
+            nameCol = "Player" if suffix == "BP" else "Pitcher"
+            playerDf = translate_players(entry["orgDf"].copy(), nameCol)
+            playerDf = playerDf.drop(columns="keys", errors="ignore")
+            playerDf = convert_player_to_html(playerDf, suffix, year)
+            playerDf = convert_team_to_html(playerDf, "Abb")
+            teamDf = entry["team"].df.copy()
+            teamDf["League"] = teamDf["League"].fillna("")
+            teamDf = convert_team_to_html(teamDf, "Full")
+            for table, df in [("player", playerDf), ("team", teamDf)]:
+                # Unformattable stats come out as "nan", shown blank
+                df = df.astype(str).replace("nan", "").reset_index(drop=True)
+                df = split_html_links(df)
+                tables[SITE_PAGES[(suffix, table)]] = (suffix, df)
+        return tables
+
+    def get_ranking_stats(self, year, suffix):
+        """Gets a year's players ready for the ranking index
+
+        Parameters:
+        year (string): The stat year
+        suffix (string): "BP" or "PP"
+
+        Returns:
+        df (pandas dataframe): Warehouse style numeric player stats (see
+        get_warehouse_player_df())
+        qualified (numpy array - bool): Rate stat qualification of df's rows
+        (team games from the year's batting stats, like the leaderboards)"""
+        batDf = convert_stats_to_numeric(self.load(year, "BP")["orgDf"].copy())
+        orgDf = self.load(year, suffix)["orgDf"]
+        df = get_warehouse_player_df(orgDf, suffix, year)
+        qualified = get_qualified(df, suffix, get_team_games(batDf))
+        return df, qualified
+
+    def query(self, year, suffix, table="player", player=None, team=None):
+        """Looks up rows of a cached year's organized stats
+
+        Parameters:
+        year (string): The stat year
+        suffix (string): "BP" or "PP"
+        table (string): "player" or "team" stats
+        player (string): Case insensitive part of a player name to match
+        team (string): Case insensitive part of a team name to match
+
+        Returns:
+        rows (list - dict): The matching rows"""
+        entry = self.entries.get((year, suffix))
+        if entry is None or entry["playerOut"] is None:
+            # Names are only translated once output files are made
+            self.regenerate(year, (suffix,))
+            entry = self.entries[(year, suffix)]
+        df = entry[table].df.drop(columns="keys", errors="ignore")
+        if player is not None and table == "player":
+            nameCol = df.columns[0]
+            df = df[
+                df[nameCol].str.contains(player, case=False, regex=False)
+            ]
+        if team is not None:
+            df = df[df["Team"].str.contains(team, case=False, regex=False)]
+        rows = df.to_dict("records")
+        return rows
+
+
+class Warehouse:
+    def __init__(self, dbFile):
+        """Warehouse variables:
+        dbFile (string): The SQLite database file
+        conn (sqlite3 Connection): The open database connection
+        lastQueryMs (float): How long the last query took to run
+
+        Stores every loaded season's organized player and team stats in
+        SQLite tables (see WAREHOUSE_TABLES) indexed by player ID, team, year
+        and league so cross-season lookups skip the organize stage"""
+        import sqlite3
+
+        self.dbFile = dbFile
+        self.conn = sqlite3.connect(dbFile)
+        self.lastQueryMs = 0.0
+        # Stamps of the inputs each season was loaded from
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seasons (Year INTEGER, Suffix TEXT, "
+            "Stamp TEXT, PRIMARY KEY (Year, Suffix))"
+        )
+
+    def close(self):
+        """Closes the database connection"""
+        self.conn.close()
+
+    def load_season(self, cache, year, force=False):
+        """Loads a season's organized stats, skipping stat types whose raw
+        and input files are unchanged since they were last loaded
+
+        Parameters:
+        cache (StatCache): Supplies the organized PlayerData/TeamData
+        year (string): The season to load
+        force (bool): Reload even if nothing changed
+
+        Returns:
+        loaded (list - string): The suffixes that were (re)loaded"""
+        loaded = []
+        for suffix in ["BP", "PP"]:
+            stamp = str(
+                (WAREHOUSE_VERSION,)
+                + cache.get_stamp("org", year, suffix)
+                + cache.get_stamp("playerOut", year, suffix)
+            )
+            oldStamp = self.conn.execute(
+                "SELECT Stamp FROM seasons WHERE Year = ? AND Suffix = ?",
+                (int(year), suffix),
+            ).fetchone()
+            if not force and oldStamp is not None and oldStamp[0] == stamp:
+                continue
+            entry = cache.load(year, suffix)
+            playerDf = get_warehouse_player_df(entry["orgDf"], suffix, year)
+            teamDf = convert_stats_to_numeric(entry["team"].df.copy())
+            teamDf.insert(0, "Year", int(year))
+            # Per-season partials let career stats merge seasons in SQL
+            partialDf = get_season_partials(playerDf, suffix, year)
+            if suffix == "PP":
+                # IP is stored in thirds like the partials so it can be
+                # summed, lookups show it with .1/.2 again
+                playerDf["IP"] = convert_ip_column_in(playerDf)
+                teamDf["IP"] = convert_ip_column_in(teamDf)
+            self.write_table(
+                WAREHOUSE_TABLES[(suffix, "player")], playerDf, year
+            )
+            self.write_table(WAREHOUSE_TABLES[(suffix, "team")], teamDf, year)
+            self.write_table(
+                WAREHOUSE_TABLES[(suffix, "partial")], partialDf, year
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO seasons VALUES (?, ?, ?)",
+                (int(year), suffix, stamp),
+            )
+            self.conn.commit()
+            loaded.append(suffix)
+        return loaded
+
+    def write_table(self, table, df, year):
+        """Replaces a season's rows in a warehouse table. If the stat
+        columns changed the table is rebuilt with the other seasons kept
+
+        Parameters:
+        table (string): The table to write
+        df (pandas dataframe): The season's rows (with a Year column)
+        year (string): The season being replaced
+
+        Returns: N/A"""
+        import pandas as pd
+
+        cols = [
+            row[1]
+            for row in self.conn.execute(
+                'PRAGMA table_info("' + table + '")'
+            ).fetchall()
+        ]
+        if cols == list(df.columns):
+            self.conn.execute(
+                'DELETE FROM "' + table + '" WHERE Year = ?', (int(year),)
+            )
+            df.to_sql(table, self.conn, if_exists="append", index=False)
+        else:
+            if cols:
+                otherDf = pd.read_sql_query(
+                    'SELECT * FROM "' + table + '" WHERE Year != ?',
+                    self.conn,
+                    params=(int(year),),
                 )
-            if yearTitleStr.find("年度 広島東洋カープ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 広島東洋カープ", "Hiroshima Carp"
+                df = pd.concat([otherDf, df], ignore_index=True)
+            df.to_sql(table, self.conn, if_exists="replace", index=False)
+        for col in WAREHOUSE_INDEXES:
+            if col in df.columns:
+                self.conn.execute(
+                    'CREATE INDEX IF NOT EXISTS "idx_'
+                    + table
+                    + "_"
+                    + col
+                    + '" ON "'
+                    + table
+                    + '" ("'
+                    + col
+                    + '")'
                 )
-            if yearTitleStr.find("年度 中日ドラゴンズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 中日ドラゴンズ", "Chunichi Dragons"
+
+    def query(self, sql, params=()):
+        """Runs a read query against the warehouse
+
+        Parameters:
+        sql (string): The SQL query
+        params (tuple): The query's parameters
+
+        Returns:
+        df (pandas dataframe): The query results"""
+        import pandas as pd
+        from time import perf_counter
+
+        startTime = perf_counter()
+        cursor = self.conn.execute(sql, params)
+        rows = cursor.fetchall()
+        self.lastQueryMs = (perf_counter() - startTime) * 1000
+        cols = [description[0] for description in cursor.description]
+        df = pd.DataFrame(rows, columns=cols)
+        return df
+
+    def get_player_filter(self, table):
+        """Returns the WHERE clause of player lookups: every season of any
+        player whose ID matches exactly or who had a matching name in some
+        season (so other romanizations of the name are included). Takes the
+        player ID and the LIKE name pattern as parameters"""
+        playerFilter = (
+            " WHERE COALESCE(PlayerID, Name) IN (SELECT COALESCE(PlayerID, "
+            'Name) FROM "' + table + '" WHERE PlayerID = ? OR Name LIKE ?) '
+        )
+        return playerFilter
+
+    def player_history(self, player, suffix="BP"):
+        """Returns a player's season rows, matching a player ID exactly or
+        any part of the name"""
+        table = WAREHOUSE_TABLES[(suffix, "player")]
+        df = self.query(
+            'SELECT * FROM "'
+            + table
+            + '"'
+            + self.get_player_filter(table)
+            + "ORDER BY Year",
+            (player, "%" + player + "%"),
+        )
+        if suffix == "PP":
+            df["IP"] = convert_ip_column_out(df)
+        return df
+
+    def team_history(self, team, suffix="BP"):
+        """Returns a team's season rows, matching any part of the name"""
+        table = WAREHOUSE_TABLES[(suffix, "team")]
+        df = self.query(
+            'SELECT * FROM "' + table + '" WHERE Team LIKE ? ORDER BY Year',
+            ("%" + team + "%",),
+        )
+        if suffix == "PP":
+            df["IP"] = convert_ip_column_out(df)
+        return df
+
+    def player_totals(self, player):
+        """Sums a player's batting counting stats across every loaded season
+        and recomputes AVG/OBP/SLG/OPS from the totals. Seasons are merged
+        by player ID, so a name romanized differently in some seasons stays
+        one player (players without an ID are merged by name)
+
+        Parameters:
+        player (string): Player ID or part of the name
+
+        Returns:
+        df (pandas dataframe): One row per matching player"""
+        table = WAREHOUSE_TABLES[("BP", "player")]
+        df = self.query(
+            "SELECT PlayerID, MAX(Name) AS Name, COUNT(*) AS Seasons, "
+            "SUM(G) AS G, "
+            "SUM(PA) AS PA, SUM(AB) AS AB, SUM(H) AS H, "
+            'SUM("2B") AS "2B", SUM("3B") AS "3B", SUM(HR) AS HR, '
+            "SUM(BB) AS BB, SUM(HP) AS HP, SUM(SF) AS SF, SUM(SO) AS SO "
+            'FROM "'
+            + table
+            + '"'
+            + self.get_player_filter(table)
+            + "GROUP BY COALESCE(PlayerID, Name)",
+            (player, "%" + player + "%"),
+        )
+        df["AVG"] = df["H"] / df["AB"]
+        df["OBP"] = (df["H"] + df["BB"] + df["HP"]) / (
+            df["AB"] + df["BB"] + df["HP"] + df["SF"]
+        )
+        df["SLG"] = (
+            df["H"] + df["2B"] + (2 * df["3B"]) + (3 * df["HR"])
+        ) / df["AB"]
+        df["OPS"] = df["OBP"] + df["SLG"]
+        return df
+
+    def career_stats(self, suffix, by="player", years=None):
+        """Merges the cached per-season partials of any set of seasons and
+        recomputes every rate and league relative stat from the totals
+
+        Parameters:
+        suffix (string): "BP" or "PP"
+        by (string): "player" or "team" totals
+        years (list - string): Seasons to merge (default None merges all)
+
+        Returns:
+        df (pandas dataframe): One row per player or team"""
+        table = WAREHOUSE_TABLES[(suffix, "partial")]
+        sums = ", ".join(
+            'SUM("' + col + '") AS "' + col + '"'
+            for col in PARTIAL_COLS[suffix]
+        )
+        if by == "player":
+            keyCols = (
+                "PlayerID, MAX(Name) AS Name, "
+                "GROUP_CONCAT(DISTINCT Team) AS Teams"
+            )
+            groupBy = "COALESCE(PlayerID, Name)"
+        else:
+            keyCols = "Team, League"
+            groupBy = "Team, League"
+        sql = (
+            "SELECT "
+            + keyCols
+            + ", COUNT(DISTINCT Year) AS Seasons, "
+            + sums
+            + ' FROM "'
+            + table
+            + '"'
+        )
+        params = ()
+        if years:
+            sql = sql + " WHERE Year IN (" + ", ".join("?" * len(years)) + ")"
+            params = tuple(int(year) for year in years)
+        sql = sql + " GROUP BY " + groupBy
+        df = self.query(sql, params)
+        df = calc_partial_rates(df, suffix, by)
+        return df
+
+
+class PageArchive:
+    def __init__(self, statsDir):
+        """PageArchive variables:
+        archiveDir (string): The archive directory (stats/archive)
+        indexFile (string): pageIndex.csv, one URL, Fetched (UTC time) and
+        Hash row per fetch, only ever appended to
+
+        Pages are stored once per distinct content, gzipped and named by
+        the sha256 of the page (objects/[2 hash chars]/[hash].html.gz), so
+        refetching an unchanged page only adds an index row"""
+        self.archiveDir = os.path.join(statsDir, "archive")
+        if not (os.path.exists(self.archiveDir)):
+            os.makedirs(self.archiveDir)
+        self.indexFile = os.path.join(self.archiveDir, "pageIndex.csv")
+
+    def get_object_file(self, pageHash):
+        """Returns the path a page's content is stored at"""
+        return os.path.join(
+            self.archiveDir, "objects", pageHash[:2], pageHash + ".html.gz"
+        )
+
+    def store(self, url, content, fetched=None):
+        """Archives a fetched page
+
+        Parameters:
+        url (string): The page's URL
+        content (bytes): The page's raw content
+        fetched (string): ISO fetch time (default None is now)
+
+        Returns:
+        pageHash (string): The sha256 the content is stored under"""
+        import csv
+        import gzip
+        import hashlib
+        from datetime import timezone
+
+        pageHash = hashlib.sha256(content).hexdigest()
+        objectFile = self.get_object_file(pageHash)
+        if not (os.path.exists(objectFile)):
+            os.makedirs(os.path.dirname(objectFile), exist_ok=True)
+            # mtime=0 keeps the stored bytes the same for the same page
+            tempFile = objectFile + ".tmp"
+            with open(tempFile, "wb") as objectOut:
+                objectOut.write(gzip.compress(content, mtime=0))
+            os.replace(tempFile, objectFile)
+        if fetched is None:
+            fetched = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        newIndex = not os.path.exists(self.indexFile)
+        with open(self.indexFile, "a", newline="") as indexOut:
+            writer = csv.writer(indexOut)
+            if newIndex:
+                writer.writerow(["URL", "Fetched", "Hash"])
+            writer.writerow([url, fetched, pageHash])
+        return pageHash
+
+    def read(self, pageHash):
+        """Returns an archived page's content, checked against its hash"""
+        import gzip
+        import hashlib
+
+        with open(self.get_object_file(pageHash), "rb") as objectIn:
+            content = gzip.decompress(objectIn.read())
+        if hashlib.sha256(content).hexdigest() != pageHash:
+            raise ValueError("Archived page " + pageHash + " is corrupt")
+        return content
+
+    def latest(self):
+        """Returns every archived URL mapped to the hash of its newest fetch
+        """
+        import pandas as pd
+
+        if not (os.path.exists(self.indexFile)):
+            return {}
+        indexDf = pd.read_csv(self.indexFile, dtype=str)
+        # ISO UTC times sort chronologically as strings
+        indexDf = indexDf.sort_values("Fetched", kind="stable")
+        latest = indexDf.drop_duplicates("URL", keep="last")
+        return dict(zip(latest["URL"], latest["Hash"]))
+
+
+def reparse_raw_file(statsDir, year, suffix):
+    """Rebuilds a year's raw stat file from the newest archived copy of each
+    of its playoffUrls.csv pages, without network access. The raw file is
+    left as it is if any page was never archived
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    year (string): The stat year
+    suffix (string): Any STAT_SUFFIXES suffix
+
+    Returns:
+    missing (list - string): URLs with no archived page"""
+    archive = PageArchive(statsDir)
+    latest = archive.latest()
+    rows = []
+    missing = []
+    for url in get_stat_urls(suffix, year):
+        if url not in latest:
+            missing.append(url)
+            continue
+        content = archive.read(latest[url])
+        rows = rows + parse_stat_page(content, year, get_url_series(url))
+    if missing:
+        return missing
+    yearDir = os.path.join(statsDir, year)
+    if not (os.path.exists(yearDir)):
+        os.mkdir(yearDir)
+    outputFile = make_raw_player_file(yearDir, suffix, year)
+    outputFile.write(get_raw_header(suffix))
+    outputFile.writelines(rows)
+    outputFile.close()
+    return missing
+
+
+class GameLog:
+    def __init__(self, statsDir, year):
+        """GameLog variables:
+        gameDir (string): The year's game log directory ([year]/games)
+        year (string): The stat year
+        gameIds (set - string): Every ingested game's ID (from the
+        [year]Games.csv index)
+        totals (dict): ("BP"|"PP", "player"|"team") keys mapped to running
+        total dataframes, loaded when first needed
+
+        Every ingested game appends its player lines to [year]GameLog[suffix]
+        .csv (earlier lines are never changed) and adds them to the running
+        player and team totals, so updating after a game only touches that
+        game's rows"""
+        import pandas as pd
+
+        self.gameDir = os.path.join(statsDir, year, "games")
+        if not (os.path.exists(self.gameDir)):
+            os.makedirs(self.gameDir)
+        self.year = year
+        self.gameIds = set()
+        indexFile = self.get_file("Games")
+        if os.path.exists(indexFile):
+            indexDf = pd.read_csv(indexFile, dtype={"GameID": str})
+            self.gameIds = set(indexDf["GameID"])
+        self.totals = {}
+
+    def get_file(self, name, suffix=""):
+        """Returns the path of one of the year's game log files"""
+        fileName = self.gameDir + "/" + self.year + name + suffix + ".csv"
+        return fileName
+
+    def get_totals(self, suffix, table):
+        """Returns the running totals of a stat type
+
+        Parameters:
+        suffix (string): "BP" or "PP"
+        table (string): "player" (per Name and Team) or "team" totals
+
+        Returns:
+        totalDf (pandas dataframe): Counting stat sums indexed by the
+        table's key columns"""
+        import pandas as pd
+
+        keyCols = ["Name", "Team"] if table == "player" else ["Team"]
+        if (suffix, table) not in self.totals:
+            name = "GameTotals" if table == "player" else "GameTeamTotals"
+            totalFile = self.get_file(name, suffix)
+            if os.path.exists(totalFile):
+                totalDf = pd.read_csv(totalFile).set_index(keyCols)
+            else:
+                totalDf = pd.DataFrame(
+                    columns=keyCols + TEAM_COUNT_COLS[suffix] + ["G"]
+                ).set_index(keyCols)
+            self.totals[(suffix, table)] = totalDf
+        return self.totals[(suffix, table)]
+
+    def ingest(self, gameId, series, link, gameLines):
+        """Appends a game's player lines and adds them to the running totals
+        unless the game was already ingested. Every updated file is written
+        to a temp file first and only replaces the old one once all of them
+        (and the index) are ready, so a game that fails partway leaves no
+        rows behind and is simply ingested again on the next run
+
+        Parameters:
+        gameId (string): The game's ID
+        series (string): The game's series code (see SERIES_NAMES)
+        link (string): The box score URL the lines came from
+        gameLines (dict): "BP"/"PP" mapped to the game's player lines (see
+        parse_box_score())
+
+        Returns:
+        ingested (bool): False if the game was skipped"""
+        import shutil
+
+        import pandas as pd
+
+        if gameId in self.gameIds:
+            return False
+        # File paths mapped to their temp files and the new running totals,
+        # nothing is replaced or kept until every file is written
+        tempFiles = {}
+        newTotals = {}
+        indexFile = self.get_file("Games")
+        tempIndex = indexFile + ".tmp"
+        try:
+            for suffix, lineDf in gameLines.items():
+                lineDf = lineDf.copy()
+                lineDf.insert(0, "Series", series)
+                lineDf.insert(0, "GameID", gameId)
+                logFile = self.get_file("GameLog", suffix)
+                tempFiles[logFile] = logFile + ".tmp"
+                if os.path.exists(logFile):
+                    shutil.copyfile(logFile, tempFiles[logFile])
+                lineDf.to_csv(
+                    tempFiles[logFile],
+                    mode="a",
+                    header=not os.path.exists(logFile),
+                    index=False,
                 )
-            if yearTitleStr.find("年度 埼玉西武ライオンズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 埼玉西武ライオンズ", "Seibu Lions"
+                countCols = TEAM_COUNT_COLS[suffix] + ["G"]
+                for table, keyCols in [
+                    ("player", ["Name", "Team"]),
+                    ("team", ["Team"]),
+                ]:
+                    gameSums = lineDf.groupby(keyCols)[countCols].sum()
+                    if table == "team":
+                        # A team plays the game once however many players
+                        # appear
+                        gameSums["G"] = 1
+                    totalDf = self.get_totals(suffix, table)
+                    totalDf = totalDf.add(gameSums, fill_value=0)
+                    totalDf = convert_count_columns_to_int(totalDf, suffix)
+                    newTotals[(suffix, table)] = totalDf
+                    name = "GameTeamTotals"
+                    if table == "player":
+                        name = "GameTotals"
+                    totalFile = self.get_file(name, suffix)
+                    tempFiles[totalFile] = totalFile + ".tmp"
+                    totalDf.to_csv(tempFiles[totalFile])
+            if os.path.exists(indexFile):
+                shutil.copyfile(indexFile, tempIndex)
+            pd.DataFrame(
+                [{"GameID": gameId, "Series": series, "Link": link}]
+            ).to_csv(
+                tempIndex,
+                mode="a",
+                header=not os.path.exists(indexFile),
+                index=False,
+            )
+        except BaseException:
+            for tempFile in list(tempFiles.values()) + [tempIndex]:
+                if os.path.exists(tempFile):
+                    os.remove(tempFile)
+            raise
+        for fileName, tempFile in tempFiles.items():
+            os.replace(tempFile, fileName)
+        # The index is replaced last, it marks the game as ingested
+        os.replace(tempIndex, indexFile)
+        self.totals.update(newTotals)
+        self.gameIds.add(gameId)
+        return True
+
+
+def parse_box_score(content):
+    """Parses the batting and pitching tables of an npb.jp box score page
+    into one line per player. Tables are recognized by their headers (see
+    BOX_SCORE_COLS) and their team by the nearest heading before them
+
+    Parameters:
+    content (bytes): The page's HTML
+
+    Returns:
+    gameLines (dict): "BP"/"PP" mapped to dataframes of Name, Team, G and
+    the TEAM_COUNT_COLS (columns the page lacks are 0)"""
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    lines = {"BP": [], "PP": []}
+    # Columns found on the page, missing PA and TB are derived
+    pageCols = set()
+    for table in soup.find_all("table"):
+        tableRows = table.find_all("tr")
+        if len(tableRows) == 0:
+            continue
+        headers = [
+            cell.get_text(strip=True)
+            for cell in tableRows[0].find_all(["th", "td"])
+        ]
+        if "投球回" in headers:
+            suffix = "PP"
+        elif "打数" in headers:
+            suffix = "BP"
+        else:
+            continue
+        team = get_box_score_team(table)
+        colMap = BOX_SCORE_COLS[suffix]
+        pageCols.update(
+            colMap[header] for header in headers if header in colMap
+        )
+        for tableRow in tableRows[1:]:
+            cells = [
+                cell.get_text(strip=True)
+                for cell in tableRow.find_all(["th", "td"])
+            ]
+            # Skip total and spacer rows
+            if len(cells) != len(headers):
+                continue
+            line = {"Team": team, "G": 1}
+            for header, text in zip(headers, cells):
+                if header in ["選手", "投手"]:
+                    line["Name"] = text
+                elif header in colMap:
+                    line[colMap[header]] = text
+            if line.get("Name", "") in ["", "計", "合計"]:
+                continue
+            if suffix == "PP":
+                stat = BOX_SCORE_DECISIONS.get(cells[0])
+                if stat is not None:
+                    line[stat] = 1
+                line["IP"] = convert_box_score_ip(line.get("IP", "0"))
+            lines[suffix].append(line)
+
+    gameLines = {}
+    for suffix, lineList in lines.items():
+        lineDf = pd.DataFrame(
+            lineList, columns=["Name", "Team", "G"] + TEAM_COUNT_COLS[suffix]
+        )
+        countCols = TEAM_COUNT_COLS[suffix] + ["G"]
+        lineDf[countCols] = (
+            lineDf[countCols]
+            .apply(pd.to_numeric, errors="coerce")
+            .fillna(0)
+        )
+        lineDf = convert_count_columns_to_int(lineDf, suffix)
+        if suffix == "BP" and "PA" not in pageCols:
+            lineDf["PA"] = (
+                lineDf["AB"]
+                + lineDf["BB"]
+                + lineDf["HP"]
+                + lineDf["SH"]
+                + lineDf["SF"]
+            )
+        if suffix == "BP" and "TB" not in pageCols:
+            lineDf["TB"] = (
+                lineDf["H"]
+                + lineDf["2B"]
+                + (2 * lineDf["3B"])
+                + (3 * lineDf["HR"])
+            )
+        gameLines[suffix] = lineDf
+    return gameLines
+
+
+def convert_count_columns_to_int(df, suffix):
+    """Casts every counting stat column except IP (thirds as decimals) to
+    int"""
+    for col in TEAM_COUNT_COLS[suffix] + ["G"]:
+        if col != "IP":
+            df[col] = df[col].astype(int)
+    return df
+
+
+def get_box_score_team(table):
+    """Returns the English name of the team a box score table belongs to,
+    using the table's caption or the nearest heading before it and the
+    teams.csv short names ("" if no team name is found)"""
+    relDir = os.path.dirname(__file__)
+    shortNames = get_lookup_table(
+        relDir + "/input/teams.csv", build_team_dict, "Short", "Team"
+    )
+    headings = [table.caption] + [
+        table.find_previous(tag) for tag in ["h2", "h3", "h4", "h5"]
+    ]
+    for heading in headings:
+        if heading is None:
+            continue
+        text = heading.get_text()
+        for shortName, team in shortNames.items():
+            if shortName in text:
+                return team
+    return ""
+
+
+def convert_box_score_ip(ipText):
+    """Converts a box score IP entry ("5", "5.1", "5 1/3", "1/3") to innings
+    with thirds as decimals (5.333...) like convert_ip_column_in()"""
+    innings = 0.0
+    for part in ipText.replace("+", "").split():
+        if "/" in part:
+            numer, denom = part.split("/")
+            innings = innings + (float(numer) / float(denom))
+        elif "." in part:
+            whole, outs = part.split(".")
+            innings = innings + float(whole) + (float(outs) / 3)
+        else:
+            innings = innings + float(part)
+    return innings
+
+
+def get_season_partials(playerDf, suffix, year):
+    """Builds a season's additive per-player aggregates. Counting stats sum
+    directly across seasons; league relative stats need each season's
+    league context, park factor and FIP constant, which are stored weighted
+    by playing time (PA, AB, IP or BF) so they sum across seasons too
+
+    Parameters:
+    playerDf (pandas dataframe): Warehouse player stats for the season (see
+    get_warehouse_player_df()), optionally split by series (see
+    get_split_player_df()). League context always covers the whole season
+    suffix (string): Any STAT_SUFFIXES suffix
+    year (string): The stat year
+
+    Returns:
+    partialDf (pandas dataframe): Year, PlayerID, Name, Team, League, Series
+    (if split) and the PARTIAL_COLS of every player"""
+    statType = get_stat_type(suffix)
+    countCols = TEAM_COUNT_COLS[statType] + ["G"]
+    keyCols = ["Year", "PlayerID", "Name", "Team", "League"]
+    if "Series" in playerDf.columns:
+        keyCols.append("Series")
+    partialDf = playerDf[keyCols + countCols].copy()
+    partialDf = select_park_factor(partialDf, suffix, year)
+    partialDf["ParkF"] = partialDf["ParkF"].fillna(1.0)
+    if statType == "BP":
+        lgOBP = (
+            partialDf["H"].sum()
+            + partialDf["BB"].sum()
+            + partialDf["HP"].sum()
+        ) / (
+            partialDf["AB"].sum()
+            + partialDf["BB"].sum()
+            + partialDf["HP"].sum()
+            + partialDf["SF"].sum()
+        )
+        lgSLG = (
+            partialDf["H"].sum()
+            + partialDf["2B"].sum()
+            + (2 * partialDf["3B"].sum())
+            + (3 * partialDf["HR"].sum())
+        ) / partialDf["AB"].sum()
+        partialDf["PAxLgOBP"] = partialDf["PA"] * lgOBP
+        partialDf["ABxLgSLG"] = partialDf["AB"] * lgSLG
+        partialDf["PAxParkF"] = partialDf["PA"] * partialDf["ParkF"]
+        # wOBA weighted by its denominator sums across seasons, each season
+        # using its own linear weights like PlayerData. wRAA is derived from
+        # the summed wOBA at every grain
+        woba = calc_woba_parts(partialDf, get_league_weights(partialDf, year))
+        wobaDenom = (
+            partialDf["AB"]
+            + partialDf["BB"]
+            - partialDf["IBB"]
+            + partialDf["SF"]
+            + partialDf["HP"]
+        )
+        partialDf["wOBAxDenom"] = (woba["wOBA"] * wobaDenom).fillna(0)
+        partialDf["PAxLgwOBA"] = partialDf["PA"] * woba["lgwOBA"]
+        partialDf["PAxwOBAScale"] = partialDf["PA"] * woba["wOBAScale"]
+        partialDf["PAxLgRPA"] = partialDf["PA"] * woba["lgRPA"]
+    elif statType == "PP":
+        # IP column ".1 .2 .3" calculation fix
+        partialDf["IP"] = convert_ip_column_in(partialDf)
+        totals = partialDf[countCols].sum()
+        fipConst = select_fip_const(suffix, year)
+        lgERA = 9 * (totals["ER"] / totals["IP"])
+        lgFIP = (
+            (13 * totals["HR"])
+            + (3 * (totals["BB"] + totals["HB"]))
+            - (2 * totals["SO"])
+        ) / totals["IP"] + fipConst
+        lgkwERA = round(
+            (4.80 - (10 * ((totals["SO"] - totals["BB"]) / totals["BF"]))), 2
+        )
+        partialDf["IPxLgERAxPF"] = partialDf["IP"] * lgERA * partialDf["ParkF"]
+        partialDf["IPxFIPConst"] = partialDf["IP"] * fipConst
+        partialDf["IPxLgFIPxPF"] = partialDf["IP"] * lgFIP * partialDf["ParkF"]
+        partialDf["BFxLgkwERA"] = partialDf["BF"] * lgkwERA
+    partialDf = partialDf.drop(columns="ParkF")
+    return partialDf
+
+
+def calc_partial_rates(df, suffix, by="player"):
+    """Recomputes rate and league relative stats from summed partials (any
+    set of seasons, or any rollup cube grain). The
+    league context columns are divided by their summed playing time to get
+    the seasons' weighted league averages, park factors and FIP constants
+
+    Parameters:
+    df (pandas dataframe): Summed PARTIAL_COLS (see Warehouse.career_stats()
+    and RollupCube)
+    suffix (string): Any STAT_SUFFIXES suffix
+    by (string): "player" (OBP over PA, like PlayerData) or "team" (any
+    grain above player)
+
+    Returns:
+    df (pandas dataframe): The totals with rate stat columns added and the
+    weighted helper columns removed"""
+    statType = get_stat_type(suffix)
+    if statType == "BP":
+        obpDenom = df["PA"]
+        if by == "team":
+            obpDenom = df["AB"] + df["BB"] + df["HP"] + df["SF"]
+        obp = (df["H"] + df["BB"] + df["HP"]) / obpDenom
+        slg = (df["H"] + df["2B"] + (2 * df["3B"]) + (3 * df["HR"])) / df["AB"]
+        df["AVG"] = round(df["H"] / df["AB"], 3)
+        df["OBP"] = round(obp, 3)
+        df["SLG"] = round(slg, 3)
+        df["OPS"] = round(slg + obp, 3)
+        lgOBP = df["PAxLgOBP"] / df["PA"]
+        lgSLG = df["ABxLgSLG"] / df["AB"]
+        parkF = df["PAxParkF"] / df["PA"]
+        # Same rounding order as PlayerData's OPS+
+        df["OPS+"] = round(
+            round(100 * ((obp / lgOBP) + (slg / lgSLG) - 1), 0) / parkF, 0
+        )
+        wobaDenom = df["AB"] + df["BB"] - df["IBB"] + df["SF"] + df["HP"]
+        woba = df["wOBAxDenom"] / wobaDenom
+        lgwOBA = df["PAxLgwOBA"] / df["PA"]
+        wobaScale = df["PAxwOBAScale"] / df["PA"]
+        wraa = ((woba - lgwOBA) / wobaScale) * df["PA"]
+        lgRPA = df["PAxLgRPA"] / df["PA"]
+        df["wOBA"] = round(woba, 3)
+        df["wRAA"] = round(wraa, 1)
+        # Same formula as calc_woba_stats()
+        pa = df["PA"]
+        df["wRC+"] = round(
+            100 * ((wraa / pa) + lgRPA + (lgRPA - (parkF * lgRPA))) / lgRPA, 0
+        )
+        df["ISO"] = round(df["SLG"] - df["AVG"], 3)
+        df["BABIP"] = round(
+            (df["H"] - df["HR"]) / (df["AB"] - df["SO"] - df["HR"] + df["SF"]),
+            3,
+        )
+        df["K%"] = round(df["SO"] / df["PA"], 3)
+        df["BB%"] = round(df["BB"] / df["PA"], 3)
+        df["BB/K"] = round(df["BB"] / df["SO"], 2)
+    elif statType == "PP":
+        df["ERA"] = round(9 * df["ER"] / df["IP"], 2)
+        fipConst = df["IPxFIPConst"] / df["IP"]
+        df["FIP"] = round(
+            (
+                (13 * df["HR"])
+                + (3 * (df["BB"] + df["HB"]))
+                - (2 * df["SO"])
+            )
+            / df["IP"]
+            + fipConst,
+            2,
+        )
+        df["kwERA"] = round(
+            4.80 - (10 * ((df["SO"] - df["BB"]) / df["BF"])), 2
+        )
+        df["WHIP"] = round((df["BB"] + df["H"]) / df["IP"], 2)
+        df["ERA+"] = round(100 * df["IPxLgERAxPF"] / (9 * df["ER"]), 0)
+        # Scoreless pitchers get 999 ERA+ like PlayerData
+        df["ERA+"] = df["ERA+"].replace(float("inf"), 999)
+        df["FIP-"] = round(
+            100 * df["FIP"] / (df["IPxLgFIPxPF"] / df["IP"]), 0
+        )
+        df["kwERA-"] = round(
+            100 * df["kwERA"] / (df["BFxLgkwERA"] / df["BF"]), 0
+        )
+        df["HR%"] = round(df["HR"] / df["BF"], 3)
+        df["K%"] = round(df["SO"] / df["BF"], 3)
+        df["BB%"] = round(df["BB"] / df["BF"], 3)
+        df["K-BB%"] = round(df["K%"] - df["BB%"], 3)
+        # Changing .33 to .1 and .66 to .2 in the IP column
+        df["IP"] = convert_ip_column_out(df)
+    keepCols = TEAM_COUNT_COLS[statType] + ["G"]
+    weightCols = [col for col in PARTIAL_COLS[statType] if col not in keepCols]
+    df = df.drop(columns=weightCols)
+    return df
+
+
+def find_standings_files(statsDir):
+    """Finds every final standings file ([year]StandingsFinal[division]
+    .csv) in the script directory and the year directories
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+
+    Returns:
+    standingsFiles (dict): (year, division) keys mapped to the newest file
+    of each season's division"""
+    import glob
+    import re
+
+    relDir = os.path.dirname(os.path.abspath(__file__))
+    fileList = glob.glob(relDir + "/*StandingsFinal*.csv") + glob.glob(
+        statsDir + "/*/*StandingsFinal*.csv"
+    )
+    standingsFiles = {}
+    for fileName in fileList:
+        match = re.fullmatch(
+            r"(\d{4})StandingsFinal(\w+)\.csv", os.path.basename(fileName)
+        )
+        if match is None:
+            continue
+        key = (match.group(1), match.group(2))
+        if key not in standingsFiles or os.path.getmtime(
+            fileName
+        ) > os.path.getmtime(standingsFiles[key]):
+            standingsFiles[key] = fileName
+    return standingsFiles
+
+
+def read_standings_file(fileName, year, division):
+    """Reads a final standings file into a typed dataframe: HTML team names
+    become plain names, "--" games back becomes 0 and the "W-L(T)" record
+    columns (Home, Road, vs [team], Inter) are left as strings
+
+    Parameters:
+    fileName (string): The standings csv
+    year (string): The standings year
+    division (string): The file's division ("E" or "W")
+
+    Returns:
+    df (pandas dataframe): The season's standings"""
+    import pandas as pd
+
+    df = pd.read_csv(fileName, dtype=str, keep_default_na=False)
+    df = df.drop(columns="#", errors="ignore")
+    df["Team"] = df["Team"].str.replace(r"<[^>]*>", "", regex=True)
+    df["GB"] = df["GB"].replace("--", "0")
+    for col in ["G", "W", "L", "T", "RS", "RA", "Diff"]:
+        df[col] = pd.to_numeric(df[col]).astype(int)
+    for col in ["PCT", "GB", "XPCT"]:
+        df[col] = pd.to_numeric(df[col])
+    df.insert(0, "Division", division)
+    df.insert(0, "Year", int(year))
+    return df
+
+
+def parse_record_column(records):
+    """Parses "W-L(T)" record cells ("11-8(1)", "12-3") into numbers, "--"
+    (a team's own column) becomes NaN
+
+    Parameters:
+    records (pandas series): Record strings
+
+    Returns:
+    recordDf (pandas dataframe): W, L and T columns"""
+    recordDf = records.str.extract(r"^(\d+)-(\d+)(?:\((\d+)\))?$").astype(
+        float
+    )
+    recordDf.columns = ["W", "L", "T"]
+    # Ties only appear when there were any
+    recordDf.loc[recordDf["W"].notna(), "T"] = recordDf["T"].fillna(0)
+    return recordDf
+
+
+def get_head_to_head(df):
+    """Builds the head to head records of a season's standings as long
+    format rows. Opponent codes (the "DB" in "vs DB") are named after the
+    team whose own column ("--") they are
+
+    Parameters:
+    df (pandas dataframe): A season's standings (see read_standings_file())
+
+    Returns:
+    h2hDf (pandas dataframe): Year, Division, Team, Opponent, W, L and T of
+    every pairing"""
+    import pandas as pd
+
+    vsCols = [col for col in df.columns if col.startswith("vs ")]
+    longDf = df.melt(
+        id_vars=["Year", "Division", "Team"],
+        value_vars=vsCols,
+        var_name="Opponent",
+        value_name="Record",
+    )
+    ownRows = longDf[longDf["Record"] == "--"]
+    teamCodes = dict(zip(ownRows["Opponent"], ownRows["Team"]))
+    longDf["Opponent"] = (
+        longDf["Opponent"].map(teamCodes).fillna(longDf["Opponent"].str[3:])
+    )
+    h2hDf = pd.concat(
+        [longDf.drop(columns="Record"), parse_record_column(longDf["Record"])],
+        axis=1,
+    )
+    h2hDf = h2hDf.dropna(subset=["W"])
+    return h2hDf
+
+
+def get_head_to_head_matrix(h2hDf, stat="W"):
+    """Pivots head to head rows (see get_head_to_head()) of one season and
+    division into a team x opponent matrix of a stat ("W", "L" or "T")"""
+    matrixDf = h2hDf.pivot(index="Team", columns="Opponent", values=stat)
+    return matrixDf
+
+
+def calc_expected_records(df):
+    """Adds Pythagorean (PYTHAG_EXP) and Pythagenpat (run environment
+    exponent) expected records to standings of any number of teams and
+    seasons in one vectorized pass
+
+    Parameters:
+    df (pandas dataframe): Standings with G, W, L, RS and RA columns
+
+    Returns:
+    df (pandas dataframe): The standings with PythagPCT, PythagW, PythagL,
+    PythagenpatExp, PythagenpatPCT, PythagenpatW and PythagenpatL added"""
+    import numpy as np
+
+    runScored = df["RS"].to_numpy(dtype=float)
+    runAllowed = df["RA"].to_numpy(dtype=float)
+    decisions = (df["W"] + df["L"]).to_numpy(dtype=float)
+    runsPerGame = (runScored + runAllowed) / df["G"].to_numpy(dtype=float)
+    exponents = {
+        "Pythag": np.full(len(df), PYTHAG_EXP),
+        "Pythagenpat": runsPerGame**PYTHAGENPAT_EXP,
+    }
+    for name, exponent in exponents.items():
+        if name == "Pythagenpat":
+            df[name + "Exp"] = np.round(exponent, 3)
+        expPct = runScored**exponent / (
+            runScored**exponent + runAllowed**exponent
+        )
+        df[name + "PCT"] = np.round(expPct, 3)
+        df[name + "W"] = np.round(expPct * decisions, 1)
+        df[name + "L"] = np.round(decisions - df[name + "W"], 1)
+    return df
+
+
+def load_standings(statsDir, standingsFiles):
+    """Returns the typed standings and head to head records of every
+    standings file. Each season and division is cached in its year
+    directory ([year]StandingsCalc[division].csv and
+    [year]HeadToHead[division].csv) and only rebuilt when its source file is
+    newer, stale seasons get their expected records in one combined pass
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    standingsFiles (dict): (year, division) mapped to standings files (see
+    find_standings_files())
+
+    Returns:
+    standingsDf (pandas dataframe): Every season's standings
+    h2hDf (pandas dataframe): Every season's head to head rows"""
+    import pandas as pd
+
+    cachedDfs = []
+    cachedH2hDfs = []
+    staleDfs = []
+    for (year, division), fileName in sorted(standingsFiles.items()):
+        yearDir = os.path.join(statsDir, year)
+        calcFile = yearDir + "/" + year + "StandingsCalc" + division + ".csv"
+        h2hFile = yearDir + "/" + year + "HeadToHead" + division + ".csv"
+        if (
+            os.path.exists(calcFile)
+            and os.path.exists(h2hFile)
+            and os.path.getmtime(calcFile) >= os.path.getmtime(fileName)
+        ):
+            cachedDfs.append(pd.read_csv(calcFile, keep_default_na=False))
+            cachedH2hDfs.append(pd.read_csv(h2hFile))
+        else:
+            staleDfs.append(read_standings_file(fileName, year, division))
+
+    if len(staleDfs) > 0:
+        # Record columns differ between divisions, concat keeps them all
+        staleDf = calc_expected_records(
+            pd.concat(staleDfs, ignore_index=True)
+        )
+        for (year, division), seasonDf in staleDf.groupby(
+            ["Year", "Division"]
+        ):
+            year = str(year)
+            yearDir = os.path.join(statsDir, year)
+            if not (os.path.exists(yearDir)):
+                os.mkdir(yearDir)
+            seasonDf = seasonDf.dropna(axis=1, how="all")
+            h2hDf = get_head_to_head(seasonDf)
+            seasonDf.to_csv(
+                yearDir + "/" + year + "StandingsCalc" + division + ".csv",
+                index=False,
+            )
+            h2hDf.to_csv(
+                yearDir + "/" + year + "HeadToHead" + division + ".csv",
+                index=False,
+            )
+            cachedDfs.append(seasonDf)
+            cachedH2hDfs.append(h2hDf)
+
+    if len(cachedDfs) == 0:
+        return pd.DataFrame(), pd.DataFrame()
+    standingsDf = pd.concat(cachedDfs, ignore_index=True)
+    h2hDf = pd.concat(cachedH2hDfs, ignore_index=True)
+    return standingsDf, h2hDf
+
+
+def calc_log5(winPctA, winPctB):
+    """Returns the chance team A beats team B in one game from the teams'
+    winning percentages (log5), works on scalars and numpy arrays"""
+    numer = winPctA * (1 - winPctB)
+    winProb = numer / (numer + (winPctB * (1 - winPctA)))
+    return winProb
+
+
+def simulate_series(rng, highWinProb, series, size):
+    """Simulates many post season series at once. Playing out every possible
+    game doesn't change who reaches their needed wins first, so each series
+    is a single binomial draw
+
+    Parameters:
+    rng (numpy Generator): The random number generator
+    highWinProb (float or numpy array): The higher seed's single game win
+    chance (one per series, or shared)
+    series (string): A BRACKET_SERIES series code
+    size (int): Series to simulate
+
+    Returns:
+    highWins (numpy array - bool): True where the higher seed advanced"""
+    highNeeds, lowNeeds = BRACKET_SERIES[series]
+    games = highNeeds + lowNeeds - 1
+    highWins = rng.binomial(games, highWinProb, size=size) >= highNeeds
+    return highWins
+
+
+def simulate_bracket(winPcts, sims, seedSeq):
+    """Simulates the Climax Series and Japan Series bracket in batches of
+    vectorized series draws (see simulate_series())
+
+    Parameters:
+    winPcts (numpy array): Team winning percentages shaped (2 leagues, 3
+    seeds)
+    sims (int): Brackets to simulate
+    seedSeq (numpy SeedSequence): Seeds the simulation's generator
+
+    Returns:
+    counts (numpy array): Times each (league, seed) reached the Final Stage,
+    the Japan Series and won it, shaped (2, 3, 3)"""
+    import numpy as np
+
+    rng = np.random.default_rng(seedSeq)
+    counts = np.zeros((2, 3, 3), dtype=np.int64)
+    simsLeft = sims
+    while simsLeft > 0:
+        size = min(simsLeft, SIM_BATCH_SIZE)
+        simsLeft = simsLeft - size
+        champs = []
+        for league in range(2):
+            leaguePcts = winPcts[league]
+            # First Stage: 2nd seed hosts 3rd seed
+            secondWins = simulate_series(
+                rng, calc_log5(leaguePcts[1], leaguePcts[2]), "s1", size
+            )
+            challenger = np.where(secondWins, 1, 2)
+            counts[league, :, 0] += np.bincount(challenger, minlength=3)
+            counts[league, 0, 0] += size
+            # Final Stage: 1st seed hosts the First Stage winner
+            firstWins = simulate_series(
+                rng,
+                calc_log5(leaguePcts[0], leaguePcts[challenger]),
+                "s2",
+                size,
+            )
+            champ = np.where(firstWins, 0, challenger)
+            counts[league, :, 1] += np.bincount(champ, minlength=3)
+            champs.append(champ)
+        # Japan Series between the two league champions
+        firstLeagueWins = simulate_series(
+            rng,
+            calc_log5(winPcts[0][champs[0]], winPcts[1][champs[1]]),
+            "ns",
+            size,
+        )
+        counts[0, :, 2] += np.bincount(champs[0][firstLeagueWins], minlength=3)
+        counts[1, :, 2] += np.bincount(
+            champs[1][~firstLeagueWins], minlength=3
+        )
+    return counts
+
+
+def run_bracket_sims(winPcts, sims, workers=1, seed=None):
+    """Splits bracket simulations across processes. Every worker gets its own
+    child of one SeedSequence, so a seed and worker count always give the
+    same results
+
+    Parameters:
+    winPcts (numpy array): Team winning percentages shaped (2 leagues, 3
+    seeds)
+    sims (int): Brackets to simulate
+    workers (int): Processes to simulate in
+    seed (int): Seed for reproducible results (default None is random)
+
+    Returns:
+    counts (numpy array): Summed simulate_bracket() counts"""
+    import numpy as np
+    from concurrent.futures import ProcessPoolExecutor
+
+    seedSeqs = np.random.SeedSequence(seed).spawn(workers)
+    workerSims = [sims // workers] * workers
+    workerSims[0] = workerSims[0] + (sims % workers)
+    if workers == 1:
+        return simulate_bracket(winPcts, sims, seedSeqs[0])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            simulate_bracket, [winPcts] * workers, workerSims, seedSeqs
+        )
+        counts = sum(results)
+    return counts
+
+
+def get_pa_outcomes(df, suffix):
+    """Reconstructs each player's plate appearance outcomes (see
+    BOOTSTRAP_OUTCOMES) from their counting stats
+
+    Parameters:
+    df (pandas dataframe): Numeric organized player stats
+    suffix (string): Any STAT_SUFFIXES suffix
+
+    Returns:
+    outcomes (numpy array - int): Outcome counts shaped (players, outcomes)"""
+    import numpy as np
+
+    statType = get_stat_type(suffix)
+    if statType == "BP":
+        columns = [
+            df["H"] - df["2B"] - df["3B"] - df["HR"],
+            df["2B"],
+            df["3B"],
+            df["HR"],
+            df["BB"],
+            df["HP"],
+            df["SO"],
+            df["SF"],
+            df["SH"],
+            df["AB"] - df["H"] - df["SO"],
+        ]
+    else:
+        columns = [
+            df["HR"],
+            df["H"] - df["HR"],
+            df["BB"],
+            df["HB"],
+            df["SO"],
+            df["BF"] - df["H"] - df["BB"] - df["HB"] - df["SO"],
+        ]
+    outcomes = np.clip(np.column_stack(columns).astype(np.int64), 0, None)
+    return outcomes
+
+
+def calc_bootstrap_stats(samples, suffix, context):
+    """Recomputes the unstable small sample stats (OPS+, or FIP and K-BB%)
+    from resampled outcomes
+
+    Parameters:
+    samples (numpy array): Outcome counts shaped (samples, players, outcomes)
+    suffix (string): Any STAT_SUFFIXES suffix
+    context (dict): League and player constants (see bootstrap_intervals())
+
+    Returns:
+    stats (dict): Stat names mapped to arrays shaped (samples, players)"""
+    import numpy as np
+
+    statType = get_stat_type(suffix)
+    col = {
+        name: samples[:, :, index]
+        for index, name in enumerate(BOOTSTRAP_OUTCOMES[statType])
+    }
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if statType == "BP":
+            hits = col["1B"] + col["2B"] + col["3B"] + col["HR"]
+            atBats = hits + col["SO"] + col["Out"]
+            obp = (hits + col["BB"] + col["HP"]) / samples.sum(axis=2)
+            slg = (
+                col["1B"] + (2 * col["2B"]) + (3 * col["3B"]) + (4 * col["HR"])
+            ) / atBats
+            opsPlus = (
+                np.round(
+                    100
+                    * (
+                        (obp / context["lgOBP"])
+                        + (slg / context["lgSLG"])
+                        - 1
+                    )
+                )
+                / context["ParkF"]
+            )
+            stats = {"OPS+": opsPlus}
+        else:
+            fip = (
+                (13 * col["HR"])
+                + (3 * (col["BB"] + col["HB"]))
+                - (2 * col["SO"])
+            ) / context["IP"] + context["fipConst"]
+            kbb = (col["SO"] - col["BB"]) / samples.sum(axis=2)
+            stats = {"FIP": fip, "K-BB%": kbb}
+    return stats
+
+
+def bootstrap_players(outcomes, suffix, context, seedSeq, deadline):
+    """Draws multinomial resamples of every player's outcomes at once, in
+    chunks of BOOTSTRAP_CHUNK until BOOTSTRAP_SAMPLES are done or the
+    deadline passes (at least one chunk is always drawn)
+
+    Parameters:
+    outcomes (numpy array): Outcome counts shaped (players, outcomes)
+    suffix (string): Any STAT_SUFFIXES suffix
+    context (dict): League and player constants for the players
+    seedSeq (numpy SeedSequence): Seeds the resampling generator
+    deadline (float): time.time() the resampling has to stop by
+
+    Returns:
+    bounds (dict): Stat names mapped to (low, high) arrays per player
+    sampleCount (int): Resamples drawn"""
+    import warnings
+    from time import time
+
+    import numpy as np
+
+    rng = np.random.default_rng(seedSeq)
+    trials = outcomes.sum(axis=1)
+    # Players without a PA/BF draw nothing, any probabilities do
+    probs = np.where(
+        trials[:, None] > 0,
+        outcomes / np.maximum(trials, 1)[:, None],
+        1 / outcomes.shape[1],
+    )
+    chunks = []
+    sampleCount = 0
+    while sampleCount < BOOTSTRAP_SAMPLES:
+        size = min(BOOTSTRAP_CHUNK, BOOTSTRAP_SAMPLES - sampleCount)
+        samples = rng.multinomial(trials, probs, size=(size, len(trials)))
+        chunks.append(calc_bootstrap_stats(samples, suffix, context))
+        sampleCount = sampleCount + size
+        if time() > deadline:
+            break
+    tail = (1 - BOOTSTRAP_LEVEL) / 2 * 100
+    bounds = {}
+    for stat in chunks[0]:
+        statSamples = np.concatenate([chunk[stat] for chunk in chunks])
+        # Players without a PA/BF have no intervals (all NaN samples)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            bounds[stat] = np.nanpercentile(
+                statSamples, [tail, 100 - tail], axis=0
+            )
+    return bounds, sampleCount
+
+
+def bootstrap_intervals(orgDf, suffix, year, workers=1, seed=None):
+    """Adds bootstrap intervals to the small sample OPS+ (batting) or FIP
+    and K-BB% (pitching) of every player. League averages, park factors,
+    the FIP constant and IP stay fixed, only the outcomes are resampled.
+    Players are split across worker processes, which share
+    BOOTSTRAP_BUDGET_S
+
+    Parameters:
+    orgDf (pandas dataframe): Organized (untranslated) player stats
+    suffix (string): Any STAT_SUFFIXES suffix
+    year (string): The stat year
+    workers (int): Processes to resample in
+    seed (int): Seed for reproducible intervals (default None is random)
+
+    Returns:
+    intervalDf (pandas dataframe): "[stat] Low" and "[stat] High" columns
+    formatted like the AltView, indexed like orgDf"""
+    from concurrent.futures import ProcessPoolExecutor
+    from time import time
+
+    import numpy as np
+    import pandas as pd
+
+    statType = get_stat_type(suffix)
+    deadline = time() + BOOTSTRAP_BUDGET_S
+    df = convert_stats_to_numeric(orgDf.copy())
+    outcomes = get_pa_outcomes(df, suffix)
+    if statType == "BP":
+        totals = df[TEAM_COUNT_COLS["BP"]].sum()
+        df = select_park_factor(df, suffix, year)
+        context = {
+            "lgOBP": (totals["H"] + totals["BB"] + totals["HP"])
+            / (totals["AB"] + totals["BB"] + totals["HP"] + totals["SF"]),
+            "lgSLG": (
+                totals["H"]
+                + totals["2B"]
+                + (2 * totals["3B"])
+                + (3 * totals["HR"])
+            )
+            / totals["AB"],
+            "ParkF": df["ParkF"].fillna(1.0).to_numpy(),
+        }
+        formats = {"OPS+": "{:.0f}"}
+    else:
+        context = {
+            "IP": convert_ip_column_in(df).to_numpy(),
+            "fipConst": select_fip_const(suffix, year),
+        }
+        formats = {"FIP": "{:.2f}", "K-BB%": "{:.1%}"}
+
+    workers = max(1, min(workers, len(df)))
+    playerGroups = np.array_split(np.arange(len(df)), workers)
+    seedSeqs = np.random.SeedSequence(seed).spawn(workers)
+    jobs = []
+    for rows in playerGroups:
+        # Per player constants follow their players to the worker
+        jobContext = {
+            key: value[rows] if isinstance(value, np.ndarray) else value
+            for key, value in context.items()
+        }
+        jobs.append((outcomes[rows], suffix, jobContext))
+    if workers == 1:
+        results = [bootstrap_players(*jobs[0], seedSeqs[0], deadline)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    bootstrap_players,
+                    *zip(*jobs),
+                    seedSeqs,
+                    [deadline] * workers,
+                )
+            )
+
+    intervalDf = pd.DataFrame(index=orgDf.index)
+    for stat, statFormat in formats.items():
+        bounds = np.concatenate(
+            [result[0][stat] for result in results], axis=1
+        )
+        for name, values in zip(["Low", "High"], bounds):
+            intervalDf[stat + " " + name] = [
+                "" if np.isnan(value) else statFormat.format(value)
+                for value in values
+            ]
+    return intervalDf
+
+
+def get_team_run_environment(cache, year):
+    """Reads each team's regular season runs scored and allowed from a
+    year's BR and PR TeamData
+
+    Parameters:
+    cache (StatCache): Holds the year's organized stats
+    year (string): The stat year
+
+    Returns:
+    envDf (pandas dataframe): Team, G, W, L, RS and RA rows (G counts
+    decisions), None if the year has no BR or PR raw file"""
+    yearDir = os.path.join(cache.statsDir, year)
+    for suffix in ["BR", "PR"]:
+        rawFile = os.path.join(yearDir, year + "StatsRaw" + suffix + ".csv")
+        if not (os.path.exists(rawFile)):
+            return None
+    batDf = convert_stats_to_numeric(cache.load(year, "BR")["team"].df.copy())
+    pitchDf = convert_stats_to_numeric(
+        cache.load(year, "PR")["team"].df.copy()
+    )
+    envDf = pitchDf[["Team", "W", "L", "R"]].rename(columns={"R": "RA"})
+    envDf = envDf.merge(
+        batDf[["Team", "R"]].rename(columns={"R": "RS"}), on="Team"
+    )
+    envDf = envDf[envDf["Team"] != "League Average"].reset_index(drop=True)
+    envDf.insert(1, "G", envDf["W"] + envDf["L"])
+    return envDf
+
+
+def get_bracket_teams(standingsDf, envDf=None):
+    """Picks the top 3 teams (by PCT, then wins) of the CL and PL in a
+    season's standings and their run environment (Pythagenpat) winning
+    percentages. Only divisions holding one NPB league's teams (teams.csv
+    League) seed the bracket, farm standings are left out
+
+    Parameters:
+    standingsDf (pandas dataframe): One season's standings with expected
+    records (see load_standings())
+    envDf (pandas dataframe): Team runs scored and allowed the winning
+    percentages come from (see get_team_run_environment(), default None
+    uses the standings' runs)
+
+    Returns:
+    bracketDf (pandas dataframe): League, Seed, Team and WinPct rows in
+    (league, seed) order"""
+    import pandas as pd
+
+    leagues = map_team_column(standingsDf["Team"], "League")
+    levels = map_team_column(standingsDf["Team"], "Level")
+    divisions = standingsDf["Division"]
+    leagueDivisions = (levels == "NPB").groupby(divisions).all() & (
+        leagues.groupby(divisions).nunique(dropna=False) == 1
+    )
+    standingsDf = standingsDf.assign(League=leagues)
+    standingsDf = standingsDf[divisions.map(leagueDivisions)]
+    if sorted(standingsDf["League"].unique()) != ["CL", "PL"]:
+        raise ValueError(
+            "The bracket needs the CL and PL standings, farm standings "
+            "can't seed it"
+        )
+    bracketDfs = []
+    for league, leagueDf in standingsDf.groupby("League"):
+        leagueDf = leagueDf.sort_values(["PCT", "W"], ascending=False).head(3)
+        bracketDfs.append(
+            pd.DataFrame(
+                {
+                    "League": league,
+                    "Seed": [1, 2, 3],
+                    "Team": leagueDf["Team"].to_numpy(),
+                    "WinPct": leagueDf["PythagenpatPCT"].to_numpy(),
+                }
+            )
+        )
+    bracketDf = pd.concat(bracketDfs, ignore_index=True)
+    if envDf is not None:
+        envDf = calc_expected_records(envDf.copy()).set_index("Team")
+        bracketDf["WinPct"] = bracketDf["Team"].map(envDf["PythagenpatPCT"])
+        missing = bracketDf["WinPct"].isna()
+        if missing.any():
+            raise ValueError(
+                "No run environment for "
+                + ", ".join(bracketDf["Team"][missing])
+            )
+    return bracketDf
+
+
+def get_team_games(batDf, groupCols=("Team",)):
+    """Counts the games each team played: the most games any of its batters
+    appeared in
+
+    Parameters:
+    batDf (pandas dataframe): Numeric organized batting stats
+    groupCols (tuple - string): The columns a team's games are counted over
+
+    Returns:
+    teamGames (pandas series): Games played indexed by groupCols"""
+    teamGames = batDf.groupby(list(groupCols))["G"].max()
+    return teamGames
+
+
+def get_qualified(df, suffix, teamGames):
+    """Flags the players qualified for rate stat leaderboards and rankings
+    (LEADER_PA_PER_GAME or LEADER_IP_PER_GAME per team game)
+
+    Parameters:
+    df (pandas dataframe): Numeric organized player stats
+    suffix (string): "BP" or "PP"
+    teamGames (pandas series): Team games (see get_team_games())
+
+    Returns:
+    qualified (numpy array - bool): One flag per row of df"""
+    keyDf = df[list(teamGames.index.names)]
+    games = keyDf.merge(teamGames.reset_index(), how="left")["G"]
+    games = games.fillna(0).to_numpy(dtype=float)
+    if suffix == "BP":
+        qualified = df["PA"].to_numpy(dtype=float) >= (
+            LEADER_PA_PER_GAME * games
+        )
+    else:
+        qualified = convert_ip_column_in(df).to_numpy(dtype=float) >= (
+            LEADER_IP_PER_GAME * games
+        )
+    return qualified
+
+
+def get_leaders(df, suffix, teamGames, top=10):
+    """Selects the leaders of every LEADER_STATS stat in one pass. The
+    qualification mask is built once and each stat's top values are found
+    with a partial selection (argpartition) instead of a full sort
+
+    Parameters:
+    df (pandas dataframe): Numeric organized player stats
+    suffix (string): "BP" or "PP"
+    teamGames (pandas series): Team games (see get_team_games())
+    top (int): Leaders per stat (ties at the cutoff are kept)
+
+    Returns:
+    leaders (dict): Stat names mapped to the positional indexes of the
+    stat's leaders in df, best first"""
+    import numpy as np
+
+    qualified = get_qualified(df, suffix, teamGames)
+    leaders = {}
+    for stat, ascending in LEADER_STATS[suffix].items():
+        values = df[stat].to_numpy(dtype=float)
+        mask = ~np.isnan(values)
+        if stat not in TEAM_COUNT_COLS[suffix]:
+            mask = mask & qualified
+        candidates = np.flatnonzero(mask)
+        # Smallest keys lead
+        keys = values[candidates]
+        if not ascending:
+            keys = -keys
+        if len(candidates) > top > 0:
+            cutoff = keys[np.argpartition(keys, top - 1)[top - 1]]
+            inTop = keys <= cutoff
+            candidates = candidates[inTop]
+            keys = keys[inTop]
+        order = np.argsort(keys, kind="stable")
+        leaders[stat] = candidates[order]
+    return leaders
+
+
+def output_leaders(orgDf, suffix, year, yearDir, teamGames, top=10):
+    """Writes a csv (player/team names as HTML like the final files) and an
+    HTML table for every LEADER_STATS stat of a year
+
+    Parameters:
+    orgDf (pandas dataframe): Organized (untranslated) player stats
+    suffix (string): "BP" or "PP"
+    year (string): The stat year
+    yearDir (string): The directory that stores the year's stats
+    teamGames (pandas series): Team games (see get_team_games())
+    top (int): Leaders per stat (ties at the cutoff are kept)
+
+    Returns:
+    leaderFiles (list - string): The written leaderboard csv files"""
+    nameCol = "Player"
+    if suffix == "PP":
+        nameCol = "Pitcher"
+    displayDf = translate_players(orgDf.copy(), nameCol)
+    displayDf = displayDf.drop(columns="keys", errors="ignore")
+    numericDf = convert_stats_to_numeric(displayDf.copy())
+    leaderFiles = write_leaders(
+        displayDf, numericDf, suffix, year, yearDir, teamGames, top
+    )
+    return leaderFiles
+
+
+def output_series_leaders(seriesDf, suffix, year, yearDir, teamGames, top=10):
+    """Writes the leaderboards of every post season series of a year (files
+    named [year][series]Leaders[suffix][stat]), qualifying players by their
+    team's games in that series
+
+    Parameters:
+    seriesDf (pandas dataframe): The year's seriesPlayer cube rates (see
+    RollupCube.rates())
+    suffix (string): "BP" or "PP"
+    year (string): The stat year
+    yearDir (string): The directory that stores the year's stats
+    teamGames (pandas series): Team games indexed by series and team (see
+    get_team_games())
+    top (int): Leaders per stat (ties at the cutoff are kept)
+
+    Returns:
+    leaderFiles (list - string): The written leaderboard csv files"""
+    nameCol = "Player"
+    if suffix == "PP":
+        nameCol = "Pitcher"
+    leaderFiles = []
+    for series, numericDf in seriesDf.groupby("Series"):
+        numericDf = numericDf.rename(columns={"Name": nameCol})
+        numericDf = numericDf.reset_index(drop=True)
+        displayDf = numericDf.copy()
+        for col in TEAM_COUNT_COLS[suffix]:
+            if col != "IP":
+                displayDf[col] = displayDf[col].apply("{:.0f}".format)
+        for col, value in LEADER_FORMATS[suffix].items():
+            displayDf[col] = displayDf[col].apply(value.format)
+        leaderFiles = leaderFiles + write_leaders(
+            displayDf,
+            numericDf,
+            suffix,
+            year,
+            yearDir,
+            teamGames,
+            top,
+            series,
+        )
+    return leaderFiles
+
+
+def write_leaders(
+    displayDf, numericDf, suffix, year, yearDir, teamGames, top=10, series=""
+):
+    """Selects the leaders of every LEADER_STATS stat and writes them as a
+    csv (player/team names as HTML like the final files) and an HTML table
+
+    Parameters:
+    displayDf (pandas dataframe): Translated player stats as displayed
+    numericDf (pandas dataframe): The same stats as numbers
+    suffix (string): "BP" or "PP"
+    year (string): The stat year
+    yearDir (string): The directory that stores the year's stats
+    teamGames (pandas series): Team games (see get_team_games())
+    top (int): Leaders per stat (ties at the cutoff are kept)
+    series (string): The series code of series leaderboards (default ""
+    for the whole post season)
+
+    Returns:
+    leaderFiles (list - string): The written leaderboard csv files"""
+    leaderDir = os.path.join(yearDir, "leaders")
+    if not (os.path.exists(leaderDir)):
+        os.mkdir(leaderDir)
+    nameCol = "Player"
+    qualCol = "PA"
+    if suffix == "PP":
+        nameCol = "Pitcher"
+        qualCol = "IP"
+    leaders = get_leaders(numericDf, suffix, teamGames, top)
+
+    leaderFiles = []
+    for stat, rows in leaders.items():
+        cols = [nameCol, "Team", qualCol]
+        if stat != qualCol:
+            cols.append(stat)
+        leaderDf = displayDf.iloc[rows][cols].reset_index(drop=True)
+        ranks = numericDf[stat].iloc[rows].rank(
+            method="min", ascending=LEADER_STATS[suffix][stat]
+        )
+        leaderDf.insert(0, "Rank", ranks.astype(int).to_numpy())
+        # Link conversion maps every column, strings keep ints from turning
+        # into floats
+        leaderDf = leaderDf.astype(str)
+        htmlDf = convert_player_to_html(leaderDf, suffix, year)
+        htmlDf = convert_team_to_html(htmlDf, "Abb")
+        fileName = (
+            leaderDir
+            + "/"
+            + year
+            + series
+            + "Leaders"
+            + suffix
+            + get_stat_file_name(stat)
+        )
+        htmlDf.to_csv(fileName + ".csv", index=False)
+        htmlDf.to_html(fileName + ".html", index=False, escape=False)
+        leaderFiles.append(fileName + ".csv")
+    return leaderFiles
+
+
+def get_stat_file_name(stat):
+    """Makes a stat name safe for file names ("OPS+" -> "OPSPlus",
+    "K-BB%" -> "KMinusBBPct", "BB/K" -> "BBPerK")"""
+    replacements = [("+", "Plus"), ("-", "Minus"), ("%", "Pct"), ("/", "Per")]
+    for old, new in replacements:
+        stat = stat.replace(old, new)
+    return stat
+
+
+def get_warehouse_player_df(orgDf, suffix, year):
+    """Prepares an organized player df for the warehouse: translates names,
+    adds npb.jp player IDs and the year, and makes every stat numeric
+
+    Parameters:
+    orgDf (pandas dataframe): Organized (untranslated) player stats
+    suffix (string): "BP" or "PP"
+    year (string): The stat year
+
+    Returns:
+    df (pandas dataframe): The warehouse ready player stats"""
+    statType = get_stat_type(suffix)
+    nameCol = "Player"
+    if statType == "PP":
+        nameCol = "Pitcher"
+    df = translate_players(orgDf.copy(), nameCol)
+    df = df.drop(columns="keys", errors="ignore")
+    df = df.rename(columns={nameCol: "Name"})
+    df = convert_stats_to_numeric(df)
+    relDir = os.path.dirname(__file__)
+    playerLinkFile = relDir + "/input/playerUrls.csv"
+    playerIds = {}
+    if os.path.exists(playerLinkFile):
+        playerIds = get_lookup_table(playerLinkFile, build_player_id_dict)
+    df.insert(0, "PlayerID", df["Name"].map(playerIds))
+    df.insert(0, "Year", int(year))
+    return df
+
+
+def convert_stats_to_numeric(df):
+    """Converts formatted stat columns (".300", "45.0%", "") back to numbers.
+    Name, team and league columns are left as they are
+
+    Parameters:
+    df (pandas dataframe): An organized player or team stat dataframe
+
+    Returns:
+    df (pandas dataframe): The dataframe with numeric stat columns"""
+    import pandas as pd
+
+    for col in df.columns:
+        if col in [
+            "Player",
+            "Pitcher",
+            "Name",
+            "Team",
+            "League",
+            "PlayerID",
+            "Series",
+        ]:
+            continue
+        if df[col].dtype != object:
+            continue
+        values = df[col].astype(str).str.strip()
+        isPercent = values.str.endswith("%")
+        numbers = pd.to_numeric(values.str.rstrip("%"), errors="coerce")
+        df[col] = numbers.where(~isPercent, numbers / 100)
+    return df
+
+
+def get_playoff_stats(yearDir, suffix, year):
+    """The main stat scraping function that produces Raw stat files.
+    Saving Raw stat files allows for scraping and stat organization to be
+    independent of each other. No scraping should be needed to make changes to
+    final files
+
+    Parameters:
+    yearDir (string): The directory that stores the raw, scraped NPB stats
+    suffix (string): Determines header row of csv file and indicates the stats
+    that the URLs point to:
+    "BP" = post season batting stat URLs passed in
+    "PP" = post season pitching stat URLs passed in
+    "BR" = reg season batting stat URLs passed in
+    "PR" = reg season pitching stat URLs passed in
+    "BF" = farm batting stat URLs passed in
+    "PF" = farm pitching stat URLs passed in
+    year (string): The desired npb year to scrape
+
+    Returns: N/A"""
+    # Make output file
+    outputFile = make_raw_player_file(yearDir, suffix, year)
+    # Grab URLs to scrape
+    urlArr = get_stat_urls(suffix, year)
+    # Create header row
+    outputFile.write(get_raw_header(suffix))
+
+    # Every fetched page is kept so raw files can be re-parsed offline
+    archive = PageArchive(os.path.dirname(yearDir))
+    # Loop through all team stat pages in urlArr
+    for url in urlArr:
+        # Make GET request
+        r = get_url(url)
+        archive.store(url, r.content)
+        # Write the page's player rows in csv file format
+        outputFile.writelines(
+            parse_stat_page(r.content, year, get_url_series(url))
+        )
+        # Close request
+        r.close()
+        # Pace requests to npb.jp to avoid excessive requests
+        sleep(randint(3, 5))
+    # After all URLs are scraped, close output file
+    outputFile.close()
+
+
+def get_stat_type(suffix):
+    """Returns the schema a suffix's stat files use (see STAT_SUFFIXES)
+
+    Parameters:
+    suffix (string): Any STAT_SUFFIXES suffix
+
+    Returns:
+    statType (string): "BP" (batting) or "PP" (pitching)"""
+    statType = STAT_SUFFIXES[suffix]["stats"]
+    return statType
+
+
+def get_raw_header(suffix):
+    """Returns the header row of a raw stat csv
+
+    Parameters:
+    suffix (string): Any STAT_SUFFIXES suffix
+
+    Returns:
+    header (string): The csv header line"""
+    statType = get_stat_type(suffix)
+    if statType == "BP":
+        header = (
+            "Player,G,PA,AB,R,H,2B,3B,HR,TB,RBI,SB,CS,SH,SF,BB,"
+            "IBB,HP,SO,GDP,AVG,SLG,OBP,Team,Series\n"
+        )
+    elif statType == "PP":
+        header = (
+            "Pitcher,G,W,L,SV,HLD,CG,SHO,PCT,BF,IP,,H,HR,BB,IBB,"
+            "HB,SO,WP,BK,R,ER,ERA,Team,Series\n"
+        )
+    return header
+
+
+def parse_stat_page(content, year, series=""):
+    """Parses one npb.jp team stat page into raw stat csv rows
+
+    Parameters:
+    content (bytes): The page's HTML
+    year (string): The stat year the page belongs to
+    series (string): The page's series code (see get_url_series())
+
+    Returns:
+    rows (list - string): One csv line (ending in the team name and series)
+    per player"""
+    from bs4 import BeautifulSoup
+
+    # Create the soup for parsing the html content
+    soup = BeautifulSoup(content, "html.parser")
+    # Get team
+    titleDiv = soup.find(id="stdivtitle")
+    yearTitleStr = titleDiv.h1.get_text()
+    # Titles read "[year]年度 [JP team name]", unknown names are left in
+    # Japanese (and quarantined by read_raw_stats())
+    yearTitleStr = yearTitleStr.replace(year, "").replace("年度", "").strip()
+    relDir = os.path.dirname(__file__)
+    jpTeams = get_lookup_table(
+        relDir + "/input/teams.csv", build_team_dict, "JP", "Team"
+    )
+    yearTitleStr = jpTeams.get(yearTitleStr, yearTitleStr)
+
+    # Since header row was created, skip to stat rows
+    iterSoup = iter(soup.table)
+    # Left handed pitcher/batter and switch hitter row skip
+    next(iterSoup)
+    # npb.jp header row skip
+    next(iterSoup)
+
+    # Extract table rows from npb.jp team stats
+    rows = []
+    for tableRow in iterSoup:
+        # Skip first column for left handed batter/pitcher or switch hitter
+        iterTable = iter(tableRow)
+        next(iterTable)
+        row = ""
+        for entry in iterTable:
+            # Remove commas in first and last names
+            entryText = entry.get_text()
+            if entryText.find(","):
+                entryText = entryText.replace(",", "")
+            # Write output in csv file format
+            row = row + entryText + ","
+        # Append team and series as last entries and move to next row
+        rows.append(row + yearTitleStr + "," + series + "\n")
+    return rows
+
+
+def get_team_codes():
+    """Maps the npb.jp team codes used in stat page URLs (the "t" in
+    "idb1s1_t.html") to team names using teams.csv
+
+    Parameters: N/A
+
+    Returns:
+    teamCodes (dict): Team codes mapped to full team names"""
+    relDir = os.path.dirname(__file__)
+    teamCodes = get_lookup_table(
+        relDir + "/input/teams.csv", build_team_dict, "Code", "Team"
+    )
+    return teamCodes
+
+
+def get_url_team_code(url):
+    """Returns the team code at the end of an npb.jp URL
+    ("https://npb.jp/bis/2024/stats/idb1s1_db.html" -> "db")"""
+    teamCode = os.path.splitext(url.rsplit("_", 1)[-1])[0]
+    return teamCode
+
+
+def get_url_series(url):
+    """Returns the series code of an npb.jp post season stat page URL
+    ("https://npb.jp/bis/2024/stats/idb1s1_db.html" -> "s1"), "" if the URL
+    has none (see SERIES_NAMES)"""
+    pageName = os.path.splitext(url.rsplit("/", 1)[-1])[0]
+    series = pageName.rsplit("_", 1)[0][-2:]
+    if series not in SERIES_NAMES:
+        series = ""
+    return series
+
+
+def poll_stat_page(session, url, urlState, year, archive=None):
+    """Fetches a stat page if it changed since the last poll, using
+    conditional GET headers and a content hash, and re-parses it only when
+    its content is new
+
+    Parameters:
+    session (requests Session): Keeps connections to npb.jp open
+    url (string): The stat page URL
+    urlState (dict): The page's poll state ("etag", "modified", "hash",
+    "rows"), updated in place
+    year (string): The stat year
+    archive (PageArchive): Stores pages with new content (default None
+    doesn't archive)
+
+    Returns:
+    changed (bool): True if the page's rows changed"""
+    import hashlib
+    import requests
+
+    headers = {}
+    if urlState.get("etag"):
+        headers["If-None-Match"] = urlState["etag"]
+    if urlState.get("modified"):
+        headers["If-Modified-Since"] = urlState["modified"]
+    try:
+        print("Polling: " + url)
+        r = session.get(url, headers=headers, timeout=30)
+        if r.status_code == 304:
+            return False
+        r.raise_for_status()
+    except requests.RequestException as ex:
+        print(ex)
+        return False
+    urlState["etag"] = r.headers.get("ETag")
+    urlState["modified"] = r.headers.get("Last-Modified")
+    pageHash = hashlib.sha256(r.content).hexdigest()
+    if pageHash == urlState.get("hash"):
+        return False
+    urlState["hash"] = pageHash
+    if archive is not None:
+        archive.store(url, r.content)
+    urlState["rows"] = parse_stat_page(r.content, year, get_url_series(url))
+    return True
+
+
+def run_live(statsDir, year, eliminated, minInterval, maxInterval):
+    """Live post season mode: polls the stat pages of teams still in the post
+    season, backing off on pages that stop changing, and rebuilds a stat
+    type's raw and output files only after one of its pages changes. Poll
+    state is kept in [year]/liveState.json so restarts don't refetch
+    every page
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    year (string): The post season year to poll
+    eliminated (list - string): Teams that are out and no longer polled
+    minInterval (float): Seconds between polls of a page that changed
+    maxInterval (float): Longest wait between polls of an unchanged page
+
+    Returns: N/A"""
+    import json
+    import requests
+    from time import time
+
+    yearDir = os.path.join(statsDir, year)
+    statePath = os.path.join(yearDir, "liveState.json")
+    state = {}
+    if os.path.exists(statePath):
+        with open(statePath) as stateFile:
+            state = json.load(stateFile)
+    cache = StatCache(statsDir)
+    teamCodes = get_team_codes()
+    eliminated = [team.lower() for team in eliminated]
+    urls = {}
+    for suffix in ["BP", "PP"]:
+        urls[suffix] = list(get_stat_urls(suffix, year))
+    session = requests.Session()
+    archive = PageArchive(statsDir)
+    print("Live polling " + year + " (Ctrl+C to stop)...")
+
+    try:
+        while True:
+            changedTeams = {}
+            for suffix, urlList in urls.items():
+                for url in urlList:
+                    urlState = state.setdefault(
+                        url, {"interval": minInterval, "nextPoll": 0}
+                    )
+                    team = teamCodes.get(get_url_team_code(url), "")
+                    # Pages are fetched at least once so every team has rows
+                    if "rows" in urlState and (
+                        team.lower() in eliminated
+                        or time() < urlState["nextPoll"]
+                    ):
+                        continue
+                    if poll_stat_page(session, url, urlState, year, archive):
+                        urlState["interval"] = minInterval
+                        changedTeams.setdefault(suffix, [])
+                        if team not in changedTeams[suffix]:
+                            changedTeams[suffix].append(team)
+                    else:
+                        # Back off pages that stopped changing
+                        urlState["interval"] = min(
+                            urlState["interval"] * 2, maxInterval
+                        )
+                    urlState["nextPoll"] = time() + urlState["interval"]
+                    # Pace requests to npb.jp
+                    sleep(1)
+
+            for suffix, teams in changedTeams.items():
+                outputFile = make_raw_player_file(yearDir, suffix, year)
+                outputFile.write(get_raw_header(suffix))
+                for url in urls[suffix]:
+                    outputFile.writelines(state[url].get("rows", []))
+                outputFile.close()
+                # Only the changed teams' aggregates are recomputed, unless a
+                # page's team code isn't in teams.csv
+                if "" in teams:
+                    rebuilt = cache.regenerate(year, (suffix,), ["org"])
+                else:
+                    rebuilt = cache.update_teams(year, suffix, teams)
+                print("Rebuilt: " + ", ".join(rebuilt))
+            with open(statePath, "w") as stateFile:
+                json.dump(state, stateFile)
+
+            # Sleep until the next alive page is due
+            alivePolls = [
+                state[url]["nextPoll"]
+                for urlList in urls.values()
+                for url in urlList
+                if teamCodes.get(get_url_team_code(url), "").lower()
+                not in eliminated
+            ]
+            if not alivePolls:
+                print("Every team is eliminated, stopping")
+                break
+            sleep(max(min(alivePolls) - time(), 1))
+    except KeyboardInterrupt:
+        print("Stopped live polling")
+    session.close()
+
+
+def combine_raw_ip_columns(df, suffix):
+    """Combines the IP column of a raw pitching stat df with the unnamed
+    column npb.jp splits IP decimals into
+
+    Parameters:
+    df (pandas dataframe): Raw pitching stats
+    suffix (string): A pitching (PP stat type) suffix
+
+    Returns:
+    df (pandas dataframe): The stats with a single float IP column"""
+    statType = get_stat_type(suffix)
+    # Some IP entries can be '+', replace with 0 for conversions and
+    # calculations
+    df["IP"] = df["IP"].astype(str).replace("+", "0")
+    # Convert all NaN to 0 (as floats)
+    if statType == "PP":
+        df.iloc[:, 11] = df.iloc[:, 11].fillna(0)
+        df.iloc[:, 11] = df.iloc[:, 11].astype(float)
+        # Combine the incorrectly split IP stat columns
+        df["IP"] = df["IP"].astype(float)
+        df["IP"] = df["IP"] + df.iloc[:, 11]
+        # Drop unnamed column that held IP column decimals
+        df.drop(df.columns[11], axis=1, inplace=True)
+    return df
+
+
+def get_raw_field_counts(content):
+    """Counts the comma separated fields on every line of a raw stat file
+    without parsing it
+
+    Parameters:
+    content (bytes): The raw stat file's contents
+
+    Returns:
+    fieldCounts (numpy array): Fields on each line"""
+    import numpy as np
+
+    # Only commas and newlines are kept (UTF-8 names never contain either
+    # byte), so each line's commas are the gap between its newlines
+    dropBytes = bytes(byte for byte in range(256) if byte not in b",\n")
+    skeleton = np.frombuffer(content.translate(None, dropBytes), np.uint8)
+    lineEnds = np.flatnonzero(skeleton == ord("\n"))
+    if len(content) and not content.endswith(b"\n"):
+        lineEnds = np.append(lineEnds, len(skeleton))
+    fieldCounts = np.diff(lineEnds, prepend=-1)
+    return fieldCounts
+
+
+def validate_raw_stats(df, suffix, teams):
+    """Runs every raw stat check on a parsed raw stat file: numeric types
+    (besides RAW_SENTINELS), missing values, RAW_RANGES, non-negative whole
+    counts, teams against the registry, series codes and RAW_INVARIANTS. Each
+    check is one vectorized pass over its columns
+
+    Parameters:
+    df (pandas dataframe): The raw stats as read by pandas
+    suffix (string): Any STAT_SUFFIXES suffix
+    teams (list - string): Valid team names (see get_team_registry())
+
+    Returns:
+    failures (dict): Check names mapped to boolean arrays of the rows that
+    fail them"""
+    import numpy as np
+    import pandas as pd
+
+    statType = get_stat_type(suffix)
+    # Raw columns are checked by position, the IP decimal column is unnamed
+    headerCols = get_raw_header(suffix).rstrip("\n").split(",")
+    teamPos = headerCols.index("Team")
+    ranges = dict(
+        RAW_RANGES[statType], G=(0, STAT_SUFFIXES[suffix]["maxGames"])
+    )
+    failures = {}
+    values = {}
+    ipSentinel = np.zeros(len(df), dtype=bool)
+    for pos in range(1, teamPos):
+        col = headerCols[pos]
+        column = df.iloc[:, pos]
+        isSentinel = np.zeros(len(df), dtype=bool)
+        if pd.api.types.is_integer_dtype(column.dtype):
+            # Whole numbers with no missing values, only the sign and range
+            # need checking
+            numbers = column.to_numpy()
+            values[col] = numbers
+            if col in ranges:
+                low, high = ranges[col]
+                failures["range " + col] = (numbers < low) | (numbers > high)
+            elif col not in RAW_NON_COUNT_COLS:
+                failures["count " + col] = numbers < 0
+            continue
+        if column.dtype == object:
+            isSentinel = column.isin(RAW_SENTINELS.get(col, [])).to_numpy()
+            numbers = pd.to_numeric(column, errors="coerce")
+            badType = (numbers.isna() & column.notna()).to_numpy()
+            failures["type " + col] = badType & ~isSentinel
+            # Text values are only reported as the wrong type
+            isSentinel = isSentinel | badType
+            numbers = numbers.to_numpy(dtype=float)
+        else:
+            numbers = column.to_numpy(dtype=float)
+        values[col] = numbers
+        if col == "IP":
+            ipSentinel = isSentinel
+        if col != "":
+            failures["missing " + col] = np.isnan(numbers) & ~isSentinel
+        if col in ranges:
+            low, high = ranges[col]
+            failures["range " + col] = (numbers < low) | (numbers > high)
+        elif col not in RAW_NON_COUNT_COLS:
+            failures["count " + col] = (numbers < 0) | (numbers % 1 > 0)
+    if statType == "PP":
+        # "+" innings have no decimals
+        failures["IP +"] = ipSentinel & ~np.isnan(values[""])
+    failures["team"] = ~df.iloc[:, teamPos].isin(teams).to_numpy()
+    if df.shape[1] > teamPos + 1:
+        # Files scraped before series were recorded have an empty column
+        series = df.iloc[:, teamPos + 1]
+        failures["series"] = ~series.isin(
+            list(SERIES_NAMES) + [np.nan]
+        ).to_numpy()
+    for left, op, right in RAW_INVARIANTS[statType]:
+        total = sum(weight * values[col] for col, weight in right.items())
+        terms = [
+            (str(weight) + "*" if weight != 1 else "") + col
+            for col, weight in right.items()
+        ]
+        if op == ">=":
+            failed = values[left] < total
+        else:
+            failed = np.abs(values[left] - total) > 0
+        failures[left + " " + op + " " + " + ".join(terms)] = failed
+    return failures
+
+
+def read_raw_stats(yearDir, suffix, year, report=True):
+    """Reads a raw stat file through the data quality checks. Rows with the
+    wrong number of fields or that fail validate_raw_stats() are left out
+    and written with their reasons to
+    stats/[year]/quarantine/[year]StatsRaw[suffix].csv, and the failed
+    checks are reported
+
+    Parameters:
+    yearDir (string): The directory that stores the raw, scraped NPB stats
+    suffix (string): Any STAT_SUFFIXES suffix
+    year (string): The stat year
+    report (bool): Write the quarantine file and report the failed checks
+    (default True)
+
+    Returns:
+    df (pandas dataframe): The raw stats that passed every check"""
+    import io
+
+    import numpy as np
+    import pandas as pd
+
+    rawName = year + "StatsRaw" + suffix + ".csv"
+    with open(os.path.join(yearDir, rawName), "rb") as rawIn:
+        content = rawIn.read()
+    header = content.split(b"\n", 1)[0].decode("utf-8").rstrip("\r")
+    expected = get_raw_header(suffix).rstrip("\n")
+    # Files scraped before series were recorded end in an empty column
+    if header not in [expected, expected.replace(",Series", ",")]:
+        raise ValueError(rawName + " has an unexpected header: " + header)
+    fieldCounts = get_raw_field_counts(content)
+    lines = None
+    reasons = {}
+    checkCounts = {}
+    # Short or long rows are quarantined, blank lines are skipped by pandas
+    wrongCount = np.flatnonzero(fieldCounts != fieldCounts[0])
+    if len(wrongCount):
+        lines = content.split(b"\n")
+        for line in wrongCount:
+            if lines[line].strip():
+                reasons[line] = [str(fieldCounts[line]) + " fields"]
+        if reasons:
+            checkCounts["fields"] = len(reasons)
+    df = pd.read_csv(io.BytesIO(content), skiprows=sorted(reasons))
+    # File line of each df row (the header is line 0)
+    dataLines = np.flatnonzero(fieldCounts == fieldCounts[0])[1:]
+    levels = STAT_SUFFIXES[suffix]["levels"]
+    teams = list(get_team_registry(year, levels)["Team"])
+    for check, failed in validate_raw_stats(df, suffix, teams).items():
+        if not failed.any():
+            continue
+        checkCounts[check] = int(failed.sum())
+        for line in dataLines[failed]:
+            reasons.setdefault(line, []).append(check)
+
+    quarantineFile = os.path.join(yearDir, "quarantine", rawName)
+    if not reasons:
+        if report and os.path.exists(quarantineFile):
+            os.remove(quarantineFile)
+        return df
+    quarantineLines = sorted(reasons)
+    # Read the file again without the quarantined rows so column types are
+    # inferred from good rows only
+    df = pd.read_csv(io.BytesIO(content), skiprows=quarantineLines)
+    if not report:
+        return df
+    if lines is None:
+        lines = content.split(b"\n")
+    quarantineDf = pd.DataFrame(
+        {
+            "Line": [line + 1 for line in quarantineLines],
+            "Reasons": ["; ".join(reasons[line]) for line in quarantineLines],
+            "Row": [
+                lines[line].decode("utf-8", "replace").rstrip("\r")
+                for line in quarantineLines
+            ],
+        }
+    )
+    os.makedirs(os.path.dirname(quarantineFile), exist_ok=True)
+    quarantineDf.to_csv(quarantineFile, index=False)
+    print(
+        "WARNING: "
+        + str(len(reasons))
+        + " of "
+        + str(len(dataLines) + checkCounts.get("fields", 0))
+        + " rows of "
+        + rawName
+        + " failed data quality checks ("
+        + ", ".join(
+            check + ": " + str(count) for check, count in checkCounts.items()
+        )
+        + ") and were quarantined in "
+        + quarantineFile
+    )
+    return df
+
+
+def get_raw_series(rawDf, nameCol, suffix, year):
+    """Recovers the series of raw rows scraped before series were recorded
+    from the year's playoffUrls.csv pages. Pages were written in URL order,
+    so a new page starts where the team changes or a player is listed again
+    (one team's pages of back to back series)
+
+    Parameters:
+    rawDf (pandas dataframe): Raw stats without a Series column
+    nameCol (string): "Player" or "Pitcher"
+    suffix (string): Any STAT_SUFFIXES suffix
+    year (string): The stat year
+
+    Returns:
+    series (pandas series): Each row's series code, "" for every row if the
+    pages don't line up with the year's URLs"""
+    import numpy as np
+    import pandas as pd
+
+    series = pd.Series("", index=rawDf.index)
+    urls = get_stat_urls(suffix, year)
+    if not isinstance(urls, pd.Series) or len(urls) == 0:
+        return series
+    pages = []
+    page = -1
+    prevTeam = None
+    pageNames = set()
+    for name, team in zip(rawDf[nameCol], rawDf["Team"]):
+        if team != prevTeam or name in pageNames:
+            page = page + 1
+            prevTeam = team
+            pageNames = set()
+        pageNames.add(name)
+        pages.append(page)
+    teamCodes = get_team_codes()
+    urlTeams = [teamCodes.get(get_url_team_code(url)) for url in urls]
+    pageTeams = rawDf["Team"].groupby(pages).first()
+    if list(pageTeams) != urlTeams:
+        print(
+            "WARNING: The "
+            + year
+            + suffix
+            + " raw rows don't match the pages in playoffUrls.csv, every "
+            "row is kept in a single series"
+        )
+        return series
+    urlSeries = np.array([get_url_series(url) for url in urls])
+    series[:] = urlSeries[pages]
+    return series
+
+
+def get_split_player_df(yearDir, suffix, year, rawDf=None):
+    """Sums a year's raw player rows per series in one grouped pass. Raw
+    files scraped before series were recorded have a single "" series
+
+    Parameters:
+    yearDir (string): The directory that stores the raw, scraped NPB stats
+    suffix (string): Any STAT_SUFFIXES suffix
+    year (string): The stat year
+    rawDf (pandas dataframe): Raw stats already read by read_raw_stats()
+    (default None reads the raw file)
+
+    Returns:
+    splitDf (pandas dataframe): Warehouse style player stats (see
+    get_warehouse_player_df()) with one row per player per series"""
+    statType = get_stat_type(suffix)
+    if rawDf is None:
+        # The year's quarantine is reported when its PlayerData is built
+        rawDf = read_raw_stats(yearDir, suffix, year, report=False)
+    else:
+        rawDf = rawDf.copy()
+    nameCol = "Player"
+    if statType == "PP":
+        nameCol = "Pitcher"
+        rawDf = combine_raw_ip_columns(rawDf, suffix)
+    if "Series" not in rawDf.columns:
+        rawDf["Series"] = get_raw_series(rawDf, nameCol, suffix, year)
+    rawDf["Series"] = rawDf["Series"].fillna("")
+    countCols = TEAM_COUNT_COLS[statType] + ["G"]
+    splitDf = rawDf.groupby([nameCol, "Team", "Series"], as_index=False)[
+        countCols
+    ].sum()
+    if statType == "BP":
+        # Same as PlayerData, players without a PA aren't listed
+        splitDf = splitDf[splitDf["PA"] != 0]
+    splitDf = select_league(splitDf, suffix)
+    splitDf = get_warehouse_player_df(splitDf, suffix, year)
+    return splitDf
+
+
+def get_stat_urls(suffix, year):
+    """Creates arrays of the correct URLs for the individual stat scraping
+
+    Parameters:
+    suffix (string): The desired mode to run in (either farm or regular season)
+    year (string): The desired npb year to scrape
+
+    Returns:
+    urlArrBaseB (array - string): Contains URLs to the team batting/pitching
+    stat pages"""
+    import numpy as np
+
+    # Drop entries with incorrect year and suffix
+    # Check for the player link file, if nothing is there tell user and return
+    relDir = os.path.dirname(__file__)
+    playoffUrlFile = relDir + "/input/playoffUrls.csv"
+    if not (os.path.exists(playoffUrlFile)):
+        print(
+            "\nERROR: No playoff URL file found, no links to scrape...\n"
+            "Provide a valid playoffUrls.csv file in the /input/ directory to "
+            "fix this.\n"
+        )
+        urlArrBase = np.nan
+        return urlArrBase
+
+    urlDf = read_input_csv(playoffUrlFile)
+    # Drop all rows that are not the df's year
+    urlDf = urlDf.drop(urlDf[urlDf.Year.astype(str) != year].index)
+    # Drop all rows that do not match the requested stats (batting/pitching)
+    urlDf = urlDf.drop(urlDf[urlDf.Suffix != suffix].index)
+    # Return URL arr for that year and stat type
+    urlArrBase = urlDf["Link"]
+    return urlArrBase
+
+
+def get_url(tryUrl):
+    """Attempts a GET request from the passed in URL
+
+    Parameters:
+    tryUrl (string): The URL to attempt opening
+
+    Returns:
+    response (Response): The URL's response"""
+    import requests
+    from urllib.error import HTTPError, URLError
+
+    try:
+        print("Connecting to: " + tryUrl)
+        response = requests.get(tryUrl)
+        response.raise_for_status()
+    # Page doesn't exist (404 not found, 403 not authorized, etc)
+    except HTTPError as hp:
+        print(hp)
+    # Bad URL
+    except URLError as ue:
+        print(ue)
+    return response
+
+
+def make_raw_player_file(writeDir, suffix, year):
+    """Opens a file to hold all player stats inside a relative /stats/
+    directory that is created before calling this function
+
+    Parameters:
+    writeDir (string): The directory that stores the scraped NPB stats
+    suffix (string): Indicates the raw stat file to create:
+    "BP" = post season batting stats
+    "PP" = post season pitching stats
+    "BR" = reg season batting stats
+    "PR" = reg season pitching stats
+    "BF" = farm batting stats
+    "PF" = farm pitching stats
+    year (string): The desired npb year to scrape
+
+    Returns:
+    newFile (file stream object): An opened file in /stats/ named
+    "[Year][Stats][Suffix].csv"""
+    # Open and return the file object in write mode
+    newCsvName = writeDir + "/" + year + "StatsRaw" + suffix + ".csv"
+    print(
+        "Raw "
+        + STAT_SUFFIXES[suffix]["name"]
+        + " results will be stored in: "
+        + newCsvName
+    )
+    newFile = open(newCsvName, "w")
+    return newFile
+
+
+def get_scrape_year(argsIn=None):
+    """Checks passed in arguments or gets user input for NPB stat year to
+    scrape
+
+    Parameters:
+    argsIn (string): If a command line argument is given, the year is checked
+    for validity. Default (None) indicates to collect user input instead
+
+    Returns:
+    argsIn (string): The desired npb stat year to scrape"""
+    # User input check
+    if argsIn is None:
+        # Infinite loop breaks when valid input obtained
+        # Either valid year or exit signal entered
+        while True:
+            argsIn = input(
+                "Enter a NPB year between 2020-"
+                + str(datetime.now().year)
+                + " or Q to quit: "
+            )
+            if argsIn == "Q":
+                sys.exit("Exiting...")
+            try:
+                argsIn = int(argsIn)
+            except ValueError:
+                print("Input must be a number (Example: 2024)")
+                continue
+            # Bounds for scrapable years
+            # Min year on npb.jp = 2008, but scraping is only tested until 2020
+            if 2020 <= argsIn <= datetime.now().year:
+                print(str(argsIn) + " entered. Continuing...")
+                break
+            else:
+                print(
+                    "Please enter a valid year (2020-"
+                    + str(datetime.now().year)
+                    + ")."
+                )
+    # Argument check
+    else:
+        try:
+            argsIn = int(argsIn)
+        except ValueError:
+            print("Year argument must be a number (Example: 2024)")
+            sys.exit("Exiting...")
+        # Bounds for scrapable years
+        # Min year on npb.jp is 2008, but scraping is only tested until 2020
+        if 2020 <= argsIn <= datetime.now().year:
+            pass
+        else:
+            print(
+                "Please enter a valid year (2020-"
+                + str(datetime.now().year)
+                + ")."
+            )
+            sys.exit("Exiting...")
+
+    # Return user input as a string
+    return str(argsIn)
+
+
+def get_user_choice(suffix):
+    """Gets user input for whether or not to undergo scraping and whether to
+    place relevant files in a zip
+
+    Parameters:
+    suffix (string): Indicates the option being asked about (post season
+    scraping "P" or zip file creation "Z")
+
+    Returns:
+    userIn (string): Returns "Y" or "N" (if "Q" is chosen, program terminates)
+    """
+    # Loop ends for valid choice/exit
+    while True:
+        if suffix == "P":
+            print(
+                "Choose whether to pull new post season stats from "
+                "npb.jp or only reorganize existing stat files.\nWARNING: "
+                "EXISTING RAW STAT FILES MUST BE PRESENT TO SKIP SCRAPING."
+            )
+            userIn = input("Scrape post season stats? (Y/N): ")
+        elif suffix == "Z":
+            userIn = input(
+                "Output these stats in a zip file for manual "
+                "upload? (Y/N): "
+            )
+
+        if userIn == "Q":
+            sys.exit("Exiting...")
+        elif userIn == "Y":
+            print("Continuing...")
+            break
+        elif userIn == "N":
+            print("Skipping...")
+            break
+        else:
+            print(
+                "Invalid input - enter (Y/N) to determine whether to scrape "
+                "or (Q) to quit."
+            )
+            continue
+    return userIn
+
+
+def convert_ip_column_out(df):
+    """In baseball, IP stats are traditionally represented using .1 (single
+    inning pitched), .2 (2 innings pitched), and whole numbers. This function
+    converts the decimals FROM thirds (.33 -> .1, .66 -> .2) for sake of
+    presentation
+
+    Parameters:
+    df (pandas dataframe): A pitching stat dataframe with the "thirds"
+    representation
+
+    Returns:
+    tempDf['IP'] (pandas dataframe column): An IP column converted back to the
+    original IP representation"""
+    import pandas as pd
+    import numpy as np
+
+    # IP ".0 .1 .2" fix
+    tempDf = pd.DataFrame(df["IP"])
+    # Get the ".0 .3 .7" in the 'IP' column
+    ipDecimals = tempDf["IP"] % 1
+    # Make the original 'IP' column whole numbers
+    tempDf["IP"] = tempDf["IP"] - ipDecimals
+    # Convert IP decimals to thirds and re-add them to the whole numbers
+    ipDecimals = (ipDecimals / 0.3333333333) / 10
+    df["IP"] = tempDf["IP"] + ipDecimals
+    # Entries with .3 are invalid: add 1 and remove the decimals
+    x = tempDf["IP"] + ipDecimals
+    condlist = [((x % 1) < 0.29), ((x % 1) >= 0.29)]
+    choicelist = [x, (x - (x % 1)) + 1]
+    tempDf["IP"] = np.select(condlist, choicelist)
+    tempDf["IP"] = tempDf["IP"].apply("{:.1f}".format)
+    tempDf["IP"] = tempDf["IP"].astype(float)
+    return tempDf["IP"]
+
+
+def convert_ip_column_in(df):
+    """Converts the decimals in the IP column TO thirds (.1 -> .33, .2 -> .66)
+    for stat calculations
+
+    Parameters:
+    df (pandas dataframe): A pitching stat dataframe with the traditional
+    .1/.2 IP representation
+
+    Returns:
+    tempDf['IP'] (pandas dataframe column): An IP column converted for stat
+    calculations"""
+    import pandas as pd
+
+    tempDf = pd.DataFrame(df["IP"])
+    # Get the ".0 .1 .2" in the 'IP' column
+    ipDecimals = tempDf["IP"] % 1
+    # Make the original 'IP' column whole numbers
+    tempDf["IP"] = tempDf["IP"] - ipDecimals
+    # Multiply IP decimals by .3333333333 and readd them to the whole numbers
+    ipDecimals = (ipDecimals * 10) * 0.3333333333
+    tempDf["IP"] = tempDf["IP"] + ipDecimals
+    return tempDf["IP"]
+
+
+def select_park_factor(df, suffix, year):
+    """Selects the correct park factor depending on the NPB year and team
+
+    Parameters:
+    df (pandas dataframe): The dataframe to add the park factor column to
+    suffix (string): Indicates whether to use farm or reg season park factors
+    year (string): The year of park factors to pull
+
+    Returns:
+    df (pandas dataframe): The pandas dataframe with the new temp park factor
+    column"""
+    import numpy as np
+
+    # Check for the park factor file, if nothing is there tell user and return
+    relDir = os.path.dirname(__file__)
+    pfFile = relDir + "/input/parkFactors.csv"
+    if not (os.path.exists(pfFile)):
+        print(
+            "\nERROR: No park factor file found, calculations using park "
+            "factors will be inaccurate...\nProvide a valid parkFactors.csv "
+            "file in the /input/ directory to fix this.\n"
+        )
+        df["ParkF"] = np.nan
+        return df
+
+    pfDf = read_input_csv(pfFile)
+    # Drop all rows that are not the df's year
+    pfDf = pfDf.drop(pfDf[pfDf.Year.astype(str) != year].index)
+    # Drop all rows that do not match the df's league, the first of the
+    # suffix's leagues the year has is used (calibrated post season park
+    # factors, see run_calibrate(), once applied)
+    for pfSuffix in STAT_SUFFIXES[suffix]["constants"]:
+        if (pfDf.League == pfSuffix).any():
+            break
+    pfDf = pfDf.drop(pfDf[pfDf.League != pfSuffix].index)
+    # Drop remaining unneeded cols before merge
+    pfDf.drop(["Year", "League"], axis=1, inplace=True)
+    # Modifying all park factors for calculations
+    pfDf["ParkF"] = (pfDf["ParkF"] + 1) / 2
+    df = df.merge(pfDf, on="Team", how="left")
+    # For team files, league avg calculations have park factor as 1.000
+    df.loc[df.Team == "League Average", "ParkF"] = 1.000
+
+    return df
+
+
+def select_fip_const(suffix, year):
+    """Chooses the FIP constant of a year for the suffix's league (see
+    STAT_SUFFIXES)
+
+    Parameters:
+    suffix (string): Indicates whether to use farm or reg season FIP constants
+    year (string): The year of FIP constants to pull
+
+    Returns:
+    fipConst (float): The correct FIP const according to year and farm/NPB reg
+    season"""
+    import numpy as np
+
+    # Check for the player link file, if nothing is there tell user and return
+    relDir = os.path.dirname(__file__)
+    fipFile = relDir + "/input/fipConst.csv"
+    if not (os.path.exists(fipFile)):
+        print(
+            "\nERROR: No FIP constant file found, calculations using FIP will "
+            "be inaccurate...\nProvide a valid fipConst.csv file in the "
+            "/input/ directory to fix this.\n"
+        )
+        fipConst = np.nan
+        return fipConst
+
+    fipDf = read_input_csv(fipFile)
+    # Drop all rows that are not the df's year
+    fipDf = fipDf.drop(fipDf[fipDf.Year.astype(str) != year].index)
+    # Drop all rows that do not match the df's league, the first of the
+    # suffix's leagues the year has is used (post season constants, see
+    # run_calibrate(), over the reg season's once applied)
+    for fipSuffix in STAT_SUFFIXES[suffix]["constants"]:
+        if (fipDf.League == fipSuffix).any():
+            break
+    fipDf = fipDf.drop(fipDf[fipDf.League != fipSuffix].index)
+    # Return FIP for that year and league
+    fipConst = fipDf.at[fipDf.index[-1], "FIP"]
+    return fipConst
+
+
+def calc_postseason_fip_consts(totalsDf):
+    """Derives each post season's FIP constant (league ERA minus the league's
+    uncorrected FIP) from its pitching totals
+
+    Parameters:
+    totalsDf (pandas dataframe): Year and the summed ER, IP (decimal
+    innings), HR, BB, HB and SO of each season
+
+    Returns:
+    fipDf (pandas dataframe): Year, FIP and League columns (fipConst.csv's)"""
+    import pandas as pd
+
+    lgERA = 9 * totalsDf["ER"] / totalsDf["IP"]
+    lgFIPCore = (
+        (13 * totalsDf["HR"])
+        + (3 * (totalsDf["BB"] + totalsDf["HB"]))
+        - (2 * totalsDf["SO"])
+    ) / totalsDf["IP"]
+    fipDf = pd.DataFrame(
+        {
+            "Year": totalsDf["Year"].astype(int),
+            "FIP": round(lgERA - lgFIPCore, 3),
+            "League": CALIBRATED_LEAGUE,
+        }
+    )
+    return fipDf
+
+
+def calc_regressed_park_factors(pfDf):
+    """Blends every team's recent park factors (PARK_FACTOR_WEIGHTS) and
+    regresses them toward a neutral park (PARK_FACTOR_NEUTRAL_WEIGHT). All
+    teams and years are computed at once on a team by year grid
+
+    Parameters:
+    pfDf (pandas dataframe): Hand entered reg season park factors (the "NPB"
+    rows of parkFactors.csv). The warehouse's post season totals have no
+    home/road splits to measure parks with, so these are the source
+
+    Returns:
+    regDf (pandas dataframe): Year, Team, ParkF and League columns
+    (parkFactors.csv's) for every team season in pfDf"""
+    grid = pfDf.pivot_table(index="Team", columns="Year", values="ParkF")
+    # Missing seasons are gaps in the grid so lags are always whole years
+    years = grid.columns.astype(int)
+    grid.columns = years
+    grid = grid.reindex(columns=range(years.min(), years.max() + 1))
+    weighted = 0
+    weightSum = 0
+    for lag, weight in enumerate(PARK_FACTOR_WEIGHTS):
+        lagged = grid.shift(lag, axis=1)
+        weighted = weighted + (lagged.fillna(0) * weight)
+        weightSum = weightSum + (lagged.notna() * weight)
+    regressed = (weighted + PARK_FACTOR_NEUTRAL_WEIGHT) / (
+        weightSum + PARK_FACTOR_NEUTRAL_WEIGHT
+    )
+    regressed = regressed.where(grid.notna()).round(3)
+    regDf = regressed.stack().rename("ParkF").reset_index()
+    regDf.columns = ["Team", "Year", "ParkF"]
+    regDf["League"] = CALIBRATED_LEAGUE
+    regDf = regDf.sort_values(["Year", "Team"], ascending=[False, True])
+    return regDf[["Year", "Team", "ParkF", "League"]]
+
+
+def get_calibration_hash(totalsDf, pfDf):
+    """Hashes everything a calibration is computed from: the calibration
+    version and settings plus both input tables
+
+    Parameters:
+    totalsDf (pandas dataframe): Post season pitching totals by year
+    pfDf (pandas dataframe): Hand entered park factors
+
+    Returns:
+    inputHash (string): The sha256 hex digest"""
+    import hashlib
+
+    inputHash = hashlib.sha256()
+    settings = (
+        CALIBRATION_VERSION,
+        PARK_FACTOR_WEIGHTS,
+        PARK_FACTOR_NEUTRAL_WEIGHT,
+    )
+    inputHash.update(repr(settings).encode())
+    inputHash.update(totalsDf.to_csv(index=False).encode())
+    inputHash.update(pfDf.to_csv(index=False).encode())
+    return inputHash.hexdigest()
+
+
+def apply_calibration(fileName, calDf):
+    """Replaces the calibrated (CALIBRATED_LEAGUE) rows of an input csv. The
+    hand entered rows are kept exactly as written
+
+    Parameters:
+    fileName (string): fipConst.csv or parkFactors.csv
+    calDf (pandas dataframe): The calibrated rows, in the csv's columns
+
+    Returns: N/A"""
+    with open(fileName) as csvIn:
+        lines = csvIn.read().splitlines()
+    header = lines[0].split(",")
+    leagueCol = header.index("League")
+    lines = [lines[0]] + [
+        line
+        for line in lines[1:]
+        if line.split(",")[leagueCol] != CALIBRATED_LEAGUE
+    ]
+    lines += calDf[header].to_csv(index=False, header=False).splitlines()
+    with open(fileName, "w") as csvOut:
+        csvOut.write("\n".join(lines) + "\n")
+
+
+def get_linear_weights(totals, year, league):
+    """Derives a season's wOBA linear weights from league batting totals
+    (FanGraphs' "guts" method: runs per out plus fixed event run values,
+    shifted by the value of an out and scaled so league wOBA equals league
+    OBP). Weights are cached per (year, league) and only re-derived when the
+    league's totals change
+
+    Parameters:
+    totals (pandas series): League batting counting stat totals (the
+    TEAM_COUNT_COLS["BP"] columns)
+    year (string): The season the totals are from
+    league (string): "CL", "PL" or "NPB" (both leagues)
+
+    Returns:
+    weights (dict): Event weights ("wBB", "wHP", "w1B", "w2B", "w3B", "wHR")
+    plus "lgwOBA", "wOBAScale" and "lgRPA" (league runs per PA)"""
+    import numpy as np
+
+    totalsKey = tuple(totals.reindex(TEAM_COUNT_COLS["BP"]).tolist())
+    cached = LINEAR_WEIGHTS_CACHE.get((year, league))
+    if cached is not None and cached[0] == totalsKey:
+        return cached[1]
+
+    t = totals.reindex(TEAM_COUNT_COLS["BP"]).fillna(0).astype(float)
+    t = dict(zip(TEAM_COUNT_COLS["BP"], t.to_numpy()))
+    # Empty leagues leave NaN weights instead of warnings
+    with np.errstate(divide="ignore", invalid="ignore"):
+        singles = t["H"] - t["2B"] - t["3B"] - t["HR"]
+        unintBB = t["BB"] - t["IBB"]
+        runsPerOut = t["R"] / (
+            t["AB"] - t["H"] + t["SF"] + t["SH"] + t["CS"] + t["GDP"]
+        )
+        runBB = runsPerOut + 0.14
+        runValues = {
+            "wBB": runBB,
+            "wHP": runBB + 0.025,
+            "w1B": runBB + 0.155,
+            "w2B": runBB + 0.455,
+            "w3B": runBB + 0.725,
+            "wHR": 1.4,
+        }
+        events = {
+            "wBB": unintBB,
+            "wHP": t["HP"],
+            "w1B": singles,
+            "w2B": t["2B"],
+            "w3B": t["3B"],
+            "wHR": t["HR"],
+        }
+        runsPlus = sum(runValues[w] * events[w] for w in runValues)
+        runsMinus = runsPlus / (t["AB"] - t["H"] + t["SF"])
+        wobaDenom = t["AB"] + unintBB + t["SF"] + t["HP"]
+        rawwOBA = (
+            sum((runValues[w] + runsMinus) * events[w] for w in runValues)
+            / wobaDenom
+        )
+        lgOBP = (t["H"] + t["BB"] + t["HP"]) / (
+            t["AB"] + t["BB"] + t["HP"] + t["SF"]
+        )
+        scale = lgOBP / rawwOBA
+        weights = {
+            w: (runValues[w] + runsMinus) * scale for w in runValues
+        }
+        weights["lgwOBA"] = rawwOBA * scale
+        weights["wOBAScale"] = scale
+        weights["lgRPA"] = t["R"] / t["PA"]
+    LINEAR_WEIGHTS_CACHE[(year, league)] = (totalsKey, weights)
+    return weights
+
+
+def get_league_weights(df, year):
+    """Gets the wOBA linear weights of a batting dataframe from its pooled
+    NPB counting stat totals, like OPS+. A single league's post season can
+    be one team's handful of games, too few runs for stable weights
+
+    Parameters:
+    df (pandas dataframe): Player or team batting stats with a "League"
+    column (see select_league())
+    year (string): The season of df
+
+    Returns:
+    weights (dict): Every league in df and "NPB" mapped to the pooled
+    get_linear_weights() dict"""
+    weights = get_linear_weights(df[TEAM_COUNT_COLS["BP"]].sum(), year, "NPB")
+    leagueWeights = {league: weights for league in df["League"].unique()}
+    leagueWeights["NPB"] = weights
+    return leagueWeights
+
+
+def calc_woba_parts(df, weights):
+    """Computes the unrounded wOBA and wRAA of every row and the league runs
+    per PA they're measured against, each row using the linear weights of
+    its league
+
+    Parameters:
+    df (pandas dataframe): Batting counting stats with a "League" column
+    weights (dict): Leagues mapped to linear weights (see
+    get_league_weights())
+
+    Returns:
+    parts (dict): "wOBA", "wRAA", "lgwOBA", "wOBAScale" and "lgRPA" series
+    aligned with df (NaN for rows without weights or playing time)"""
+    import numpy as np
+    import pandas as pd
+
+    # Rows of a league without weights get NaN stats
+    weightDf = pd.DataFrame.from_dict(weights, orient="index")
+    weightDf = weightDf.reindex(df["League"])
+    w = {col: weightDf[col].to_numpy(dtype=float) for col in weightDf.columns}
+    stats = {
+        col: df[col].to_numpy(dtype=float)
+        for col in ["PA", "AB", "H", "2B", "3B", "HR", "SF", "BB", "IBB", "HP"]
+    }
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unintBB = stats["BB"] - stats["IBB"]
+        singles = stats["H"] - stats["2B"] - stats["3B"] - stats["HR"]
+        woba = (
+            (w["wBB"] * unintBB)
+            + (w["wHP"] * stats["HP"])
+            + (w["w1B"] * singles)
+            + (w["w2B"] * stats["2B"])
+            + (w["w3B"] * stats["3B"])
+            + (w["wHR"] * stats["HR"])
+        ) / (stats["AB"] + unintBB + stats["SF"] + stats["HP"])
+        wraa = ((woba - w["lgwOBA"]) / w["wOBAScale"]) * stats["PA"]
+    parts = {
+        "wOBA": pd.Series(woba, index=df.index),
+        "wRAA": pd.Series(wraa, index=df.index),
+    }
+    for col in ["lgwOBA", "wOBAScale", "lgRPA"]:
+        parts[col] = pd.Series(w[col], index=df.index)
+    return parts
+
+
+def calc_woba_stats(df, weights):
+    """Adds wOBA, wRAA and park adjusted wRC+ columns, each row using the
+    linear weights of its league
+
+    Parameters:
+    df (pandas dataframe): Batting counting stats with "League" and "ParkF"
+    (see select_park_factor()) columns
+    weights (dict): Leagues mapped to linear weights (see
+    get_league_weights())
+
+    Returns:
+    df (pandas dataframe): The dataframe with the unformatted wOBA, wRAA and
+    wRC+ columns added"""
+    import numpy as np
+
+    parts = calc_woba_parts(df, weights)
+    woba = parts["wOBA"].to_numpy()
+    wraa = parts["wRAA"].to_numpy()
+    lgRPA = parts["lgRPA"].to_numpy()
+    pa = df["PA"].to_numpy(dtype=float)
+    parkF = df["ParkF"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wrcPlus = (
+            100 * ((wraa / pa) + lgRPA + (lgRPA - (parkF * lgRPA))) / lgRPA
+        )
+    df["wOBA"] = np.round(woba, 3)
+    df["wRAA"] = np.round(wraa, 1)
+    df["wRC+"] = np.round(wrcPlus, 0)
+    return df
+
+
+def select_league(df, suffix):
+    """Adds a "League" column based on the team (teams.csv)
+
+    Parameters:
+    df (pandas dataframe): A team or player dataframe
+    suffix (string): The stat suffix, farm suffixes use the farm leagues
+
+    Returns:
+    df (pandas dataframe): The dataframe with the correct "League" column added
+    """
+    leagues = map_team_column(df["Team"], STAT_SUFFIXES[suffix]["leagueCol"])
+    if "League" in df.columns:
+        # Rows of teams that aren't in the registry keep their league
+        leagues = leagues.fillna(df["League"])
+    df["League"] = leagues
+    return df
+
+
+def get_team_registry(year=None, levels=None):
+    """Returns the team registry (input/teams.csv): each team's English
+    (Team), abbreviated (Abb) and Japanese (JP) names, box score short names
+    (Short, "|" separated), npb.jp URL code, league and farm league,
+    level ("NPB" or "Farm"),
+    team page link and the years the team is valid (FirstYear to LastYear,
+    blank for current teams)
+
+    Parameters:
+    year (string): Only keep teams valid in this year (default None keeps
+    every team)
+    levels (list - string): Only keep teams at these levels (default None
+    keeps every level)
+
+    Returns:
+    teamDf (pandas dataframe): The registry rows in file order (the team
+    stat row order)"""
+    relDir = os.path.dirname(__file__)
+    teamDf = read_input_csv(relDir + "/input/teams.csv")
+    if year is not None:
+        lastYear = teamDf["LastYear"].fillna(int(year))
+        teamDf = teamDf[
+            (teamDf["FirstYear"] <= int(year)) & (lastYear >= int(year))
+        ]
+    if levels is not None:
+        teamDf = teamDf[teamDf["Level"].isin(levels)]
+    return teamDf
+
+
+def map_team_column(teams, column):
+    """Maps team names to one of their teams.csv columns in a single
+    categorical pass, however many teams the registry holds
+
+    Parameters:
+    teams (pandas series): English team names
+    column (string): The teams.csv column to map to ("League", "Abb", ...)
+
+    Returns:
+    values (pandas series): Each team's value, NaN for unknown teams"""
+    import numpy as np
+    import pandas as pd
+
+    teamDf = get_team_registry()
+    codes = pd.Categorical(teams, categories=teamDf["Team"]).codes
+    # Unknown teams have code -1, the NaN appended last
+    values = np.append(teamDf[column].to_numpy(dtype=object), np.nan)
+    return pd.Series(values[codes], index=teams.index)
+
+
+def build_team_dict(teamDf, keyCol, valueCol):
+    """Maps one teams.csv column to another, each "|" separated key on its
+    own (blank keys are skipped)
+
+    Parameters:
+    teamDf (pandas dataframe): The contents of teams.csv
+    keyCol (string): The column to look teams up by ("JP", "Code", ...)
+    valueCol (string): The column to return ("Team", ...)
+
+    Returns:
+    teamDict (dict): keyCol values mapped to valueCol values"""
+    teamDf = teamDf.dropna(subset=[keyCol])
+    teamDf = teamDf.assign(
+        **{keyCol: teamDf[keyCol].astype(str).str.split("|")}
+    )
+    teamDf = teamDf.explode(keyCol)
+    teamDict = dict(zip(teamDf[keyCol], teamDf[valueCol]))
+    return teamDict
+
+
+def convert_player_to_html(df, suffix, year):
+    """The WordPress tables associated with this project accepts HTML code, so
+    this function formats player names into <a> tags with links to the player's
+    npb.jp pages. Used after stats are calculated but before any csv output
+
+    Parameters:
+    df (pandas dataframe): Any final stat dataframe
+    suffix (string): Indicates the data in param df
+        "BR" = reg season batting stat URLs passed in
+        "PR" = reg season pitching stat URLs passed in
+        "BF" = farm batting stat URLs passed in
+        "PF" = farm pitching stat URLs passed in
+    year (string): Indicates the stat year for df
+
+    Returns:
+    df (pandas dataframe): The final stat dataframe with valid HTML in the
+    player/pitcher columns
+    """
+    statType = get_stat_type(suffix)
+    relDir = os.path.dirname(__file__)
+    playerLinkFile = relDir + "/input/playerUrls.csv"
+    if not (os.path.exists(playerLinkFile)):
+        print(
+            "\nERROR: No player link file found, table entries will not "
+            "have links...\nProvide a playerUrls.csv file in the /input/ "
+            "directory to fix this.\n"
+        )
+        return df
+
+    # Create dict of Player Name:Complete HTML tag (reused until the csv
+    # that contains player names and their personal page links changes)
+    playerDict = get_lookup_table(playerLinkFile, build_player_link_dict)
+
+    # Replace all player entries with HTML that leads to their pages
+    if statType == "PP":
+        convertCol = "Pitcher"
+    else:
+        convertCol = "Player"
+    # Convert to HTML
+    df[convertCol] = (
+        df[convertCol]
+        .map(playerDict)
+        .infer_objects()
+        .fillna(df[convertCol])
+        .astype(str)
+    )
+
+    # Check for the player link fix file
+    playerLinkFixFile = relDir + "/input/playerUrlsFix.csv"
+    if os.path.exists(playerLinkFixFile):
+        fixDf = read_input_csv(playerLinkFixFile)
+        # Check year and suffix, fix if needed
+        if int(year) in fixDf.Year.values and suffix in fixDf.Suffix.values:
+            # Create dict of Player Name:Complete HTML tag
+            fixDict = dict(zip(fixDf["Original"], fixDf["Corrected"]))
+            df[convertCol] = (
+                df[convertCol]
+                .map(fixDict)
+                .infer_objects()
+                .fillna(df[convertCol])
+                .astype(str)
+            )
+    return df
+
+
+def translate_players(df, playerColName):
+    """Translates player names from Japanese to English using a csv file
+    containing the translations
+
+    Parameters:
+    df (pandas dataframe): A dataframe containing entries with player names
+    playerColName (string): The name of the column containing player names
+
+    Returns:
+    df (pandas dataframe): The dataframe with translated player"""
+    relDir = os.path.dirname(__file__)
+    translationFile = relDir + "/input/nameTranslations.csv"
+    if not (os.path.exists(translationFile)):
+        print(
+            "\nERROR: No player name translation file found, player names "
+            "will not be translated...\nProvide a nameTranslations.csv file in"
+            " the /input/ directory to fix this.\n"
+        )
+        return df
+    # Strip input of JP space
+    df[playerColName] = df[playerColName].str.replace("　", " ")
+    # Create dict of JP name:Eng name
+    playerDict = get_lookup_table(translationFile, build_translation_dict)
+    df["keys"] = list(zip(df[playerColName], df["Team"]))
+    df[playerColName] = (
+        df["keys"]
+        .map(playerDict)
+        .infer_objects()
+        .fillna(df[playerColName])
+        .astype(str)
+    )
+    df[playerColName] = df[playerColName].str.replace('"', "")
+    df[playerColName] = df[playerColName].str.replace(",", "")
+    return df
+
+
+def convert_team_to_html(df, mode):
+    """Formats the team names to include links to their npb.jp pages
+
+    Parameters:
+    df (pandas dataframe): A dataframe containing entries with NPB teams
+    mode (string): Indicates whether to preserve full team names (pass in
+    "Full") or also insert short names in the <a> tags (pass in "Abb")
+
+    Returns:
+    df (pandas dataframe): The dataframe with correct links and abbrieviations
+    inserted as <a> tags"""
+    # Check for the team registry, if missing, tell user and return
+    relDir = os.path.dirname(__file__)
+    teamLinkFile = relDir + "/input/teams.csv"
+    if not (os.path.exists(teamLinkFile)):
+        print(
+            "\nWARNING: No team registry found, table entries will not have "
+            "links...\nProvide a teams.csv file in the /input/ directory to "
+            "fix this.\n"
+        )
+        return df
+
+    # Create dict of Team Name:Complete HTML tag and convert
+    teamDict = get_lookup_table(teamLinkFile, build_team_link_dict, mode)
+    for column in df:
+        df[column] = (
+            df[column]
+            .map(teamDict)
+            .infer_objects()
+            .fillna(df[column])
+            .astype(str)
+        )
+
+    return df
+
+
+def build_player_link_dict(linkDf):
+    """Builds the Player Name:Complete HTML tag dict from playerUrls.csv
+
+    Parameters:
+    linkDf (pandas dataframe): The contents of playerUrls.csv
+
+    Returns:
+    playerDict (dict): Player names mapped to their <a> tags"""
+    # Create new HTML code column
+    linkDf["Link"] = linkDf.apply(build_html, axis=1)
+    playerDict = dict(linkDf.values)
+    return playerDict
+
+
+def build_player_id_dict(linkDf):
+    """Builds the Player Name:npb.jp player ID dict from playerUrls.csv
+
+    Parameters:
+    linkDf (pandas dataframe): The contents of playerUrls.csv
+
+    Returns:
+    playerIds (dict): Player names mapped to their npb.jp player IDs"""
+    ids = linkDf["Link"].str.extract(r"players/(\w+)\.html", expand=False)
+    playerIds = dict(zip(linkDf["Player"], ids))
+    return playerIds
+
+
+def build_translation_dict(translateDf):
+    """Builds the (JP name, Eng team):Eng name dict from nameTranslations.csv
+
+    Parameters:
+    translateDf (pandas dataframe): The contents of nameTranslations.csv
+
+    Returns:
+    playerDict (dict): JP name and team keys mapped to Eng names"""
+    playerDict = dict(
+        zip(
+            (zip(translateDf["jp_name"], translateDf["en_team"])),
+            translateDf["en_name"],
+        )
+    )
+    return playerDict
+
+
+def build_team_link_dict(teamDf, mode):
+    """Builds the Team Name:Complete HTML tag dict from teams.csv
+
+    Parameters:
+    teamDf (pandas dataframe): The contents of teams.csv
+    mode (string): "Full" for full team names in the <a> tags or "Abb" for
+    short names
+
+    Returns:
+    teamDict (dict): Team names mapped to their <a> tags"""
+    import pandas as pd
+
+    if mode == "Full":
+        names = teamDf["Team"]
+    elif mode == "Abb":
+        names = teamDf["Abb"].fillna(teamDf["Team"])
+    hasLink = teamDf["Link"].notna()
+    linkDf = pd.DataFrame({"Name": names, "Link": teamDf["Link"]})[hasLink]
+    teamDict = dict(
+        zip(teamDf.loc[hasLink, "Team"], linkDf.apply(build_html, axis=1))
+    )
+    if mode == "Abb":
+        # Teams without a page (farm clubs) still get their short names
+        teamDict.update(zip(teamDf.loc[~hasLink, "Team"], names[~hasLink]))
+    return teamDict
+
+
+def read_input_csv(fileName):
+    """Reads a csv from /input/, reusing the parsed dataframe until the file
+    is modified. Long running modes (daemon, watch) rely on this to skip
+    re-reading unchanged reference data
+
+    Parameters:
+    fileName (string): The path of the csv to read
+
+    Returns:
+    df (pandas dataframe): A copy of the csv's contents"""
+    import pandas as pd
+
+    mtime = os.stat(fileName).st_mtime_ns
+    cached = INPUT_CACHE.get(fileName)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, pd.read_csv(fileName))
+        INPUT_CACHE[fileName] = cached
+    return cached[1].copy()
+
+
+def get_lookup_table(fileName, builder, *builderArgs):
+    """Returns a lookup dict built from an input csv, only rebuilding it when
+    the csv is modified
+
+    Parameters:
+    fileName (string): The path of the csv the table is built from
+    builder (function): Takes the csv dataframe (and builderArgs) and returns
+    the lookup dict
+    builderArgs: Any extra arguments for builder
+
+    Returns:
+    table (dict): The lookup table"""
+    key = (fileName, builder.__name__) + builderArgs
+    mtime = os.stat(fileName).st_mtime_ns
+    cached = LOOKUP_CACHE.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, builder(read_input_csv(fileName), *builderArgs))
+        LOOKUP_CACHE[key] = cached
+    return cached[1]
+
+
+def preload_reference_data():
+    """Reads every /input/ csv and builds the lookup tables the output stage
+    uses into INPUT_CACHE and LOOKUP_CACHE. Workers forked afterwards share
+    these pages with the parent instead of each parsing the files again
+
+    Returns: N/A"""
+    relDir = os.path.dirname(__file__)
+    inputDir = relDir + "/input/"
+    for fileName in sorted(os.listdir(inputDir)):
+        if fileName.endswith(".csv"):
+            read_input_csv(inputDir + fileName)
+    if os.path.exists(inputDir + "playerUrls.csv"):
+        get_lookup_table(inputDir + "playerUrls.csv", build_player_link_dict)
+    if os.path.exists(inputDir + "nameTranslations.csv"):
+        get_lookup_table(
+            inputDir + "nameTranslations.csv", build_translation_dict
+        )
+    if os.path.exists(inputDir + "teams.csv"):
+        for mode in ["Full", "Abb"]:
+            get_lookup_table(
+                inputDir + "teams.csv", build_team_link_dict, mode
+            )
+
+
+def regenerate_suffix(
+    statsDir, year, suffix, intervalWorkers, skipUnchanged, writeCube
+):
+    """Organizes one suffix's raw stat file and writes its alt and final
+    files (a regenerate_suffixes() worker)
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    year (string): The stat year
+    suffix (string): Any STAT_SUFFIXES suffix
+    intervalWorkers (int): Processes used for bootstrap intervals (None
+    leaves them out)
+    skipUnchanged (bool): Leave final/alt files whose contents didn't change
+    untouched
+    writeCube (bool): Also write the rollup cube file
+
+    Returns:
+    rebuilt (list - string): "[suffix] [stage]" of every rebuilt stage"""
+    cache = StatCache(statsDir, intervalWorkers, skipUnchanged, writeCube)
+    rebuilt = cache.regenerate(year, (suffix,))
+    return rebuilt
+
+
+def regenerate_suffixes(
+    statsDir,
+    year,
+    suffixes,
+    jobs=1,
+    intervalWorkers=None,
+    skipUnchanged=False,
+    writeCube=False,
+):
+    """Organizes and outputs every requested suffix of a year that has a raw
+    stat file. With more than one job the suffixes run in a process pool,
+    forked after the reference data is preloaded so workers share it
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    year (string): The stat year
+    suffixes (list - string): STAT_SUFFIXES suffixes to regenerate
+    jobs (int): Worker processes (1 runs the suffixes in this process)
+    intervalWorkers (int): Processes used for bootstrap intervals (default
+    None leaves them out)
+    skipUnchanged (bool): Leave final/alt files whose contents didn't change
+    untouched
+    writeCube (bool): Also write the rollup cube files (default False)
+
+    Returns:
+    rebuilt (list - string): "[suffix] [stage]" of every rebuilt stage"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    yearDir = os.path.join(statsDir, year)
+    found = []
+    for suffix in suffixes:
+        rawFile = os.path.join(yearDir, year + "StatsRaw" + suffix + ".csv")
+        if os.path.exists(rawFile):
+            found.append(suffix)
+        else:
+            print("No " + rawFile + " to organize, skipping " + suffix)
+    if jobs <= 1 or len(found) <= 1:
+        cache = StatCache(
+            statsDir, intervalWorkers, skipUnchanged, writeCube
+        )
+        return cache.regenerate(year, found)
+
+    preload_reference_data()
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    workerCount = min(jobs, len(found))
+    with ProcessPoolExecutor(workerCount, mp_context=context) as executor:
+        results = executor.map(
+            regenerate_suffix,
+            [statsDir] * len(found),
+            [year] * len(found),
+            found,
+            [intervalWorkers] * len(found),
+            [skipUnchanged] * len(found),
+            [writeCube] * len(found),
+        )
+        rebuilt = [stage for result in results for stage in result]
+    return rebuilt
+
+
+def build_html(row):
+    """Insert the link and text in a <a> tag, returns the tag as a string"""
+    htmlLine = "<a href=" "{0}" ">{1}</a>".format(row["Link"], row.iloc[0])
+    return htmlLine
+
+
+def get_row_keys(df, keyCols):
+    """Builds the row keys of a final file: the key columns plus each key's
+    occurrence number ("#") so repeated keys stay unique
+
+    Parameters:
+    df (pandas dataframe): A final file read as strings
+    keyCols (list - string): The columns that identify a row
+
+    Returns:
+    keys (pandas MultiIndex): One key per row of df"""
+    import pandas as pd
+
+    keys = df[keyCols].copy()
+    keys["#"] = keys.groupby(keyCols).cumcount()
+    return pd.MultiIndex.from_frame(keys)
+
+
+def get_key_list(key):
+    """Converts a get_row_keys() key to a JSON ready list (occurrence
+    numbers come back as numpy ints)"""
+    return list(key[:-1]) + [int(key[-1])]
+
+
+def diff_final_frames(oldDf, newDf, keyCols):
+    """Compares two versions of a final file row by row
+
+    Parameters:
+    oldDf (pandas dataframe): The previous file read as strings (None if
+    there was no previous file)
+    newDf (pandas dataframe): The new file read as strings
+    keyCols (list - string): The columns that identify a row. Repeated keys
+    are told apart by their occurrence number
+
+    Returns:
+    changes (dict): "columns" of the new file, "added" rows (every column),
+    "removed" keys, "changed" [key, {column: new value}] pairs and
+    "removedColumns" """
+    import numpy as np
+
+    new = newDf.set_index(get_row_keys(newDf, keyCols))
+    if oldDf is None:
+        old = new.iloc[0:0]
+        removedCols = []
+    else:
+        old = oldDf.set_index(get_row_keys(oldDf, keyCols))
+        removedCols = [col for col in old.columns if col not in new.columns]
+        # New columns count as changed cells
+        old = old.reindex(columns=new.columns, fill_value="")
+    added = new.index.difference(old.index, sort=False)
+    removed = old.index.difference(new.index, sort=False)
+    common = new.index.intersection(old.index, sort=False)
+    newCommon = new.loc[common]
+    diff = (newCommon != old.loc[common]).to_numpy()
+    changed = {}
+    for row, col in zip(*np.nonzero(diff)):
+        key = common[row]
+        changed.setdefault(key, {})[new.columns[col]] = newCommon.iat[row, col]
+    changes = {
+        "columns": list(new.columns),
+        "key": keyCols + ["#"],
+        "added": new.loc[added].values.tolist(),
+        "removed": [get_key_list(key) for key in removed],
+        "changed": [
+            [get_key_list(key), values] for key, values in changed.items()
+        ],
+        "removedColumns": removedCols,
+    }
+    return changes
+
+
+def write_final_file(finalDf, finalFile, keyCols, changeDir, skipUnchanged):
+    """Writes a final file and a changeset against the previous run's file
+    (changes/[file name].json) so publishing can push only the rows that
+    changed
+
+    Parameters:
+    finalDf (pandas dataframe): The final stats to write
+    finalFile (string): The final csv's path
+    keyCols (list - string): The columns that identify a row
+    changeDir (string): The directory changesets are written to
+    skipUnchanged (bool): Leave the file untouched if its contents are the
+    same
+
+    Returns:
+    written (bool): Whether the final file was written"""
+    import hashlib
+    import io
+    import json
+    import pandas as pd
+
+    newText = finalDf.to_csv(index=False)
+    oldText = None
+    oldDf = None
+    if os.path.exists(finalFile):
+        with open(finalFile, newline="", encoding="utf-8") as finalIn:
+            oldText = finalIn.read()
+        if oldText != newText:
+            oldDf = pd.read_csv(
+                io.StringIO(oldText), dtype=str, keep_default_na=False
+            )
+    if oldText == newText:
+        changes = {
+            "columns": list(finalDf.columns),
+            "key": keyCols + ["#"],
+            "added": [],
+            "removed": [],
+            "changed": [],
+            "removedColumns": [],
+        }
+    else:
+        newDf = pd.read_csv(
+            io.StringIO(newText), dtype=str, keep_default_na=False
+        )
+        changes = diff_final_frames(oldDf, newDf, keyCols)
+    # Hashes let a publisher check a changeset applies to what it has
+    changes["file"] = os.path.basename(finalFile)
+    changes["baseHash"] = None
+    if oldText is not None:
+        changes["baseHash"] = hashlib.sha256(oldText.encode()).hexdigest()
+    changes["hash"] = hashlib.sha256(newText.encode()).hexdigest()
+    if not (os.path.exists(changeDir)):
+        os.mkdir(changeDir)
+    changeFile = os.path.join(
+        changeDir, os.path.splitext(os.path.basename(finalFile))[0] + ".json"
+    )
+    with open(changeFile, "w", encoding="utf-8") as changeOut:
+        json.dump(
+            changes, changeOut, ensure_ascii=False, separators=(",", ":")
+        )
+
+    if skipUnchanged and oldText == newText:
+        return False
+    with open(finalFile, "w", newline="", encoding="utf-8") as finalOut:
+        finalOut.write(newText)
+    return True
+
+
+def write_output_text(fileName, text, skipUnchanged):
+    """Writes a text output, leaving it untouched if skipUnchanged is set
+    and its contents are the same
+
+    Returns:
+    written (bool): Whether the file was written"""
+    if skipUnchanged and os.path.exists(fileName):
+        with open(fileName, encoding="utf-8") as textIn:
+            if textIn.read() == text:
+                return False
+    with open(fileName, "w", encoding="utf-8") as textOut:
+        textOut.write(text)
+    return True
+
+
+def make_zip(yearDir, year):
+    """Groups a year's farm and npb directories in to a single zip for
+    uploading/sending
+
+    Parameters:
+    yearDir (string): The directory that stores the raw, scraped NPB stats
+    year (string): The year of npb stats to group together
+
+    Returns: N/A"""
+    import shutil
+    import tempfile
+
+    # Nothing to rezip if no upload file changed since the last zip
+    outputFilename = yearDir + "/" + year + "upload"
+    npbDir = yearDir + "/npb"
+    if os.path.exists(outputFilename + ".zip"):
+        zipTime = os.stat(outputFilename + ".zip").st_mtime_ns
+        fileTimes = [
+            os.stat(os.path.join(npbDir, name)).st_mtime_ns
+            for name in os.listdir(npbDir)
+        ]
+        if max(fileTimes, default=0) <= zipTime:
+            print("Upload zip is unchanged: " + outputFilename + ".zip")
+            return
+    tempDir = os.path.join(yearDir, "/stats/temp")
+    tempDir = tempfile.mkdtemp()
+    # Gather relevant dir to put into temp
+    shutil.copytree(
+        yearDir + "/npb", tempDir + "/stats/npb", dirs_exist_ok=True
+    )
+    # Create upload zip
+    dirName = tempDir
+    shutil.make_archive(outputFilename, "zip", dirName)
+    shutil.rmtree(tempDir)
+    # Output name of upload zip
+    print("Upload zip can be found at: " + outputFilename + ".zip")
+
+
+def run_daemon(statsDir, socketPath):
+    """Serves regenerate, scrape and query commands over a Unix socket while
+    keeping reference data and organized stats in memory between commands.
+    Each request and response is a single line of JSON
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    socketPath (string): The Unix socket to listen on
+
+    Returns: N/A"""
+    import json
+    import socketserver
+
+    cache = StatCache(statsDir)
+    # Warm the cache with every year that has raw stat files
+    for year in sorted(os.listdir(statsDir)):
+        for suffix in STAT_SUFFIXES:
+            rawFile = os.path.join(
+                statsDir, year, year + "StatsRaw" + suffix + ".csv"
+            )
+            if os.path.exists(rawFile):
+                cache.load(year, suffix)
+
+    class DaemonHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = run_daemon_command(cache, request)
+                except Exception as ex:
+                    # Bad commands shouldn't take the daemon down
+                    response = {"ok": False, "error": repr(ex)}
+                self.wfile.write(
+                    (json.dumps(response, default=str) + "\n").encode()
                 )
-            if yearTitleStr.find("年度 東北楽天ゴールデンイーグルス"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 東北楽天ゴールデンイーグルス", "Rakuten Eagles"
+                if request.get("cmd") == "shutdown":
+                    self.server.running = False
+
+    if os.path.exists(socketPath):
+        os.remove(socketPath)
+    server = socketserver.UnixStreamServer(socketPath, DaemonHandler)
+    server.running = True
+    print("Daemon listening on: " + socketPath)
+    try:
+        while server.running:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socketPath)
+    print("Daemon stopped")
+
+
+def run_daemon_command(cache, request):
+    """Runs a single daemon command against the stat cache
+
+    Parameters:
+    cache (StatCache): The daemon's stat cache
+    request (dict): The command, "cmd" is one of regenerate, scrape, query,
+    status or shutdown. Other keys: "year", "suffix", "table", "player",
+    "team"
+
+    Returns:
+    response (dict): "ok" plus the command's results"""
+    cmd = request.get("cmd")
+    if cmd == "status":
+        loaded = sorted(year + suffix for year, suffix in cache.entries)
+        return {"ok": True, "loaded": loaded}
+    if cmd == "shutdown":
+        return {"ok": True}
+    if cmd not in ["regenerate", "scrape", "query"]:
+        return {"ok": False, "error": "Unknown command: " + str(cmd)}
+
+    # Same bounds as get_scrape_year(), without exiting the daemon
+    year = str(request.get("year"))
+    if not year.isdigit() or not (2020 <= int(year) <= datetime.now().year):
+        return {
+            "ok": False,
+            "error": "A year between 2020-"
+            + str(datetime.now().year)
+            + " is required",
+        }
+    suffixes = ["BP", "PP"]
+    if "suffix" in request:
+        if request["suffix"] not in STAT_SUFFIXES:
+            return {
+                "ok": False,
+                "error": "Unknown suffix: " + str(request["suffix"]),
+            }
+        suffixes = [request["suffix"]]
+    yearDir = os.path.join(cache.statsDir, year)
+    if cmd == "scrape":
+        if not (os.path.exists(yearDir)):
+            os.mkdir(yearDir)
+        for suffix in suffixes:
+            get_playoff_stats(yearDir, suffix, year)
+    if cmd in ["regenerate", "scrape"]:
+        rebuilt = cache.regenerate(year, suffixes)
+        return {"ok": True, "rebuilt": rebuilt}
+    rows = cache.query(
+        year,
+        request.get("suffix", "BP"),
+        request.get("table", "player"),
+        request.get("player"),
+        request.get("team"),
+    )
+    return {"ok": True, "rows": rows}
+
+
+def get_watch_files(statsDir):
+    """Lists the files watch mode checks: the WATCH_INPUTS files and every
+    year's raw stat files
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+
+    Returns:
+    watchFiles (dict): File paths mapped to their mtimes (None if missing)"""
+    relDir = os.path.dirname(__file__)
+    fileList = [relDir + "/input/" + name for name in WATCH_INPUTS]
+    for year in sorted(os.listdir(statsDir)):
+        for suffix in STAT_SUFFIXES:
+            rawFile = os.path.join(
+                statsDir, year, year + "StatsRaw" + suffix + ".csv"
+            )
+            if os.path.exists(rawFile):
+                fileList.append(rawFile)
+    watchFiles = {}
+    for fileName in fileList:
+        if os.path.exists(fileName):
+            watchFiles[fileName] = os.stat(fileName).st_mtime_ns
+        else:
+            watchFiles[fileName] = None
+    return watchFiles
+
+
+def get_raw_stat_years(watchFiles):
+    """Returns the sorted years that have post season raw stat files among
+    the watched files (see get_watch_files())"""
+    rawSuffixes = get_raw_stat_suffixes(watchFiles)
+    years = [
+        year
+        for year, suffixes in rawSuffixes.items()
+        if "BP" in suffixes or "PP" in suffixes
+    ]
+    return sorted(years)
+
+
+def get_raw_stat_suffixes(watchFiles):
+    """Returns the years that have raw stat files among the watched files
+    (see get_watch_files()) mapped to the sorted suffixes of those files"""
+    rawSuffixes = {}
+    for fileName in sorted(watchFiles):
+        if "StatsRaw" in fileName:
+            baseName = os.path.basename(fileName)
+            rawSuffixes.setdefault(baseName[:4], []).append(baseName[-6:-4])
+    return rawSuffixes
+
+
+def get_year_rows(fileName):
+    """Groups an input csv's rows by its Year column so edits can be traced
+    to the years they affect
+
+    Parameters:
+    fileName (string): A csv with a Year column
+
+    Returns:
+    yearRows (dict): Year strings mapped to a frozenset of that year's rows"""
+    if not (os.path.exists(fileName)):
+        return {}
+    df = read_input_csv(fileName)
+    yearRows = {}
+    for year, yearDf in df.groupby(df["Year"].astype(str)):
+        yearRows[year] = frozenset(yearDf.astype(str).itertuples(index=False))
+    return yearRows
+
+
+def plan_watch_rebuild(changedFiles, oldYearRows, rawSuffixes):
+    """Maps a batch of edited files to the (year, suffix) stages to rebuild
+
+    Parameters:
+    changedFiles (list - string): Paths of the edited files
+    oldYearRows (dict): File names mapped to get_year_rows() results from
+    before the edits, updated in place with the new rows
+    rawSuffixes (dict): Every year that has raw stat files mapped to their
+    suffixes (see get_raw_stat_suffixes())
+
+    Returns:
+    plan (dict): (year, suffix) keys mapped to sets of stages to rebuild"""
+    plan = {}
+    for fileName in changedFiles:
+        baseName = os.path.basename(fileName)
+        if baseName in WATCH_INPUTS:
+            watchInfo = WATCH_INPUTS[baseName]
+            affectedYears = list(rawSuffixes)
+            if watchInfo["byYear"]:
+                newRows = get_year_rows(fileName)
+                oldRows = oldYearRows.get(baseName, {})
+                affectedYears = [
+                    year
+                    for year in rawSuffixes
+                    if oldRows.get(year) != newRows.get(year)
+                ]
+                oldYearRows[baseName] = newRows
+            for year in affectedYears:
+                for suffix in rawSuffixes[year]:
+                    if get_stat_type(suffix) not in watchInfo["statTypes"]:
+                        continue
+                    plan.setdefault((year, suffix), set()).update(
+                        watchInfo["stages"]
+                    )
+        else:
+            # Raw stat file: "[year]StatsRaw[suffix].csv"
+            year = baseName[:4]
+            suffix = baseName[-6:-4]
+            plan.setdefault((year, suffix), set()).add("org")
+    return plan
+
+
+def run_watch(statsDir, interval, debounce):
+    """Watches the input and raw stat files and rebuilds only the alt/npb
+    outputs that depend on edited files. Bursts of edits are debounced into
+    a single rebuild. A rebuild that fails (a half saved or malformed file)
+    is reported and tried again with the next batch of edits
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    interval (float): Seconds between file checks
+    debounce (float): Seconds to wait after the latest edit before rebuilding
+
+    Returns: N/A"""
+    from time import monotonic
+
+    cache = StatCache(statsDir)
+    watchFiles = get_watch_files(statsDir)
+    # Existing outputs are assumed current, only edits from now on count
+    for fileName in watchFiles:
+        if "StatsRaw" in fileName:
+            baseName = os.path.basename(fileName)
+            cache.load(baseName[:4], baseName[-6:-4])
+    cache.mark_current()
+    relDir = os.path.dirname(__file__)
+    oldYearRows = {}
+    for baseName, watchInfo in WATCH_INPUTS.items():
+        if watchInfo["byYear"]:
+            oldYearRows[baseName] = get_year_rows(
+                relDir + "/input/" + baseName
+            )
+    print(
+        "Watching " + str(len(watchFiles)) + " files (Ctrl+C to stop)..."
+    )
+
+    changedFiles = set()
+    lastEditTime = 0.0
+    # Edited files that couldn't be read and (year, suffix) stages whose
+    # rebuild failed, both retried after the next edit
+    unplannedFiles = set()
+    failedPlan = {}
+    try:
+        while True:
+            sleep(interval)
+            newWatchFiles = get_watch_files(statsDir)
+            for fileName, mtime in newWatchFiles.items():
+                if watchFiles.get(fileName) != mtime:
+                    changedFiles.add(fileName)
+                    lastEditTime = monotonic()
+            watchFiles = newWatchFiles
+            if not changedFiles or monotonic() - lastEditTime < debounce:
+                continue
+
+            for fileName in sorted(changedFiles):
+                print("Changed: " + fileName)
+            batchFiles = changedFiles | unplannedFiles
+            changedFiles = set()
+            rawSuffixes = get_raw_stat_suffixes(watchFiles)
+            # Year rows are only kept once the whole batch could be planned
+            newYearRows = dict(oldYearRows)
+            try:
+                plan = plan_watch_rebuild(
+                    sorted(batchFiles), newYearRows, rawSuffixes
                 )
-            if yearTitleStr.find("年度 東京ヤクルトスワローズ"):
-                yearTitleStr = yearTitleStr.replace(
-                    "年度 東京ヤクルトスワローズ", "Yakult Swallows"
+            except Exception as ex:
+                unplannedFiles = batchFiles
+                print(
+                    "Could not read the edited files, retrying after the "
+                    "next edit: " + repr(ex)
                 )
-            yearTitleStr = yearTitleStr.lstrip()
-            yearTitleStr = yearTitleStr.rstrip()
-            # Append as last entry and move to next row
-            outputFile.write(yearTitleStr + ",\n")
+                continue
+            oldYearRows = newYearRows
+            unplannedFiles = set()
+            for key, stages in failedPlan.items():
+                plan.setdefault(key, set()).update(stages)
+            failedPlan = {}
+            for (year, suffix), stages in sorted(plan.items()):
+                try:
+                    rebuilt = cache.regenerate(year, (suffix,), sorted(stages))
+                except Exception as ex:
+                    # Bad intermediate edits shouldn't stop watching
+                    failedPlan[(year, suffix)] = stages
+                    print(
+                        year
+                        + suffix
+                        + " rebuild failed, retrying after the next edit: "
+                        + repr(ex)
+                    )
+                    continue
+                print(year + " rebuilt: " + ", ".join(rebuilt))
+            if not plan:
+                print("No outputs affected")
+            cache.mark_current()
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def run_warehouse(statsDir, args):
+    """Warehouse mode: loads seasons into the SQLite warehouse or answers
+    player/team history queries from it
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed warehouse arguments
+
+    Returns: N/A"""
+    warehouse = Warehouse(os.path.join(statsDir, "npbPostseason.db"))
+    if args.action == "load":
+        cache = StatCache(statsDir)
+        years = args.years
+        if not years:
+            years = get_raw_stat_years(get_watch_files(statsDir))
+        for year in years:
+            loaded = warehouse.load_season(cache, year, args.force)
+            if loaded:
+                print(year + " loaded: " + ", ".join(loaded))
+            else:
+                print(year + " unchanged, skipped")
+        print("Warehouse stored in: " + warehouse.dbFile)
+    elif args.name is None:
+        print("A player or team name is required for " + args.action)
+    else:
+        if args.action == "player":
+            df = warehouse.player_history(args.name, args.suffix)
+        elif args.action == "team":
+            df = warehouse.team_history(args.name, args.suffix)
+        else:
+            df = warehouse.player_totals(args.name)
+        print(df.to_string(index=False))
+        print("Query took {0:.1f} ms".format(warehouse.lastQueryMs))
+    warehouse.close()
+
+
+def run_career(statsDir, args):
+    """Career mode: brings the warehouse up to date (only changed seasons are
+    reloaded), merges the requested seasons and writes a career leaderboard
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed career arguments
+
+    Returns: N/A"""
+    warehouse = Warehouse(os.path.join(statsDir, "npbPostseason.db"))
+    cache = StatCache(statsDir)
+    for year in get_raw_stat_years(get_watch_files(statsDir)):
+        warehouse.load_season(cache, year)
+    df = warehouse.career_stats(args.suffix, args.by, args.years)
+    warehouse.close()
+
+    sortCol = args.sort
+    if sortCol is None:
+        sortCol = "OPS+" if args.suffix == "BP" else "ERA+"
+    minCol = "PA" if args.suffix == "BP" else "IP"
+    df = df[df[minCol] >= args.min]
+    # Lower is better for ERA style stats
+    ascending = sortCol in ["ERA", "FIP", "kwERA", "WHIP", "FIP-", "kwERA-"]
+    df = df.sort_values(sortCol, ascending=ascending)
+
+    careerDir = os.path.join(statsDir, "career")
+    if not (os.path.exists(careerDir)):
+        os.mkdir(careerDir)
+    careerFile = (
+        careerDir + "/Career" + args.by.capitalize() + args.suffix + ".csv"
+    )
+    df.to_csv(careerFile, index=False)
+    print(df.head(args.top).to_string(index=False))
+    print("The career leaderboard will be stored in: " + careerFile)
+
+
+def run_leaders(statsDir, args):
+    """Leaders mode: writes the leaderboards of the requested years
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed leaders arguments
+
+    Returns: N/A"""
+    years = args.years
+    if not years:
+        years = get_raw_stat_years(get_watch_files(statsDir))
+    cache = StatCache(statsDir)
+    for year in years:
+        leaderFiles = cache.output_leaders(year, args.top)
+        print(
+            str(len(leaderFiles))
+            + " "
+            + year
+            + " leaderboards will be stored in: "
+            + os.path.join(statsDir, year, "leaders")
+        )
+
+
+def run_rankings(statsDir, args):
+    """Rankings mode: brings the ranking indexes up to date (only new or
+    changed seasons are merged in) and writes percentile and z-score columns
+    for the requested years to stats/[year]/[year]Rankings[BP|PP].csv
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed rankings arguments
+
+    Returns: N/A"""
+    cache = StatCache(statsDir)
+    indexYears = get_raw_stat_years(get_watch_files(statsDir))
+    years = args.years
+    if not years:
+        years = indexYears
+    rankingDir = os.path.join(statsDir, "rankings")
+    if not (os.path.exists(rankingDir)):
+        os.mkdir(rankingDir)
+    for suffix in ["BP", "PP"]:
+        index = RankingIndex(
+            os.path.join(rankingDir, "RankingIndex" + suffix + ".npz"), suffix
+        )
+        # Seasons whose raw stats are gone leave the population
+        for year in [year for year in index.seasons if year not in indexYears]:
+            index.remove_season(year)
+        for year in indexYears:
+            stamp = str(
+                cache.get_stamp("org", year, suffix)
+                + cache.get_stamp("playerOut", year, suffix)
+            )
+            # Unchanged seasons are skipped before their stats are loaded
+            if index.seasons.get(year, (None,))[0] == stamp:
+                continue
+            df, qualified = cache.get_ranking_stats(year, suffix)
+            index.add_season(year, stamp, df, qualified)
+            print(year + " " + suffix + " added to the ranking index")
+        index.save()
+        for year in years:
+            if year not in index.seasons:
+                print("No " + year + " stats to rank")
+                continue
+            df, qualified = cache.get_ranking_stats(year, suffix)
+            rankDf = index.rank(df, qualified)
+            rankDf = df[["PlayerID", "Name", "Team"]].join(rankDf)
+            rankFile = os.path.join(
+                statsDir, year, year + "Rankings" + suffix + ".csv"
+            )
+            rankDf.to_csv(rankFile, index=False)
+        sizes = [len(values) for values in index.population.values()]
+        print(
+            suffix
+            + " ranking population: "
+            + str(max(sizes, default=0))
+            + " player seasons"
+        )
+    print("Rankings will be stored in each year's directory")
+
+
+def split_html_links(df):
+    """Splits the <a> tags of EXPORT_LINK_COLS into the plain name and a
+    "[col]Link" column after it (None if the cell has no link)
+
+    Parameters:
+    df (pandas dataframe): A final (HTML name) stat dataframe
+
+    Returns:
+    df (pandas dataframe): The dataframe with plain names and link columns"""
+    for col in EXPORT_LINK_COLS:
+        if col not in df.columns:
+            continue
+        parts = df[col].astype(str).str.extract(r"^<a href=([^>]*)>(.*)</a>$")
+        df[col] = parts[1].fillna(df[col])
+        df.insert(
+            df.columns.get_loc(col) + 1,
+            col + "Link",
+            parts[0].astype(object).where(parts[0].notna(), None),
+        )
+    return df
+
 
-        # Close request
-        r.close()
-        # Pace requests to npb.jp to avoid excessive requests
-        sleep(randint(3, 5))
-    # After all URLs are scraped, close output file
-    outputFile.close()
+def get_export_payloads(df, year, table):
+    """Builds a table's JSON document and NDJSON rows with typed values
+    (numbers stay numbers, percentages become fractions, blanks are null)
 
+    Parameters:
+    df (pandas dataframe): A final stat csv read as strings
+    year (string): The stat year
+    table (string): The EXPORT_TABLES table name
 
-def get_stat_urls(suffix, year):
-    """Creates arrays of the correct URLs for the individual stat scraping
+    Returns:
+    jsonData (bytes): {"year", "table", "columns", "rows"} as JSON
+    ndjsonData (bytes): One JSON row object per line"""
+    import json
+
+    df = df.drop(columns=EXPORT_DROP_COLS, errors="ignore")
+    df = convert_stats_to_numeric(df)
+    df = split_html_links(df)
+    for col in df.select_dtypes("float").columns:
+        # Counting stats are written as "6.0" in some final files
+        if (df[col].dropna() % 1 == 0).all():
+            df[col] = df[col].astype("Int64")
+        else:
+            # Percent conversion leaves float noise (10.6% -> 0.106 + 2e-17)
+            df[col] = df[col].round(6)
+    columns = [
+        {
+            "name": col,
+            "type": "string" if df[col].dtype == object else "number",
+        }
+        for col in df.columns
+    ]
+    df = df.astype(object).where(df.notna() & (df != ""), None)
+    rows = df.to_dict("records")
+    jsonData = json.dumps(
+        {"year": int(year), "table": table, "columns": columns, "rows": rows},
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode()
+    ndjsonData = "".join(
+        json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+    return jsonData, ndjsonData
+
+
+def write_export_file(fileName, data, oldEntry):
+    """Writes an export file with its gzip and (if the brotli module is
+    installed) brotli copies, unless the stored ETag shows it is unchanged.
+    Unchanged files keep their bytes and mtimes so caches keep hitting
 
     Parameters:
-    suffix (string): The desired mode to run in (either farm or regular season)
-    year (string): The desired npb year to scrape
+    fileName (string): The uncompressed file's path
+    data (bytes): The file contents
+    oldEntry (dict): The file's previous manifest entry (or None)
 
     Returns:
-    urlArrBaseB (array - string): Contains URLs to the team batting/pitching
-    stat pages"""
-    # Drop entries with incorrect year and suffix
-    # Check for the player link file, if nothing is there tell user and return
-    relDir = os.path.dirname(__file__)
-    playoffUrlFile = relDir + "/input/playoffUrls.csv"
-    if not (os.path.exists(playoffUrlFile)):
-        print(
-            "\nERROR: No playoff URL file found, no links to scrape...\n"
-            "Provide a valid playoffUrls.csv file in the /input/ directory to "
-            "fix this.\n"
+    entry (dict): The file's manifest entry (ETag, sizes, written)"""
+    import gzip
+    import hashlib
+
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    etag = '"' + hashlib.sha256(data).hexdigest() + '"'
+    encodings = {"gzip": fileName + ".gz"}
+    if brotli is not None:
+        encodings["br"] = fileName + ".br"
+    current = (
+        oldEntry is not None
+        and oldEntry["etag"] == etag
+        and set(oldEntry["encodings"]) == set(encodings)
+        and all(
+            os.path.exists(path)
+            for path in [fileName] + list(encodings.values())
         )
-        urlArrBase = np.nan
-        return urlArrBase
+    )
+    if current:
+        entry = dict(oldEntry)
+        entry["written"] = False
+        return entry
+
+    compressed = {
+        # mtime=0 keeps the gzip bytes identical for identical data
+        "gzip": gzip.compress(data, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        compressed["br"] = brotli.compress(data, quality=11)
+    for path, fileData in [(fileName, data)] + [
+        (encodings[name], compressed[name]) for name in encodings
+    ]:
+        with open(path, "wb") as exportFile:
+            exportFile.write(fileData)
+    entry = {
+        "etag": etag,
+        "bytes": len(data),
+        "encodings": {name: len(compressed[name]) for name in encodings},
+        "written": True,
+    }
+    return entry
+
+
+def run_export(statsDir, args):
+    """Export mode: writes every EXPORT_TABLES table of the requested years
+    to stats/api/[year]/ as JSON and NDJSON (plus .gz/.br copies) and lists
+    them with their ETags in stats/api/manifest.json. Files whose contents
+    didn't change are left untouched
 
-    urlDf = pd.read_csv(playoffUrlFile)
-    # Drop all rows that are not the df's year
-    urlDf = urlDf.drop(urlDf[urlDf.Year.astype(str) != year].index)
-    # Drop all rows that do not match the requested stats (batting/pitching)
-    urlDf = urlDf.drop(urlDf[urlDf.Suffix != suffix].index)
-    # Return URL arr for that year and stat type
-    urlArrBase = urlDf["Link"]
-    return urlArrBase
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed export arguments
+
+    Returns: N/A"""
+    import json
+    import pandas as pd
+
+    apiDir = os.path.join(statsDir, "api")
+    if not (os.path.exists(apiDir)):
+        os.mkdir(apiDir)
+    manifestFile = os.path.join(apiDir, "manifest.json")
+    manifest = {"version": EXPORT_VERSION, "files": {}}
+    if os.path.exists(manifestFile):
+        with open(manifestFile) as manifestIn:
+            oldManifest = json.load(manifestIn)
+        # A new layout rewrites every file
+        if oldManifest.get("version") == EXPORT_VERSION:
+            manifest = oldManifest
+
+    years = args.years
+    if not years:
+        years = sorted(
+            year
+            for year in os.listdir(statsDir)
+            if os.path.isdir(os.path.join(statsDir, year, "npb"))
+        )
+    written = 0
+    for year in years:
+        npbDir = os.path.join(statsDir, year, "npb")
+        yearApiDir = os.path.join(apiDir, year)
+        if not (os.path.exists(yearApiDir)):
+            os.mkdir(yearApiDir)
+        for table in EXPORT_TABLES:
+            csvFile = os.path.join(npbDir, year + table + ".csv")
+            if not (os.path.exists(csvFile)):
+                continue
+            df = pd.read_csv(csvFile, dtype=str, keep_default_na=False)
+            payloads = get_export_payloads(df, year, table)
+            for ext, data in zip(["json", "ndjson"], payloads):
+                relName = year + "/" + table + "." + ext
+                entry = write_export_file(
+                    os.path.join(apiDir, relName),
+                    data,
+                    manifest["files"].get(relName),
+                )
+                written += entry.pop("written")
+                entry["rows"] = len(df)
+                entry["contentType"] = (
+                    "application/json"
+                    if ext == "json"
+                    else "application/x-ndjson"
+                )
+                manifest["files"][relName] = entry
 
+    manifestData = json.dumps(manifest, indent=1, sort_keys=True) + "\n"
+    oldManifestData = None
+    if os.path.exists(manifestFile):
+        with open(manifestFile) as manifestIn:
+            oldManifestData = manifestIn.read()
+    if manifestData != oldManifestData:
+        with open(manifestFile, "w") as manifestOut:
+            manifestOut.write(manifestData)
+    print(str(written) + " changed files exported")
+    print("The JSON API will be stored in: " + apiDir)
 
-def get_url(tryUrl):
-    """Attempts a GET request from the passed in URL
+
+def get_sort_indexes(df, suffix):
+    """Precomputes every column's ascending row order so pages sort by
+    lookup instead of comparing rows in the browser
 
     Parameters:
-    tryUrl (string): The URL to attempt opening
+    df (pandas dataframe): A site table (display strings, see
+    StatCache.get_site_tables())
+    suffix (string): "BP" or "PP"
 
     Returns:
-    response (Response): The URL's response"""
-    try:
-        print("Connecting to: " + tryUrl)
-        response = requests.get(tryUrl)
-        response.raise_for_status()
-    # Page doesn't exist (404 not found, 403 not authorized, etc)
-    except HTTPError as hp:
-        print(hp)
-    # Bad URL
-    except URLError as ue:
-        print(ue)
-    return response
+    sortIndexes (dict): Column names mapped to {"order": row indexes
+    ascending with blanks last, "valid": non blank rows, "first": "asc" or
+    "desc", the better first direction}"""
+    import numpy as np
+
+    numericDf = convert_stats_to_numeric(df.copy())
+    sortIndexes = {}
+    for col in df.columns:
+        if col.endswith("Link"):
+            continue
+        if numericDf[col].dtype == object:
+            values = df[col].str.casefold().to_numpy(dtype=str)
+            order = np.argsort(values, kind="stable")
+            valid = len(values)
+            first = "asc"
+        else:
+            values = numericDf[col].to_numpy(dtype=float)
+            # NaN sorts last
+            order = np.argsort(values, kind="stable")
+            valid = int((~np.isnan(values)).sum())
+            lowerBetter = LEADER_STATS[suffix].get(col, False)
+            first = "asc" if lowerBetter else "desc"
+        sortIndexes[col] = {
+            "order": order.tolist(),
+            "valid": valid,
+            "first": first,
+        }
+    return sortIndexes
 
 
-def make_raw_player_file(writeDir, suffix, year):
-    """Opens a file to hold all player stats inside a relative /stats/
-    directory that is created before calling this function
+def render_site_page(pageFile, title, df, suffix):
+    """Renders and writes one site page: a plain HTML table with the
+    table's sort indexes embedded for the sorting script
 
     Parameters:
-    writeDir (string): The directory that stores the scraped NPB stats
-    suffix (string): Indicates the raw stat file to create:
-    "BP" = post season batting stats
-    "PP" = post season pitching stats
-    year (string): The desired npb year to scrape
+    pageFile (string): The page's path
+    title (string): The page title
+    df (pandas dataframe): A site table (see StatCache.get_site_tables())
+    suffix (string): "BP" or "PP"
 
     Returns:
-    newFile (file stream object): An opened file in /stats/ named
-    "[Year][Stats][Suffix].csv"""
-    # Open and return the file object in write mode
-    newCsvName = writeDir + "/" + year + "StatsRaw" + suffix + ".csv"
-    if suffix == "BP":
-        print(
-            "Raw post season batting results will be stored in: " + newCsvName
-        )
-    if suffix == "PP":
-        print(
-            "Raw post season pitching results will be stored in: " + newCsvName
-        )
-    newFile = open(newCsvName, "w")
-    return newFile
+    pageFile (string): The written page's path"""
+    import html
+    import json
+
+    sortIndexes = get_sort_indexes(df, suffix)
+    cols = list(sortIndexes)
+    head = "".join(
+        '<th data-col="{0}">{0}</th>'.format(html.escape(col)) for col in cols
+    )
+    rows = []
+    for row in df.itertuples(index=False):
+        record = dict(zip(df.columns, row))
+        cells = []
+        for col in cols:
+            text = html.escape(record[col])
+            link = record.get(col + "Link")
+            if link is not None:
+                text = '<a href="{0}">{1}</a>'.format(html.escape(link), text)
+            cells.append("<td>" + text + "</td>")
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    page = SITE_TEMPLATE.format(
+        title=html.escape(title),
+        head=head,
+        rows="\n".join(rows),
+        # "</" can't appear inside the inline script
+        sort=json.dumps(sortIndexes, separators=(",", ":")).replace(
+            "</", "<\\/"
+        ),
+    )
+    with open(pageFile, "w", encoding="utf-8") as pageOut:
+        pageOut.write(page)
+    return pageFile
 
 
-def get_scrape_year(argsIn=None):
-    """Checks passed in arguments or gets user input for NPB stat year to
-    scrape
+def get_site_hash(title, df):
+    """Hashes a page's data (and SITE_VERSION) to tell if it needs
+    rendering again"""
+    import hashlib
+
+    pageHash = hashlib.sha256()
+    pageHash.update((str(SITE_VERSION) + title).encode())
+    pageHash.update(df.to_csv(index=False).encode())
+    return pageHash.hexdigest()
+
+
+def run_site(statsDir, args):
+    """Site mode: builds stats/site/ with one sortable page per season and
+    table plus an index page. Pages whose data hash is unchanged are
+    skipped, the rest are rendered across --workers processes
 
     Parameters:
-    argsIn (string): If a command line argument is given, the year is checked
-    for validity. Default (None) indicates to collect user input instead
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed site arguments
 
-    Returns:
-    argsIn (string): The desired npb stat year to scrape"""
-    # User input check
-    if argsIn is None:
-        # Infinite loop breaks when valid input obtained
-        # Either valid year or exit signal entered
-        while True:
-            argsIn = input(
-                "Enter a NPB year between 2020-"
-                + str(datetime.now().year)
-                + " or Q to quit: "
-            )
-            if argsIn == "Q":
-                sys.exit("Exiting...")
-            try:
-                argsIn = int(argsIn)
-            except ValueError:
-                print("Input must be a number (Example: 2024)")
+    Returns: N/A"""
+    import html
+    import json
+    from concurrent.futures import ProcessPoolExecutor
+
+    siteDir = os.path.join(statsDir, "site")
+    if not (os.path.exists(siteDir)):
+        os.mkdir(siteDir)
+    hashFile = os.path.join(siteDir, "siteHashes.json")
+    hashes = {}
+    if os.path.exists(hashFile):
+        with open(hashFile) as hashIn:
+            hashes = json.load(hashIn)
+
+    cache = StatCache(statsDir)
+    siteYears = get_raw_stat_years(get_watch_files(statsDir))
+    years = args.years
+    if not years:
+        years = siteYears
+    pages = []
+    for year in years:
+        yearSiteDir = os.path.join(siteDir, year)
+        if not (os.path.exists(yearSiteDir)):
+            os.mkdir(yearSiteDir)
+        for page, (suffix, df) in cache.get_site_tables(year).items():
+            relName = year + "/" + page.replace(" ", "") + ".html"
+            pageFile = os.path.join(siteDir, relName)
+            title = year + " NPB Post Season " + page
+            pageHash = get_site_hash(title, df)
+            stored = hashes.get(relName, {})
+            if stored.get("hash") == pageHash and os.path.exists(pageFile):
                 continue
-            # Bounds for scrapable years
-            # Min year on npb.jp = 2008, but scraping is only tested until 2020
-            if 2020 <= argsIn <= datetime.now().year:
-                print(str(argsIn) + " entered. Continuing...")
-                break
-            else:
-                print(
-                    "Please enter a valid year (2020-"
-                    + str(datetime.now().year)
-                    + ")."
-                )
-    # Argument check
+            pages.append((pageFile, title, df, suffix))
+            hashes[relName] = {"hash": pageHash, "title": title}
+
+    if args.workers > 1 and len(pages) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(render_site_page, *zip(*pages)))
     else:
-        try:
-            argsIn = int(argsIn)
-        except ValueError:
-            print("Year argument must be a number (Example: 2024)")
-            sys.exit("Exiting...")
-        # Bounds for scrapable years
-        # Min year on npb.jp is 2008, but scraping is only tested until 2020
-        if 2020 <= argsIn <= datetime.now().year:
-            pass
-        else:
-            print(
-                "Please enter a valid year (2020-"
-                + str(datetime.now().year)
-                + ")."
+        for pageArgs in pages:
+            render_site_page(*pageArgs)
+
+    # Index of every built page (pages of years not built this run too)
+    links = []
+    for relName in sorted(hashes, reverse=True):
+        links.append(
+            '<li><a href="{0}">{1}</a></li>'.format(
+                html.escape(relName),
+                html.escape(hashes[relName]["title"]),
             )
-            sys.exit("Exiting...")
+        )
+    indexPage = SITE_INDEX_TEMPLATE.format(links="\n".join(links))
+    with open(os.path.join(siteDir, "index.html"), "w") as indexOut:
+        indexOut.write(indexPage)
+    with open(hashFile, "w") as hashOut:
+        json.dump(hashes, hashOut, indent=1, sort_keys=True)
+    print(str(len(pages)) + " changed pages rendered")
+    print("The site will be stored in: " + siteDir)
+
+
+def get_final_key_cols(table):
+    """Returns the columns that identify a row of a final table
+    (EXPORT_TABLES name), the same keys its changesets use"""
+    if table.startswith("Team"):
+        return ["Team"]
+    if table.endswith("PP"):
+        return ["Pitcher", "Team"]
+    return ["Player", "Team"]
+
+
+def plan_table_publish(year, table, csvText, changes, lastHash):
+    """Plans the requests that bring a published table up to date. If the
+    year's changeset was made against the last published version only its
+    rows are sent, otherwise the whole table replaces the published one
 
-    # Return user input as a string
-    return str(argsIn)
+    Parameters:
+    year (string): The stat year
+    table (string): The EXPORT_TABLES table
+    csvText (string): The table's current final file
+    changes (dict): The table's latest changeset (see write_final_file()),
+    None if there isn't one
+    lastHash (string): The file hash of the last successful publish
 
+    Returns:
+    first (tuple): (method, path, body) sent before the others (None if
+    the table can be sent in any order)
+    batches (list - tuple): The remaining (method, path, body) requests"""
+    import io
+    import pandas as pd
+
+    path = "/tables/" + year + table
+    useChanges = (
+        changes is not None
+        and lastHash is not None
+        and changes["baseHash"] == lastHash
+        and not changes["removedColumns"]
+    )
+    if useChanges:
+        cols = changes["columns"]
+        entries = []
+        # Added rows carry every column, their keys are rebuilt like the
+        # changeset's
+        if changes["added"]:
+            addedDf = pd.DataFrame(changes["added"], columns=cols)
+            addedKeys = get_row_keys(addedDf, changes["key"][:-1])
+            entries += [
+                {"key": get_key_list(key), "values": dict(zip(cols, row))}
+                for key, row in zip(addedKeys, changes["added"])
+            ]
+        entries += [
+            {"key": key, "values": values}
+            for key, values in changes["changed"]
+        ]
+        deletes = changes["removed"]
+        batches = []
+        size = max(len(entries), len(deletes))
+        for start in range(0, size, PUBLISH_BATCH_ROWS):
+            body = {
+                "columns": cols,
+                "key": changes["key"],
+                "upsert": entries[start : start + PUBLISH_BATCH_ROWS],
+                "delete": deletes[start : start + PUBLISH_BATCH_ROWS],
+            }
+            batches.append(("POST", path + "/rows", body))
+        return None, batches
+
+    df = pd.read_csv(io.StringIO(csvText), dtype=str, keep_default_na=False)
+    keyCols = get_final_key_cols(table)
+    cols = list(df.columns)
+    entries = [
+        {"key": get_key_list(key), "values": dict(zip(cols, row))}
+        for key, row in zip(get_row_keys(df, keyCols), df.values.tolist())
+    ]
+    requestList = []
+    for start in range(0, max(len(entries), 1), PUBLISH_BATCH_ROWS):
+        body = {
+            "columns": cols,
+            "key": keyCols + ["#"],
+            "upsert": entries[start : start + PUBLISH_BATCH_ROWS],
+        }
+        # The first batch replaces the table, the rest add to it
+        method = "PUT" if start == 0 else "POST"
+        requestList.append(
+            (method, path if start == 0 else path + "/rows", body)
+        )
+    return requestList[0], requestList[1:]
 
-def get_user_choice(suffix):
-    """Gets user input for whether or not to undergo scraping and whether to
-    place relevant files in a zip
+
+def get_publish_session(workers, retries, user=None):
+    """Makes a requests session that pools a connection per worker and
+    retries throttled or failed requests with backoff
 
     Parameters:
-    suffix (string): Indicates the option being asked about (post season
-    scraping "P" or zip file creation "Z")
+    workers (int): Concurrent requests
+    retries (int): Retries of a failed request
+    user (string): Basic auth user (password from PUBLISH_PASSWORD_ENV)
 
     Returns:
-    userIn (string): Returns "Y" or "N" (if "Q" is chosen, program terminates)
-    """
-    # Loop ends for valid choice/exit
-    while True:
-        if suffix == "P":
-            print(
-                "Choose whether to pull new post season stats from "
-                "npb.jp or only reorganize existing stat files.\nWARNING: "
-                "EXISTING RAW STAT FILES MUST BE PRESENT TO SKIP SCRAPING."
-            )
-            userIn = input("Scrape post season stats? (Y/N): ")
-        elif suffix == "Z":
-            userIn = input(
-                "Output these stats in a zip file for manual "
-                "upload? (Y/N): "
-            )
+    session (requests Session): The publishing session"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=PUBLISH_BACKOFF_S,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # Every request upserts by key, so all of them are safe to repeat
+        allowed_methods=None,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=workers, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if user is not None:
+        session.auth = (user, os.environ.get(PUBLISH_PASSWORD_ENV, ""))
+    return session
 
-        if userIn == "Q":
-            sys.exit("Exiting...")
-        elif userIn == "Y":
-            print("Continuing...")
-            break
-        elif userIn == "N":
-            print("Skipping...")
-            break
-        else:
-            print(
-                "Invalid input - enter (Y/N) to determine whether to scrape "
-                "or (Q) to quit."
-            )
+
+def send_publish_request(session, endpoint, request):
+    """Sends one planned (method, path, body) request
+
+    Returns:
+    sentBytes (int): The size of the request body"""
+    import json
+
+    method, path, body = request
+    data = json.dumps(body, ensure_ascii=False).encode()
+    response = session.request(
+        method,
+        endpoint.rstrip("/") + path,
+        data=data,
+        headers={"Content-Type": "application/json"},
+        timeout=PUBLISH_TIMEOUT_S,
+    )
+    response.raise_for_status()
+    return len(data)
+
+
+def run_publish(statsDir, args):
+    """Publish mode: sends the tables of a year that changed since the last
+    successful publish to the endpoint (rows only when a changeset covers
+    the change), over pooled connections with at most --workers requests
+    at once. A table is only marked published once all of its requests
+    succeeded
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed publish arguments
+
+    Returns:
+    exitCode (int): 0 if every table was published, 1 otherwise"""
+    import hashlib
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    year = args.publishYear
+    yearDir = os.path.join(statsDir, year)
+    stateFile = os.path.join(yearDir, "publishState.json")
+    state = {}
+    if os.path.exists(stateFile):
+        with open(stateFile) as stateIn:
+            state = json.load(stateIn)
+    published = state.setdefault(args.endpoint, {})
+
+    plans = {}
+    for table in EXPORT_TABLES:
+        csvFile = os.path.join(yearDir, "npb", year + table + ".csv")
+        if not (os.path.exists(csvFile)):
             continue
-    return userIn
+        with open(csvFile, newline="", encoding="utf-8") as csvIn:
+            csvText = csvIn.read()
+        fileHash = hashlib.sha256(csvText.encode()).hexdigest()
+        if published.get(table) == fileHash:
+            continue
+        changes = None
+        changeFile = os.path.join(yearDir, "changes", year + table + ".json")
+        if os.path.exists(changeFile):
+            with open(changeFile, encoding="utf-8") as changeIn:
+                changes = json.load(changeIn)
+            # Only a changeset of the current file is usable
+            if changes["hash"] != fileHash:
+                changes = None
+        first, batches = plan_table_publish(
+            year, table, csvText, changes, published.get(table)
+        )
+        plans[table] = (fileHash, first, batches)
+
+    if args.dry_run:
+        for table, (fileHash, first, batches) in plans.items():
+            requestList = batches
+            if first is not None:
+                requestList = [first] + batches
+            for method, path, body in requestList:
+                print(
+                    method
+                    + " "
+                    + path
+                    + ": "
+                    + str(len(body["upsert"]))
+                    + " upserts, "
+                    + str(len(body.get("delete", [])))
+                    + " deletes"
+                )
+        return 0
+
+    session = get_publish_session(args.workers, args.retries, args.user)
+    failed = set()
+    sentBytes = 0
+    requestCount = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        # Table replacements go first, everything else can go in any order
+        for phase in ["first", "batches"]:
+            futures = []
+            for table, (fileHash, first, batches) in plans.items():
+                if table in failed:
+                    continue
+                requestList = batches
+                if phase == "first":
+                    requestList = [first] if first is not None else []
+                for request in requestList:
+                    future = executor.submit(
+                        send_publish_request, session, args.endpoint, request
+                    )
+                    futures.append((table, future))
+            for table, future in futures:
+                try:
+                    sentBytes += future.result()
+                    requestCount += 1
+                except Exception as error:
+                    print(table + " failed: " + str(error))
+                    failed.add(table)
+    session.close()
+
+    for table, (fileHash, first, batches) in plans.items():
+        if table not in failed:
+            published[table] = fileHash
+    with open(stateFile, "w") as stateOut:
+        json.dump(state, stateOut, indent=1)
+    print(
+        "Published "
+        + str(len(plans) - len(failed))
+        + " of "
+        + str(len(plans))
+        + " changed tables in "
+        + str(requestCount)
+        + " requests ("
+        + str(sentBytes)
+        + " bytes)"
+    )
+    return 1 if failed else 0
 
 
-def convert_ip_column_out(df):
-    """In baseball, IP stats are traditionally represented using .1 (single
-    inning pitched), .2 (2 innings pitched), and whole numbers. This function
-    converts the decimals FROM thirds (.33 -> .1, .66 -> .2) for sake of
-    presentation
+def run_publish_stub(port, failEvery=0):
+    """Publish stub mode: serves an in-memory stand-in of the tables API
+    that publish mode sends to (PUT /tables/[name] replaces a table, POST
+    /tables/[name]/rows upserts/deletes rows by key, GET /tables/[name]
+    returns the rows)
 
     Parameters:
-    df (pandas dataframe): A pitching stat dataframe with the "thirds"
-    representation
+    port (int): The localhost port to serve on
+    failEvery (int): Answer every Nth request with a 503 (0 never fails)
+
+    Returns: N/A"""
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    tables = {}
+    lock = threading.Lock()
+    counter = [0]
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def reply(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            name = self.path.strip("/").split("/")[-1]
+            with lock:
+                rows = [
+                    {"key": list(key), "values": values}
+                    for key, values in tables.get(name, {}).items()
+                ]
+            self.reply(200, {"table": name, "rows": rows})
+
+        def do_PUT(self):
+            self.update(replace=True)
+
+        def do_POST(self):
+            self.update(replace=False)
+
+        def update(self, replace):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+            parts = self.path.strip("/").split("/")
+            with lock:
+                counter[0] += 1
+                if failEvery and counter[0] % failEvery == 0:
+                    self.reply(503, {"error": "stub failure"})
+                    return
+                rows = tables.setdefault(parts[1], {})
+                if replace:
+                    rows.clear()
+                for entry in body.get("upsert", []):
+                    rows.setdefault(tuple(entry["key"]), {}).update(
+                        entry["values"]
+                    )
+                for key in body.get("delete", []):
+                    rows.pop(tuple(key), None)
+                size = len(rows)
+            self.reply(200, {"table": parts[1], "rows": size})
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    print("Stub tables API at: http://127.0.0.1:" + str(port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+def run_reparse(statsDir, args):
+    """Reparse mode: rebuilds the raw stat files of every requested year
+    (each suffix playoffUrls.csv has links for) from the page archive across
+    a process pool, so parsing changes can be applied without scraping npb.jp
+    again
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed reparse arguments
 
     Returns:
-    tempDf['IP'] (pandas dataframe column): An IP column converted back to the
-    original IP representation"""
-    # IP ".0 .1 .2" fix
-    tempDf = pd.DataFrame(df["IP"])
-    # Get the ".0 .3 .7" in the 'IP' column
-    ipDecimals = tempDf["IP"] % 1
-    # Make the original 'IP' column whole numbers
-    tempDf["IP"] = tempDf["IP"] - ipDecimals
-    # Convert IP decimals to thirds and re-add them to the whole numbers
-    ipDecimals = (ipDecimals / 0.3333333333) / 10
-    df["IP"] = tempDf["IP"] + ipDecimals
-    # Entries with .3 are invalid: add 1 and remove the decimals
-    x = tempDf["IP"] + ipDecimals
-    condlist = [((x % 1) < 0.29), ((x % 1) >= 0.29)]
-    choicelist = [x, (x - (x % 1)) + 1]
-    tempDf["IP"] = np.select(condlist, choicelist)
-    tempDf["IP"] = tempDf["IP"].apply("{:.1f}".format)
-    tempDf["IP"] = tempDf["IP"].astype(float)
-    return tempDf["IP"]
+    exitCode (int): 0 if every raw file was rebuilt, 1 otherwise"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    relDir = os.path.dirname(__file__)
+    urlDf = read_input_csv(relDir + "/input/playoffUrls.csv")
+    urlDf["Year"] = urlDf["Year"].astype(str)
+    if args.years:
+        urlDf = urlDf[urlDf["Year"].isin(args.years)]
+    else:
+        archived = PageArchive(statsDir).latest()
+        urlDf = urlDf[urlDf["Link"].isin(archived)]
+    jobs = sorted(set(zip(urlDf["Year"], urlDf["Suffix"])))
+    if not jobs:
+        print("No archived pages to re-parse")
+        return 1
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as executor:
+        results = executor.map(
+            reparse_raw_file,
+            [statsDir] * len(jobs),
+            *zip(*jobs),
+        )
+        failed = 0
+        for (year, suffix), missing in zip(jobs, results):
+            if missing:
+                failed += 1
+                print(
+                    year
+                    + suffix
+                    + " kept as it is, pages never archived: "
+                    + ", ".join(missing)
+                )
+    print(
+        str(len(jobs) - failed)
+        + " of "
+        + str(len(jobs))
+        + " raw files rebuilt from the archive, run the year (or watch "
+        "mode) to regenerate its outputs"
+    )
+    return 1 if failed else 0
 
 
-def convert_ip_column_in(df):
-    """Converts the decimals in the IP column TO thirds (.1 -> .33, .2 -> .66)
-    for stat calculations
+def run_standings(statsDir, args):
+    """Standings mode: prints the expected records and head to head win
+    matrices of every final standings file (cached per season)
 
     Parameters:
-    df (pandas dataframe): A pitching stat dataframe with the traditional
-    .1/.2 IP representation
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed standings arguments
+
+    Returns: N/A"""
+    standingsFiles = find_standings_files(statsDir)
+    if args.years:
+        standingsFiles = {
+            key: fileName
+            for key, fileName in standingsFiles.items()
+            if key[0] in args.years
+        }
+    if len(standingsFiles) == 0:
+        print("\nERROR: No [year]StandingsFinal[division].csv files found.\n")
+        return
+    standingsDf, h2hDf = load_standings(statsDir, standingsFiles)
+    showCols = [
+        "Year",
+        "Division",
+        "Team",
+        "W",
+        "L",
+        "T",
+        "RS",
+        "RA",
+        "PCT",
+        "PythagPCT",
+        "PythagW",
+        "PythagenpatPCT",
+        "PythagenpatW",
+    ]
+    print(standingsDf[showCols].to_string(index=False))
+    for (year, division), seasonDf in h2hDf.groupby(["Year", "Division"]):
+        print("\n" + str(year) + " " + division + " head to head wins")
+        print(get_head_to_head_matrix(seasonDf).to_string())
+
+
+def run_sim(statsDir, args):
+    """Sim mode: simulates a season's post season bracket from its CL and PL
+    standings (seeds by PCT, single game odds from the Pythagenpat records
+    of the year's regular season TeamData, or of the standings if the year
+    has no BR/PR raw files) and writes every team's advancement odds
+
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed sim arguments
 
-    Returns:
-    tempDf['IP'] (pandas dataframe column): An IP column converted for stat
-    calculations"""
-    tempDf = pd.DataFrame(df["IP"])
-    # Get the ".0 .1 .2" in the 'IP' column
-    ipDecimals = tempDf["IP"] % 1
-    # Make the original 'IP' column whole numbers
-    tempDf["IP"] = tempDf["IP"] - ipDecimals
-    # Multiply IP decimals by .3333333333 and readd them to the whole numbers
-    ipDecimals = (ipDecimals * 10) * 0.3333333333
-    tempDf["IP"] = tempDf["IP"] + ipDecimals
-    return tempDf["IP"]
+    Returns: N/A"""
+    from time import perf_counter
+
+    year = args.simYear
+    standingsFiles = {
+        key: fileName
+        for key, fileName in find_standings_files(statsDir).items()
+        if key[0] == year
+    }
+    if len(standingsFiles) == 0:
+        print(
+            "\nERROR: The bracket needs the standings of both leagues "
+            "([year]StandingsFinal[division].csv).\n"
+        )
+        return
+    standingsDf, h2hDf = load_standings(statsDir, standingsFiles)
+    envDf = get_team_run_environment(StatCache(statsDir), year)
+    try:
+        bracketDf = get_bracket_teams(standingsDf, envDf)
+    except ValueError as err:
+        print("\nERROR: " + str(err) + ".\n")
+        return
+    winPcts = bracketDf["WinPct"].to_numpy().reshape(2, 3)
+    startTime = perf_counter()
+    counts = run_bracket_sims(winPcts, args.sims, args.workers, args.seed)
+    elapsed = perf_counter() - startTime
+    odds = counts.reshape(6, 3) / args.sims
+    bracketDf["FinalStage"] = odds[:, 0].round(4)
+    bracketDf["JapanSeries"] = odds[:, 1].round(4)
+    bracketDf["Champion"] = odds[:, 2].round(4)
+    oddsFile = os.path.join(statsDir, year, year + "BracketOdds.csv")
+    bracketDf.to_csv(oddsFile, index=False)
+    print(bracketDf.to_string(index=False))
+    print(
+        "{0:,} brackets simulated in {1:.2f} s ({2:,.0f} per second)".format(
+            args.sims, elapsed, args.sims / elapsed
+        )
+    )
+    print("The bracket odds will be stored in: " + oddsFile)
 
 
-def select_park_factor(df, suffix, year):
-    """Selects the correct park factor depending on the NPB year and team
+def run_games(statsDir, args):
+    """Games mode: ingests every box score of a year listed in
+    input/gameUrls.csv that isn't in the year's game log yet
 
     Parameters:
-    df (pandas dataframe): The dataframe to add the park factor column to
-    suffix (string): Indicates whether to use farm or reg season park factors
-    year (string): The year of park factors to pull
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed games arguments
 
-    Returns:
-    df (pandas dataframe): The pandas dataframe with the new temp park factor
-    column"""
-    # Check for the park factor file, if nothing is there tell user and return
+    Returns: N/A"""
     relDir = os.path.dirname(__file__)
-    pfFile = relDir + "/input/parkFactors.csv"
-    if not (os.path.exists(pfFile)):
+    gameUrlFile = relDir + "/input/gameUrls.csv"
+    if not (os.path.exists(gameUrlFile)):
         print(
-            "\nERROR: No park factor file found, calculations using park "
-            "factors will be inaccurate...\nProvide a valid parkFactors.csv "
-            "file in the /input/ directory to fix this.\n"
+            "\nERROR: No game URL file found, no box scores to ingest...\n"
+            "Provide a valid gameUrls.csv file in the /input/ directory to "
+            "fix this.\n"
         )
-        df["ParkF"] = np.nan
-        return df
+        return
+    year = args.gamesYear
+    urlDf = read_input_csv(gameUrlFile)
+    urlDf = urlDf[urlDf.Year.astype(str) == year]
+    gameLog = GameLog(statsDir, year)
+    for gameId, series, link in zip(
+        urlDf["GameID"].astype(str), urlDf["Series"], urlDf["Link"]
+    ):
+        if gameId in gameLog.gameIds:
+            continue
+        r = get_url(link)
+        gameLog.ingest(gameId, series, link, parse_box_score(r.content))
+        r.close()
+        # Pace requests to npb.jp to avoid excessive requests
+        sleep(randint(3, 5))
+    teamDf = gameLog.get_totals("BP", "team")
+    print(str(len(gameLog.gameIds)) + " " + year + " games ingested")
+    if len(teamDf) > 0:
+        print(teamDf[["G", "PA", "H", "HR", "R"]].to_string())
+    print("The game log will be stored in: " + gameLog.gameDir)
 
-    pfDf = pd.read_csv(pfFile)
-    # Drop all rows that are not the df's year
-    pfDf = pfDf.drop(pfDf[pfDf.Year.astype(str) != year].index)
-    # Drop all rows that do not match the df's league
-    pfSuffix = "NPB"
-    pfDf = pfDf.drop(pfDf[pfDf.League != pfSuffix].index)
-    # Drop remaining unneeded cols before merge
-    pfDf.drop(["Year", "League"], axis=1, inplace=True)
-    # Modifying all park factors for calculations
-    pfDf["ParkF"] = (pfDf["ParkF"] + 1) / 2
-    df = df.merge(pfDf, on="Team", how="left")
-    # For team files, league avg calculations have park factor as 1.000
-    df.loc[df.Team == "League Average", "ParkF"] = 1.000
 
-    return df
+def run_cube(statsDir, args):
+    """Cube mode: prints a grain's rate stats from a year's stored rollup
+    cube, building the cube first if the year has none
 
+    Parameters:
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed cube arguments
 
-def select_fip_const(suffix, year):
-    """Chooses FIP constant for 2020-2024 reg and farm years
+    Returns: N/A"""
+    year = args.cubeYear
+    cubeFile = os.path.join(
+        statsDir, year, year + "Cube" + args.suffix + ".csv"
+    )
+    cache = StatCache(statsDir)
+    # The cube uses the org inputs and the name translation inputs
+    stamp = cache.get_stamp("org", year, args.suffix) + cache.get_stamp(
+        "playerOut", year, args.suffix
+    )
+    newest = max(mtime for mtime in stamp if mtime is not None)
+    cube = None
+    if os.path.exists(cubeFile) and os.stat(cubeFile).st_mtime_ns >= newest:
+        cube = read_rollup_cube(cubeFile, args.suffix)
+    if cube is None:
+        cube = cache.output_cube(year, args.suffix)
+    print(cube.rates(args.grain).to_string(index=False))
+
+
+def run_calibrate(statsDir, args):
+    """Calibrate mode: derives post season FIP constants from the warehouse's
+    pitching totals and regressed park factors from parkFactors.csv's reg
+    season rows (see calc_regressed_park_factors()). Results are stored
+    with a hash of their inputs and only recomputed when the inputs (or
+    CALIBRATION_VERSION) change
 
     Parameters:
-    suffix (string): Indicates whether to use farm or reg season FIP constants
-    year (string): The year of FIP constants to pull
+    statsDir (string): The directory that holds every year directory
+    args (argparse Namespace): The parsed calibrate arguments
 
-    Returns:
-    fipConst (float): The correct FIP const according to year and farm/NPB reg
-    season"""
-    # Check for the player link file, if nothing is there tell user and return
+    Returns: N/A"""
+    import json
+
+    warehouse = Warehouse(os.path.join(statsDir, "npbPostseason.db"))
+    cache = StatCache(statsDir)
+    for year in get_raw_stat_years(get_watch_files(statsDir)):
+        warehouse.load_season(cache, year)
+    totalsDf = warehouse.query(
+        'SELECT Year, SUM(ER) AS ER, SUM(IP) AS IP, SUM(HR) AS HR, '
+        'SUM(BB) AS BB, SUM(HB) AS HB, SUM(SO) AS SO FROM "'
+        + WAREHOUSE_TABLES[("PP", "partial")]
+        + '" GROUP BY Year ORDER BY Year DESC'
+    )
+    warehouse.close()
     relDir = os.path.dirname(__file__)
     fipFile = relDir + "/input/fipConst.csv"
-    if not (os.path.exists(fipFile)):
+    pfFile = relDir + "/input/parkFactors.csv"
+    pfDf = read_input_csv(pfFile)
+    pfDf = pfDf[pfDf.League == "NPB"]
+
+    calDir = os.path.join(statsDir, "calibration")
+    if not (os.path.exists(calDir)):
+        os.mkdir(calDir)
+    stampFile = os.path.join(calDir, "calibration.json")
+    fipCalFile = os.path.join(calDir, "fipConst.csv")
+    pfCalFile = os.path.join(calDir, "parkFactors.csv")
+    inputHash = get_calibration_hash(totalsDf, pfDf)
+    stamp = {}
+    if os.path.exists(stampFile):
+        with open(stampFile) as stampIn:
+            stamp = json.load(stampIn)
+    current = (
+        stamp.get("inputHash") == inputHash
+        and os.path.exists(fipCalFile)
+        and os.path.exists(pfCalFile)
+    )
+    if current and not args.force:
+        print("Calibration inputs unchanged, skipped")
+        fipDf = read_input_csv(fipCalFile)
+        regDf = read_input_csv(pfCalFile)
+    else:
+        fipDf = calc_postseason_fip_consts(totalsDf)
+        regDf = calc_regressed_park_factors(pfDf)
+        fipDf.to_csv(fipCalFile, index=False)
+        regDf.to_csv(pfCalFile, index=False)
+        # Written last so an interrupted run is redone
+        with open(stampFile, "w") as stampOut:
+            json.dump(
+                {"version": CALIBRATION_VERSION, "inputHash": inputHash},
+                stampOut,
+            )
+    print(fipDf.to_string(index=False))
+    print("Calibration will be stored in: " + calDir)
+
+    if args.apply:
+        apply_calibration(fipFile, fipDf)
+        apply_calibration(pfFile, regDf)
         print(
-            "\nERROR: No FIP constant file found, calculations using FIP will "
-            "be inaccurate...\nProvide a valid fipConst.csv file in the "
-            "/input/ directory to fix this.\n"
+            "Calibrated rows written to fipConst.csv and parkFactors.csv "
+            "(the next run rebuilds the affected years)"
         )
-        fipConst = np.nan
-        return fipConst
-
-    fipDf = pd.read_csv(fipFile)
-    # Drop all rows that are not the df's year
-    fipDf = fipDf.drop(fipDf[fipDf.Year.astype(str) != year].index)
-    # TODO: FIP const for playoffs, choose between reg or farm
-    # Drop all rows that do not match the df's league
-    if suffix == "BP" or suffix == "PP":
-        fipSuffix = "NPB"
-    else:
-        fipSuffix = "Farm"
-    fipDf = fipDf.drop(fipDf[fipDf.League != fipSuffix].index)
-    # Return FIP for that year and league
-    fipConst = fipDf.at[fipDf.index[-1], "FIP"]
-    return fipConst
 
 
-def select_league(df, suffix):
-    """Adds a "League" column based on the team
+def send_daemon_command(socketPath, request):
+    """Sends one command to a running daemon and waits for its response
 
     Parameters:
-    df (pandas dataframe): A team or player dataframe
+    socketPath (string): The daemon's Unix socket
+    request (dict): The command (see run_daemon_command())
 
     Returns:
-    df (pandas dataframe): The dataframe with the correct "League" column added
-    """
-    if suffix == "BP" or suffix == "PP":
-        # Contains all 2020-2024 reg baseball team names and leagues
-        leagueDict = {
-            "Hanshin Tigers": "CL",
-            "Hiroshima Carp": "CL",
-            "DeNA BayStars": "CL",
-            "Yomiuri Giants": "CL",
-            "Yakult Swallows": "CL",
-            "Chunichi Dragons": "CL",
-            "ORIX Buffaloes": "PL",
-            "Lotte Marines": "PL",
-            "SoftBank Hawks": "PL",
-            "Rakuten Eagles": "PL",
-            "Seibu Lions": "PL",
-            "Nipponham Fighters": "PL",
-        }
-
-    for team in leagueDict:
-        df.loc[df.Team == team, "League"] = leagueDict[team]
-    return df
+    response (dict): The daemon's response"""
+    import json
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socketPath)
+        client.sendall((json.dumps(request) + "\n").encode())
+        with client.makefile("rb") as responseFile:
+            response = json.loads(responseFile.readline())
+    return response
 
 
-def convert_player_to_html(df, suffix, year):
-    """The WordPress tables associated with this project accepts HTML code, so
-    this function formats player names into <a> tags with links to the player's
-    npb.jp pages. Used after stats are calculated but before any csv output
+def run_client(args):
+    """Client mode: forwards the command line command to the daemon and
+    prints the response
 
     Parameters:
-    df (pandas dataframe): Any final stat dataframe
-    suffix (string): Indicates the data in param df
-        "BR" = reg season batting stat URLs passed in
-        "PR" = reg season pitching stat URLs passed in
-        "BF" = farm batting stat URLs passed in
-        "PF" = farm pitching stat URLs passed in
-    year (string): Indicates the stat year for df
+    args (argparse Namespace): The parsed client arguments
 
     Returns:
-    df (pandas dataframe): The final stat dataframe with valid HTML in the
-    player/pitcher columns
-    """
-    relDir = os.path.dirname(__file__)
-    playerLinkFile = relDir + "/input/playerUrls.csv"
-    if not (os.path.exists(playerLinkFile)):
-        print(
-            "\nERROR: No player link file found, table entries will not "
-            "have links...\nProvide a playerUrls.csv file in the /input/ "
-            "directory to fix this.\n"
-        )
-        return df
+    exitCode (int): 0 if the daemon ran the command, 1 otherwise"""
+    import json
+
+    request = {"cmd": args.cmd, "table": args.table}
+    for key, value in [
+        ("year", args.cmdYear),
+        ("suffix", args.suffix),
+        ("player", args.player),
+        ("team", args.team),
+    ]:
+        if value is not None:
+            request[key] = value
+    try:
+        response = send_daemon_command(args.socket, request)
+    except OSError as ex:
+        print("Could not reach the daemon at " + args.socket + ": " + str(ex))
+        return 1
+    print(json.dumps(response, indent=1, ensure_ascii=False))
+    if response.get("ok"):
+        return 0
+    return 1
 
-    # Read in csv that contains player name and their personal page link
-    linkDf = pd.read_csv(playerLinkFile)
-    # Create new HTML code column
-    linkDf["Link"] = linkDf.apply(build_html, axis=1)
-    # Create dict of Player Name:Complete HTML tag
-    playerDict = dict(linkDf.values)
 
-    # Replace all player entries with HTML that leads to their pages
-    if suffix == "PP":
-        convertCol = "Pitcher"
-    else:
-        convertCol = "Player"
-    # Convert to HTML
-    df[convertCol] = (
-        df[convertCol]
-        .map(playerDict)
-        .infer_objects()
-        .fillna(df[convertCol])
-        .astype(str)
-    )
+def run_benchmarks(names=None):
+    """Runs the requested benchmarks and reports them against their budgets
 
-    # Check for the player link fix file
-    playerLinkFixFile = relDir + "/input/playerUrlsFix.csv"
-    if os.path.exists(playerLinkFixFile):
-        fixDf = pd.read_csv(playerLinkFixFile)
-        # Check year and suffix, fix if needed
-        if int(year) in fixDf.Year.values and suffix in fixDf.Suffix.values:
-            # Create dict of Player Name:Complete HTML tag
-            fixDict = dict(zip(fixDf["Original"], fixDf["Corrected"]))
-            df[convertCol] = (
-                df[convertCol]
-                .map(fixDict)
-                .infer_objects()
-                .fillna(df[convertCol])
-                .astype(str)
+    Parameters:
+    names (list - string): The benchmarks to run (default None runs all)
+
+    Returns:
+    exitCode (int): 0 if every benchmark stayed in budget, 1 otherwise"""
+    benchmarks = {
+        "startup": bench_startup,
+        "sim": bench_sim,
+        "bootstrap": bench_bootstrap,
+        "validate": bench_validate,
+    }
+    if not names:
+        names = list(benchmarks)
+    exitCode = 0
+    for name in names:
+        if name not in benchmarks:
+            print(
+                "Unknown benchmark: "
+                + name
+                + " (choose from "
+                + ", ".join(benchmarks)
+                + ")"
             )
-    return df
+            return 2
+        print("Running benchmark: " + name)
+        if not benchmarks[name]():
+            exitCode = 1
+    return exitCode
 
 
-def translate_players(df, playerColName):
-    """Translates player names from Japanese to English using a csv file
-    containing the translations
+def measure_import_time(args, baseline=()):
+    """Runs a fresh interpreter under "python -X importtime" and totals the
+    time spent importing modules
 
     Parameters:
-    df (pandas dataframe): A dataframe containing entries with player names
-    playerColName (string): The name of the column containing player names
+    args (list - string): Arguments given to the interpreter after the
+    importtime flag
+    baseline (list - string): Modules left out of the total, such as the
+    site and .pth imports of a bare interpreter (default counts every module)
 
     Returns:
-    df (pandas dataframe): The dataframe with translated player"""
-    relDir = os.path.dirname(__file__)
-    translationFile = relDir + "/input/nameTranslations.csv"
-    if not (os.path.exists(translationFile)):
-        print(
-            "\nERROR: No player name translation file found, player names "
-            "will not be translated...\nProvide a nameTranslations.csv file in"
-            " the /input/ directory to fix this.\n"
-        )
-        return df
-    # Strip input of JP space
-    df[playerColName] = df[playerColName].str.replace("　", " ")
-    # Read in csv that contains player name and their personal page link
-    translateDf = pd.read_csv(translationFile)
-    # Create dict of JP name:Eng name
-    playerDict = dict(
-        zip(
-            (zip(translateDf["jp_name"], translateDf["en_team"])),
-            translateDf["en_name"],
-        )
-    )
-    df["keys"] = list(zip(df[playerColName], df["Team"]))
-    df[playerColName] = (
-        df["keys"]
-        .map(playerDict)
-        .infer_objects()
-        .fillna(df[playerColName])
-        .astype(str)
+    totalMs (float): Total import time in milliseconds
+    modules (list - string): Names of every module that was imported"""
+    import subprocess
+
+    relDir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        capture_output=True,
+        text=True,
+        cwd=relDir,
     )
-    df[playerColName] = df[playerColName].str.replace('"', "")
-    df[playerColName] = df[playerColName].str.replace(",", "")
-    return df
+    totalUs = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        # Lines look like "import time: self [us] | cumulative | module"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        selfUs, cumulativeUs, name = line[len("import time:") :].split("|")
+        if name.strip() not in baseline:
+            totalUs = totalUs + int(selfUs)
+        modules.append(name.strip())
+    totalMs = totalUs / 1000
+    return totalMs, modules
 
 
-def convert_team_to_html(df, mode):
-    """Formats the team names to include links to their npb.jp pages
+def bench_startup():
+    """Checks the import time of the --help and plain import paths against
+    STARTUP_BUDGET_MS and makes sure neither loads the heavy modules. Only
+    the modules a bare interpreter doesn't import are counted
 
-    Parameters:
-    df (pandas dataframe): A dataframe containing entries with NPB teams
-    mode (string): Indicates whether to preserve full team names (pass in
-    "Full") or also insert short names in the <a> tags (pass in "Abb")
+    Parameters: N/A
 
     Returns:
-    df (pandas dataframe): The dataframe with correct links and abbrieviations
-    inserted as <a> tags"""
-    # Check for the team link file, if missing, tell user and return
-    relDir = os.path.dirname(__file__)
-    teamLinkFile = relDir + "/input/teamUrls.csv"
-    if not (os.path.exists(teamLinkFile)):
+    inBudget (bool): True if both paths stayed in budget"""
+    import py_compile
+
+    scriptName = os.path.basename(__file__)
+    paths = {
+        "help": [scriptName, "--help"],
+        "import": ["-c", "import " + os.path.splitext(scriptName)[0]],
+    }
+    # Byte-compile the script first so the import is timed like an installed
+    # module's, not compiling the whole file (PYTHONDONTWRITEBYTECODE)
+    py_compile.compile(__file__)
+    baseline = measure_import_time(["-c", "pass"])[1]
+    inBudget = True
+    for pathName, args in paths.items():
+        runs = [
+            measure_import_time(args, baseline) for run in range(STARTUP_RUNS)
+        ]
+        totalMs, modules = min(runs)
+        bannedFound = [
+            module
+            for module in STARTUP_BANNED_MODULES
+            if module in modules
+        ]
+        status = "OK"
+        if totalMs > STARTUP_BUDGET_MS[pathName] or bannedFound:
+            status = "OVER BUDGET"
+            inBudget = False
         print(
-            "\nWARNING: No team link file found, table entries will not have "
-            "links...\nProvide a teamUrls.csv file in the /input/ directory to"
-            " fix this to fix this.\n"
+            "  {0:<8} {1:8.1f} ms (budget {2} ms) {3}".format(
+                pathName, totalMs, STARTUP_BUDGET_MS[pathName], status
+            )
         )
-        return df
+        if bannedFound:
+            print("    Heavy modules loaded: " + ", ".join(bannedFound))
+    return inBudget
 
-    linkDf = pd.read_csv(teamLinkFile)
-    if mode == "Full":
-        # Update Link col to have <a> tags
-        linkDf["Link"] = linkDf.apply(build_html, axis=1)
-    elif mode == "Abb":
-        # Contains 2020-2024 reg/farm baseball team abbrieviations
-        abbrDict = {
-            "Hanshin Tigers": "Hanshin",
-            "Hiroshima Carp": "Hiroshima",
-            "DeNA BayStars": "DeNA",
-            "Yomiuri Giants": "Yomiuri",
-            "Yakult Swallows": "Yakult",
-            "Chunichi Dragons": "Chunichi",
-            "ORIX Buffaloes": "ORIX",
-            "Lotte Marines": "Lotte",
-            "SoftBank Hawks": "SoftBank",
-            "Rakuten Eagles": "Rakuten",
-            "Seibu Lions": "Seibu",
-            "Nipponham Fighters": "Nipponham",
-            "Oisix Albirex": "Oisix",
-            "HAYATE Ventures": "HAYATE",
-        }
-        # Create temp col to have abbrieviations
-        linkDf["Temp"] = (
-            linkDf["Team"]
-            .map(abbrDict)
-            .infer_objects()
-            .fillna(linkDf["Team"])
-            .astype(str)
-        )
-        # Swap full name col with abb col to create HTML tags with abb names
-        linkDf["Team"], linkDf["Temp"] = linkDf["Temp"], linkDf["Team"]
-        linkDf["Link"] = linkDf.apply(build_html, axis=1)
-        # Swap full name col back to original spot and delete temp col
-        linkDf["Temp"], linkDf["Team"] = linkDf["Team"], linkDf["Temp"]
-        linkDf = linkDf.drop("Temp", axis=1)
-        # Add new, unlinked farm team abbrieviations to dataframe
-        newRow = {"Team": "Oisix Albirex", "Link": "Oisix"}
-        linkDf = linkDf._append(newRow, ignore_index=True)
-        newRow = {"Team": "HAYATE Ventures", "Link": "HAYATE"}
-        linkDf = linkDf._append(newRow, ignore_index=True)
 
-    # Create dict of Team Name:Complete HTML tag and convert
-    teamDict = dict(linkDf.values)
-    for column in df:
-        df[column] = (
-            df[column]
-            .map(teamDict)
-            .infer_objects()
-            .fillna(df[column])
-            .astype(str)
+def bench_sim():
+    """Measures single core bracket simulations per second against
+    SIM_BUDGET_PER_SEC
+
+    Parameters: N/A
+
+    Returns:
+    inBudget (bool): True if the simulator was fast enough"""
+    from time import perf_counter
+
+    import numpy as np
+
+    winPcts = np.array([[0.6, 0.55, 0.52], [0.62, 0.56, 0.5]])
+    sims = 2000000
+    # Warm up (imports, allocator) before timing
+    run_bracket_sims(winPcts, 1000, seed=0)
+    startTime = perf_counter()
+    run_bracket_sims(winPcts, sims, seed=0)
+    simsPerSec = sims / (perf_counter() - startTime)
+    inBudget = simsPerSec >= SIM_BUDGET_PER_SEC
+    status = "OK" if inBudget else "OVER BUDGET"
+    print(
+        "  {0:<8} {1:12,.0f} sims/s (budget {2:,} sims/s) {3}".format(
+            "bracket", simsPerSec, SIM_BUDGET_PER_SEC, status
         )
+    )
+    return inBudget
 
-    return df
 
+def bench_bootstrap():
+    """Times bootstrap intervals for a synthetic season of batters and
+    pitchers (one core) against BOOTSTRAP_BUDGET_S
 
-def build_html(row):
-    """Insert the link and text in a <a> tag, returns the tag as a string"""
-    htmlLine = "<a href=" "{0}" ">{1}</a>".format(row["Link"], row.iloc[0])
-    return htmlLine
+    Parameters: N/A
+
+    Returns:
+    inBudget (bool): True if both stat types finished in budget"""
+    from time import perf_counter
+
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    players = 400
+    batDf = pd.DataFrame(
+        {
+            "Player": ["B" + str(i) for i in range(players)],
+            "Team": "",
+            "AB": rng.integers(0, 40, players),
+        }
+    )
+    batDf["H"] = rng.binomial(batDf["AB"], 0.25)
+    batDf["2B"] = rng.binomial(batDf["H"], 0.2)
+    batDf["3B"] = rng.binomial(batDf["H"] - batDf["2B"], 0.02)
+    batDf["HR"] = rng.binomial(batDf["H"] - batDf["2B"] - batDf["3B"], 0.1)
+    batDf["SO"] = rng.binomial(batDf["AB"] - batDf["H"], 0.3)
+    for col in TEAM_COUNT_COLS["BP"]:
+        if col not in batDf.columns:
+            batDf[col] = rng.integers(0, 3, players)
+    pitchDf = pd.DataFrame(
+        {
+            "Pitcher": ["P" + str(i) for i in range(players)],
+            "Team": "",
+            "BF": rng.integers(1, 60, players),
+        }
+    )
+    pitchDf["H"] = rng.binomial(pitchDf["BF"], 0.22)
+    pitchDf["HR"] = rng.binomial(pitchDf["H"], 0.1)
+    pitchDf["SO"] = rng.binomial(pitchDf["BF"] - pitchDf["H"], 0.25)
+    pitchDf["BB"] = rng.binomial(
+        pitchDf["BF"] - pitchDf["H"] - pitchDf["SO"], 0.1
+    )
+    pitchDf["HB"] = 0
+    pitchDf["IP"] = (
+        (pitchDf["BF"] - pitchDf["H"] - pitchDf["BB"]) // 3
+    ).astype(float)
+
+    inBudget = True
+    for suffix, df in [("BP", batDf), ("PP", pitchDf)]:
+        startTime = perf_counter()
+        bootstrap_intervals(df, suffix, "2024", seed=0)
+        elapsed = perf_counter() - startTime
+        status = "OK"
+        if elapsed > BOOTSTRAP_BUDGET_S:
+            status = "OVER BUDGET"
+            inBudget = False
+        print(
+            "  {0:<8} {1:8.2f} s for {2} players (budget {3} s) {4}".format(
+                suffix, elapsed, players, BOOTSTRAP_BUDGET_S, status
+            )
+        )
+    return inBudget
 
 
-def make_zip(yearDir, year):
-    """Groups a year's farm and npb directories in to a single zip for
-    uploading/sending
+def make_validate_sample(rows, seed=0):
+    """Builds a synthetic raw batting stat file with injected faults: more
+    home runs than hits, untranslated team names and a short row at the end
+    (used by bench_validate() and the tests)
 
     Parameters:
-    yearDir (string): The directory that stores the raw, scraped NPB stats
-    year (string): The year of npb stats to group together
+    rows (int): Player rows before the short row
+    seed (int): Seeds the random stats
 
-    Returns: N/A"""
-    tempDir = os.path.join(yearDir, "/stats/temp")
-    tempDir = tempfile.mkdtemp()
-    # Gather relevant dir to put into temp
-    shutil.copytree(
-        yearDir + "/npb", tempDir + "/stats/npb", dirs_exist_ok=True
+    Returns:
+    content (bytes): The raw file's contents
+    badRows (numpy array - int): Positions of the rows with bad stats or
+    teams (the short row is not included)
+    teams (list - string): The valid team names"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    batDf = pd.DataFrame(
+        {
+            "Player": np.char.add("B", np.arange(rows).astype(str)),
+            "G": rng.integers(1, 8, rows),
+            "AB": rng.integers(0, 30, rows),
+            "R": rng.integers(0, 5, rows),
+        }
     )
-    # Create upload zip
-    outputFilename = yearDir + "/" + year + "upload"
-    dirName = tempDir
-    shutil.make_archive(outputFilename, "zip", dirName)
-    shutil.rmtree(tempDir)
-    # Output name of upload zip
-    print("Upload zip can be found at: " + outputFilename + ".zip")
+    batDf["H"] = rng.binomial(batDf["AB"], 0.25)
+    batDf["2B"] = rng.binomial(batDf["H"], 0.2)
+    batDf["3B"] = rng.binomial(batDf["H"] - batDf["2B"], 0.02)
+    batDf["HR"] = rng.binomial(batDf["H"] - batDf["2B"] - batDf["3B"], 0.1)
+    batDf["TB"] = batDf["H"] + batDf["2B"] + 2 * batDf["3B"] + 3 * batDf["HR"]
+    for col in ["RBI", "SB", "CS", "SH", "SF", "BB", "IBB", "HP", "SO", "GDP"]:
+        batDf[col] = rng.integers(0, 3, rows)
+    batDf["PA"] = batDf[["AB", "BB", "HP", "SH", "SF"]].sum(axis=1)
+    atBats = batDf["AB"].where(batDf["AB"] > 0, 1)
+    batDf["AVG"] = (batDf["H"] / atBats).round(3)
+    batDf["SLG"] = (batDf["TB"] / atBats).round(3)
+    batDf["OBP"] = (
+        (batDf["H"] + batDf["BB"] + batDf["HP"])
+        / (batDf["PA"] - batDf["SH"]).where(batDf["PA"] > batDf["SH"], 1)
+    ).round(3)
+    teams = get_team_registry(levels=["NPB"])["Team"].to_numpy()
+    batDf["Team"] = teams[rng.integers(0, len(teams), rows)]
+    batDf["Series"] = np.array(list(SERIES_NAMES))[
+        rng.integers(0, len(SERIES_NAMES), rows)
+    ]
+    badStats = np.arange(0, rows, 997)
+    batDf.loc[badStats, "HR"] = batDf.loc[badStats, "H"] + 1
+    badTeams = np.arange(500, rows, 1009)
+    batDf.loc[badTeams, "Team"] = "阪神タイガース"
+    headerCols = get_raw_header("BP").rstrip("\n").split(",")
+    content = (
+        get_raw_header("BP")
+        + batDf[headerCols].to_csv(index=False, header=False)
+        + "B,1,4,4\n"
+    ).encode("utf-8")
+    badRows = np.union1d(badStats, badTeams)
+    return content, badRows, list(teams)
+
+
+def bench_validate():
+    """Times the raw stat checks (get_raw_field_counts() and
+    validate_raw_stats())
+    on a synthetic million row batting file against VALIDATE_BUDGET_MS and
+    makes sure the faults injected into it are all caught
+
+    Parameters: N/A
+
+    Returns:
+    inBudget (bool): True if the checks were fast enough and caught every
+    fault"""
+    import io
+    from time import perf_counter
+
+    import numpy as np
+    import pandas as pd
+
+    rows = 1000000
+    content, badRows, teams = make_validate_sample(rows)
+    df = pd.read_csv(io.BytesIO(content), skiprows=[rows + 1])
+
+    startTime = perf_counter()
+    fieldCounts = get_raw_field_counts(content)
+    failures = validate_raw_stats(df, "BP", teams)
+    elapsedMs = (perf_counter() - startTime) * 1000
+    failed = np.zeros(rows, dtype=bool)
+    for checkFailed in failures.values():
+        failed |= checkFailed
+    caught = (
+        int((fieldCounts != fieldCounts[0]).sum()) == 1
+        and np.array_equal(np.flatnonzero(failed), badRows)
+    )
+    inBudget = elapsedMs <= VALIDATE_BUDGET_MS and caught
+    status = "OK" if inBudget else "OVER BUDGET"
+    if not caught:
+        status = "MISSED FAULTS"
+    print(
+        "  {0:<8} {1:8.1f} ms for {2:,} rows (budget {3} ms) {4}".format(
+            "BP", elapsedMs, rows, VALIDATE_BUDGET_MS, status
+        )
+    )
+    return inBudget
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+@pytest.fixture
+def statsDir(tmp_path):
+    """A stats directory holding a copy of the 2024 raw stat files"""
+    yearDir = tmp_path / "2024"
+    yearDir.mkdir()
+    for suffix in ["BP", "PP"]:
+        rawName = "2024StatsRaw" + suffix + ".csv"
+        shutil.copy(
+            os.path.join(REPO_DIR, "stats", "2024", rawName), yearDir / rawName
+        )
+    return str(tmp_path)
+
+
+def copy_season(statsDir, year):
+    """Copies the 2024 raw stat files of a stats directory to another year"""
+    yearDir = os.path.join(statsDir, year)
+    os.mkdir(yearDir)
+    for suffix in ["BP", "PP"]:
+        shutil.copy(
+            os.path.join(statsDir, "2024", "2024StatsRaw" + suffix + ".csv"),
+            os.path.join(yearDir, year + "StatsRaw" + suffix + ".csv"),
+        )
+
+
+def get_stat_pages(statsDir, year="2024"):
+    """Rebuilds the npb.jp stat page of every playoffUrls.csv URL of a year
+    from its copied raw stat files
+
+    Returns:
+    pages (dict): URLs mapped to page HTML (bytes)"""
+    import npbPlayoffScraper as scraper
+
+    yearDir = os.path.join(statsDir, year)
+    registry = scraper.get_team_registry()
+    jpTeams = dict(zip(registry["Team"], registry["JP"]))
+    teamCodes = scraper.get_team_codes()
+    pages = {}
+    for suffix in ["BP", "PP"]:
+        rawName = year + "StatsRaw" + suffix + ".csv"
+        with open(os.path.join(yearDir, rawName), encoding="utf-8") as f:
+            rows = [line.split(",") for line in f.read().splitlines()[1:]]
+        rawDf = scraper.read_raw_stats(yearDir, suffix, year, report=False)
+        nameCol = rawDf.columns[0]
+        series = scraper.get_raw_series(rawDf, nameCol, suffix, year)
+        for url in scraper.get_stat_urls(suffix, year):
+            team = teamCodes[scraper.get_url_team_code(url)]
+            tableRows = "".join(
+                "<tr><td>*</td>"
+                + "".join("<td>" + field + "</td>" for field in row[:-2])
+                + "</tr>"
+                for row, rowSeries in zip(rows, series)
+                if row[-2] == team and rowSeries == scraper.get_url_series(url)
+            )
+            pages[url] = (
+                '<html><body><div id="stdivtitle"><h1>'
+                + year
+                + "年度 "
+                + jpTeams[team]
+                + "</h1></div><table><tr><th>Hand</th></tr>"
+                + "<tr><th>Header</th></tr>"
+                + tableRows
+                + "</table></body></html>"
+            ).encode("utf-8")
+    return pages
@@ -0,0 +1,45 @@
+import os
+
+import npbPlayoffScraper as scraper
+
+
+def test_bootstrap_intervals_are_seeded_and_bracket_the_stat(statsDir):
+    yearDir = os.path.join(statsDir, "2024")
+    orgDf = scraper.PlayerData(statsDir, yearDir, "PP", "2024").df
+
+    intervalDf = scraper.bootstrap_intervals(orgDf, "PP", "2024", seed=7)
+
+    assert list(intervalDf.columns) == [
+        "FIP Low",
+        "FIP High",
+        "K-BB% Low",
+        "K-BB% High",
+    ]
+    boundsDf = scraper.convert_stats_to_numeric(intervalDf.copy())
+    # Pitchers without an interval are left blank
+    boundsDf = boundsDf.dropna()
+    assert len(boundsDf) > 0.9 * len(orgDf)
+    assert (boundsDf["FIP Low"] <= boundsDf["FIP High"]).all()
+    assert (boundsDf["K-BB% Low"] <= boundsDf["K-BB% High"]).all()
+    # Most pitchers' own FIP falls inside their interval
+    fip = scraper.convert_stats_to_numeric(orgDf.copy())["FIP"]
+    fip = fip[boundsDf.index]
+    inside = (boundsDf["FIP Low"] <= fip + 0.01) & (
+        fip - 0.01 <= boundsDf["FIP High"]
+    )
+    assert inside.mean() > 0.9
+    again = scraper.bootstrap_intervals(orgDf, "PP", "2024", seed=7)
+    assert again.equals(intervalDf)
+
+
+def test_bootstrap_intervals_in_alt_view(statsDir):
+    cache = scraper.StatCache(statsDir, intervalWorkers=1)
+    cache.regenerate("2024", ("BP",))
+
+    altFile = os.path.join(statsDir, "2024", "alt", "2024AltViewBP.csv")
+    with open(altFile, encoding="utf-8") as f:
+        header = f.readline()
+    assert "OPS+ Low" in header and "OPS+ High" in header
+    finalFile = os.path.join(statsDir, "2024", "npb", "2024StatsFinalBP.csv")
+    with open(finalFile, encoding="utf-8") as f:
+        assert "OPS+ Low" not in f.readline()
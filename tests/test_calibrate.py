@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+
+def test_calibrate_fip_constant_and_park_factors(statsDir, capsys):
+    args = scraper.parse_args(["calibrate"])
+    scraper.run_calibrate(statsDir, args)
+
+    calDir = os.path.join(statsDir, "calibration")
+    fipDf = pd.read_csv(os.path.join(calDir, "fipConst.csv"))
+    assert list(fipDf["Year"]) == [2024]
+    assert list(fipDf["League"]) == [scraper.CALIBRATED_LEAGUE]
+    # The constant puts league FIP on the league's ERA
+    yearDir = os.path.join(statsDir, "2024")
+    playerDf = scraper.PlayerData(statsDir, yearDir, "PP", "2024").df
+    playerDf = scraper.convert_stats_to_numeric(playerDf.copy())
+    totals = playerDf[["ER", "HR", "BB", "HB", "SO"]].sum()
+    innings = scraper.convert_ip_column_in(playerDf).sum()
+    fipCore = (
+        (13 * totals["HR"])
+        + (3 * (totals["BB"] + totals["HB"]))
+        - (2 * totals["SO"])
+    ) / innings
+    lgERA = 9 * totals["ER"] / innings
+    assert fipDf["FIP"].iloc[0] == round(lgERA - fipCore, 3)
+
+    pfDf = pd.read_csv(os.path.join(calDir, "parkFactors.csv"))
+    hanshin = pfDf[(pfDf["Team"] == "Hanshin Tigers") & (pfDf["Year"] == 2024)]
+    # 2024, 2023 and 2022 weighted 5/4/3 plus 3 of a neutral park
+    regressed = (5 * 0.94 + 4 * 0.99 + 3 * 0.96 + 3) / 15
+    assert hanshin["ParkF"].iloc[0] == round(regressed, 3)
+
+    capsys.readouterr()
+    scraper.run_calibrate(statsDir, args)
+    assert "Calibration inputs unchanged, skipped" in capsys.readouterr().out
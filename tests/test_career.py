@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+from conftest import copy_season
+
+
+def test_career_merges_seasons(statsDir):
+    copy_season(statsDir, "2023")
+    teamDf = scraper.StatCache(statsDir).load("2024", "PP")["team"].df
+    teamDf = scraper.convert_stats_to_numeric(teamDf.copy())
+    teamDf = teamDf.set_index("Team").drop("League Average")
+
+    args = scraper.parse_args(["career", "--by", "team", "--suffix", "PP"])
+    scraper.run_career(statsDir, args)
+
+    careerFile = os.path.join(statsDir, "career", "CareerTeamPP.csv")
+    careerDf = pd.read_csv(careerFile).set_index("Team")
+    careerDf = careerDf.loc[teamDf.index]
+    assert (careerDf["Seasons"] == 2).all()
+    # Two identical seasons: twice the counts, the same rates (FIP and the
+    # league relative stats use each season's own constants)
+    pd.testing.assert_series_equal(careerDf["SO"], 2 * teamDf["SO"])
+    assert careerDf.loc["DeNA BayStars", "IP"] == 248.0
+    for col in ["ERA", "WHIP", "K%", "K-BB%"]:
+        pd.testing.assert_series_equal(
+            careerDf[col].astype(float),
+            teamDf[col].astype(float),
+            atol=0.0051,
+        )
+
+
+def test_career_selects_seasons_and_minimum(statsDir):
+    copy_season(statsDir, "2023")
+    args = scraper.parse_args(
+        ["career", "--years", "2024", "--min", "50", "--sort", "PA"]
+    )
+    scraper.run_career(statsDir, args)
+
+    careerDf = pd.read_csv(
+        os.path.join(statsDir, "career", "CareerPlayerBP.csv")
+    )
+    assert (careerDf["Seasons"] == 1).all()
+    assert careerDf["PA"].min() >= 50
+    assert careerDf["PA"].is_monotonic_decreasing
+    austinDf = careerDf[careerDf["Name"] == "Austin Tyler"]
+    assert list(austinDf["PA"]) == [54]
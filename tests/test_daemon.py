@@ -0,0 +1,53 @@
+import os
+import threading
+import time
+
+import npbPlayoffScraper as scraper
+
+
+def test_daemon_serves_commands_from_warm_cache(statsDir, tmp_path):
+    socketPath = str(tmp_path / "daemon.sock")
+    daemon = threading.Thread(
+        target=scraper.run_daemon, args=(statsDir, socketPath), daemon=True
+    )
+    daemon.start()
+    for _ in range(100):
+        if os.path.exists(socketPath):
+            break
+        time.sleep(0.1)
+
+    response = scraper.send_daemon_command(socketPath, {"cmd": "status"})
+    assert response == {"ok": True, "loaded": ["2024BP", "2024PP"]}
+
+    response = scraper.send_daemon_command(
+        socketPath, {"cmd": "regenerate", "year": "2024"}
+    )
+    # Organized when the daemon started, only the outputs are written
+    assert response["rebuilt"] == [
+        "BP playerOut",
+        "BP teamOut",
+        "PP playerOut",
+        "PP teamOut",
+    ]
+    finalFile = os.path.join(statsDir, "2024", "npb", "2024StatsFinalBP.csv")
+    assert os.path.exists(finalFile)
+    response = scraper.send_daemon_command(
+        socketPath, {"cmd": "regenerate", "year": "2024"}
+    )
+    assert response == {"ok": True, "rebuilt": []}
+
+    response = scraper.send_daemon_command(
+        socketPath,
+        {"cmd": "query", "year": "2024", "table": "team", "team": "DeNA"},
+    )
+    assert [row["Team"] for row in response["rows"]] == ["DeNA BayStars"]
+    response = scraper.send_daemon_command(
+        socketPath, {"cmd": "regenerate", "year": "1999"}
+    )
+    assert not response["ok"]
+
+    response = scraper.send_daemon_command(socketPath, {"cmd": "shutdown"})
+    assert response == {"ok": True}
+    daemon.join(10)
+    assert not daemon.is_alive()
+    assert not os.path.exists(socketPath)
@@ -0,0 +1,50 @@
+import gzip
+import json
+import os
+
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+
+def test_export_writes_typed_tables_once(statsDir, capsys):
+    scraper.StatCache(statsDir).regenerate("2024")
+    args = scraper.parse_args(["export"])
+    scraper.run_export(statsDir, args)
+
+    apiDir = os.path.join(statsDir, "api")
+    with open(os.path.join(apiDir, "manifest.json")) as manifestIn:
+        manifest = json.load(manifestIn)
+    assert sorted(manifest["files"]) == sorted(
+        "2024/" + table + "." + ext
+        for table in scraper.EXPORT_TABLES
+        for ext in ["json", "ndjson"]
+    )
+    jsonFile = os.path.join(apiDir, "2024", "TeamPP.json")
+    with open(jsonFile, "rb") as jsonIn:
+        data = jsonIn.read()
+    with open(jsonFile + ".gz", "rb") as gzIn:
+        assert gzip.decompress(gzIn.read()) == data
+    doc = json.loads(data)
+    teamDf = pd.read_csv(
+        os.path.join(statsDir, "2024", "npb", "2024TeamPP.csv")
+    )
+    assert len(doc["rows"]) == manifest["files"]["2024/TeamPP.json"]["rows"]
+    assert len(doc["rows"]) == len(teamDf)
+    # Names and links are split, stats stay numbers
+    columns = {col["name"]: col["type"] for col in doc["columns"]}
+    assert columns["Team"] == "string" and columns["ERA"] == "number"
+    assert "TeamLink" in columns
+    row = doc["rows"][0]
+    assert "<a" not in row["Team"]
+    assert isinstance(row["ERA"], float)
+    ndjsonFile = os.path.join(apiDir, "2024", "TeamPP.ndjson")
+    with open(ndjsonFile, encoding="utf-8") as ndjsonIn:
+        assert [json.loads(line) for line in ndjsonIn] == doc["rows"]
+    assert "8 changed files exported" in capsys.readouterr().out
+
+    # Unchanged tables keep their bytes and mtimes
+    mtime = os.stat(jsonFile).st_mtime_ns
+    scraper.run_export(statsDir, args)
+    assert "0 changed files exported" in capsys.readouterr().out
+    assert os.stat(jsonFile).st_mtime_ns == mtime
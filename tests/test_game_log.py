@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+import pytest
+
+import npbPlayoffScraper as scraper
+
+BOX_SCORE_FILE = os.path.join(
+    os.path.dirname(__file__), "data", "boxScore2024ns01.html"
+)
+BOX_SCORE_LINK = "https://npb.jp/scores/2024/1026/db-h-01/box.html"
+
+
+@pytest.fixture
+def gameLines():
+    with open(BOX_SCORE_FILE, "rb") as boxFile:
+        return scraper.parse_box_score(boxFile.read())
+
+
+def test_parse_box_score(gameLines):
+    batDf = gameLines["BP"].set_index("Name")
+    pitchDf = gameLines["PP"].set_index("Name")
+    # Total rows and the line score table are left out
+    assert len(batDf) == 9
+    assert len(pitchDf) == 5
+    assert "計" not in batDf.index and "計" not in pitchDf.index
+    assert batDf.loc["山川", "Team"] == "SoftBank Hawks"
+    assert batDf.loc["牧", "Team"] == "DeNA BayStars"
+    # PA and TB aren't on the page and are derived
+    assert batDf.loc["山川", "PA"] == 5
+    assert batDf.loc["山川", "TB"] == 5
+    assert batDf.loc["今宮", "PA"] == 4
+    assert batDf.loc["今宮", "TB"] == 2
+    assert pitchDf.loc["有原", "W"] == 1
+    assert pitchDf.loc["ケイ", "L"] == 1
+    assert pitchDf.loc["オスナ", "SV"] == 1
+    assert pitchDf.loc["有原", "IP"] == pytest.approx(7 + 2 / 3)
+    assert pitchDf.loc["ヘルナンデス", "IP"] == pytest.approx(1 / 3)
+    assert pitchDf.loc["ヘルナンデス", "WP"] == 1
+    assert gameLines["PP"]["IP"].sum() == pytest.approx(17)
+
+
+def test_ingest_skips_ingested_games(tmp_path, gameLines):
+    gameLog = scraper.GameLog(str(tmp_path), "2024")
+    assert gameLog.ingest("ns01", "ns", BOX_SCORE_LINK, gameLines)
+    assert not gameLog.ingest("ns01", "ns", BOX_SCORE_LINK, gameLines)
+
+    reloaded = scraper.GameLog(str(tmp_path), "2024")
+    assert not reloaded.ingest("ns01", "ns", BOX_SCORE_LINK, gameLines)
+    teamDf = reloaded.get_totals("BP", "team")
+    assert teamDf.loc["SoftBank Hawks", "H"] == 7
+    assert teamDf.loc["SoftBank Hawks", "G"] == 1
+    logDf = pd.read_csv(reloaded.get_file("GameLog", "BP"))
+    assert len(logDf) == 9
+
+
+def test_failed_ingest_is_retried_cleanly(tmp_path, gameLines, monkeypatch):
+    convert = scraper.convert_count_columns_to_int
+
+    def fail_on_pitching(df, suffix):
+        if suffix == "PP":
+            raise OSError("disk full")
+        return convert(df, suffix)
+
+    gameLog = scraper.GameLog(str(tmp_path), "2024")
+    monkeypatch.setattr(
+        scraper, "convert_count_columns_to_int", fail_on_pitching
+    )
+    with pytest.raises(OSError):
+        gameLog.ingest("ns01", "ns", BOX_SCORE_LINK, gameLines)
+    # Nothing of the failed game is kept
+    assert os.listdir(gameLog.gameDir) == []
+    assert gameLog.gameIds == set()
+
+    monkeypatch.undo()
+    retried = scraper.GameLog(str(tmp_path), "2024")
+    assert retried.ingest("ns01", "ns", BOX_SCORE_LINK, gameLines)
+    logDf = pd.read_csv(retried.get_file("GameLog", "BP"))
+    assert len(logDf) == 9
+    teamDf = scraper.GameLog(str(tmp_path), "2024").get_totals("BP", "team")
+    assert teamDf.loc["SoftBank Hawks", "H"] == 7
@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+
+def split_raw_file(statsDir, suffix):
+    """Rewrites a copied raw stat file as two series: the Climax Series
+    final stage with every row and the Japan Series with the rows of two
+    teams"""
+    rawFile = os.path.join(statsDir, "2024", "2024StatsRaw" + suffix + ".csv")
+    with open(rawFile, encoding="utf-8") as f:
+        header, *rows = f.read().splitlines()
+    teams = ["Hanshin Tigers", "SoftBank Hawks"]
+    seriesRows = [row + "s2" for row in rows]
+    seriesRows = seriesRows + [
+        row + "ns" for row in rows if row.split(",")[-2] in teams
+    ]
+    with open(rawFile, "w", encoding="utf-8") as f:
+        f.write(header + "Series\n")
+        f.write("\n".join(seriesRows) + "\n")
+
+
+def test_series_leaders_use_series_team_games(statsDir):
+    for suffix in ["BP", "PP"]:
+        split_raw_file(statsDir, suffix)
+    cache = scraper.StatCache(statsDir)
+    leaderFiles = cache.output_leaders("2024", top=1000)
+
+    leaderDir = os.path.join(statsDir, "2024", "leaders")
+    for series in ["", "s2", "ns"]:
+        for suffix in ["BP", "PP"]:
+            fileName = "2024" + series + "Leaders" + suffix + "ERA.csv"
+            if suffix == "BP":
+                fileName = "2024" + series + "LeadersBPwOBA.csv"
+            assert os.path.join(leaderDir, fileName) in leaderFiles
+
+    splitDf = scraper.get_split_player_df(
+        os.path.join(statsDir, "2024"), "BP", "2024"
+    )
+    nsDf = splitDf[splitDf["Series"] == "ns"]
+    teamGames = nsDf.groupby("Team")["G"].transform("max")
+    qualified = nsDf["PA"] >= scraper.LEADER_PA_PER_GAME * teamGames
+    leaderDf = pd.read_csv(os.path.join(leaderDir, "2024nsLeadersBPOBP.csv"))
+    assert len(leaderDf) == qualified.sum()
+    # Season qualification counts the games of both series
+    seasonDf = pd.read_csv(os.path.join(leaderDir, "2024LeadersBPOBP.csv"))
+    assert len(seasonDf) != len(leaderDf)
@@ -0,0 +1,19 @@
+import os
+
+import npbPlayoffScraper as scraper
+
+
+def test_league_weights_pool_both_leagues(statsDir):
+    yearDir = os.path.join(statsDir, "2024")
+    playerData = scraper.PlayerData(statsDir, yearDir, "BP", "2024")
+    df = scraper.select_league(playerData.df.copy(), "BP")
+    scraper.LINEAR_WEIGHTS_CACHE.clear()
+
+    weights = scraper.get_league_weights(df, "2024")
+
+    pooled = scraper.get_linear_weights(
+        df[scraper.TEAM_COUNT_COLS["BP"]].sum(), "2024", "NPB"
+    )
+    assert set(weights) == {"CL", "PL", "NPB"}
+    for league in weights:
+        assert weights[league] == pooled
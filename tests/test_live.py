@@ -0,0 +1,88 @@
+import json
+import os
+
+import pandas as pd
+import requests
+
+import npbPlayoffScraper as scraper
+
+from conftest import get_stat_pages
+
+
+class FakeResponse:
+    def __init__(self, statusCode, content=b"", headers=None):
+        self.status_code = statusCode
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serves stat pages with ETags, answering 304 when the page's ETag is
+    sent back"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.gets = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.gets.append(url)
+        etag = '"' + str(hash(self.pages[url])) + '"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.pages[url], {"ETag": etag})
+
+    def close(self):
+        pass
+
+
+def run_live_once(statsDir, monkeypatch, session):
+    """Runs one round of live polling, stopping at its closing sleep"""
+    urlCount = len(session.pages)
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) > urlCount:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(scraper, "sleep", fake_sleep)
+    monkeypatch.setattr(requests, "Session", lambda: session)
+    scraper.run_live(statsDir, "2024", [], 60, 600)
+
+
+def test_live_rebuilds_raw_files_from_polled_pages(statsDir, monkeypatch):
+    yearDir = os.path.join(statsDir, "2024")
+    rawFile = os.path.join(yearDir, "2024StatsRawBP.csv")
+    oldDf = pd.read_csv(rawFile).iloc[:, :-1]
+    session = FakeSession(get_stat_pages(statsDir))
+
+    run_live_once(statsDir, monkeypatch, session)
+
+    assert sorted(session.gets) == sorted(session.pages)
+    newDf = pd.read_csv(rawFile)
+    # Same rows in page order, now with each page's series
+    pd.testing.assert_frame_equal(newDf.iloc[:, :-1], oldDf)
+    assert list(newDf["Series"].unique()) == ["s1", "s2", "ns"]
+    finalFile = os.path.join(yearDir, "npb", "2024StatsFinalBP.csv")
+    assert os.path.exists(finalFile)
+    with open(os.path.join(yearDir, "liveState.json")) as stateFile:
+        state = json.load(stateFile)
+    assert set(state) == set(session.pages)
+
+    # A restart keeps the poll state, pages aren't due yet
+    session.gets = []
+    run_live_once(statsDir, monkeypatch, session)
+    assert session.gets == []
+    # Once due, pages are asked for with their ETag and unchanged ones
+    # don't rebuild anything
+    for urlState in state.values():
+        urlState["nextPoll"] = 0
+    with open(os.path.join(yearDir, "liveState.json"), "w") as stateFile:
+        json.dump(state, stateFile)
+    rawMtime = os.stat(rawFile).st_mtime_ns
+    run_live_once(statsDir, monkeypatch, session)
+    assert sorted(session.gets) == sorted(session.pages)
+    assert os.stat(rawFile).st_mtime_ns == rawMtime
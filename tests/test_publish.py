@@ -0,0 +1,60 @@
+import os
+import shutil
+import socket
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+import npbPlayoffScraper as scraper
+
+from conftest import REPO_DIR
+
+
+@pytest.fixture
+def endpoint():
+    """A local publish stub that fails every third request"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    threading.Thread(
+        target=scraper.run_publish_stub, args=(port, 3), daemon=True
+    ).start()
+    for attempt in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return "http://127.0.0.1:" + str(port)
+
+
+def test_publish_round_trip(tmp_path, endpoint, monkeypatch):
+    shutil.copytree(
+        os.path.join(REPO_DIR, "stats", "2024", "npb"),
+        tmp_path / "2024" / "npb",
+    )
+    args = scraper.parse_args(
+        ["publish", "2024", "--endpoint", endpoint, "--workers", "2"]
+    )
+
+    assert scraper.run_publish(str(tmp_path), args) == 0
+
+    for table in scraper.EXPORT_TABLES:
+        csvFile = tmp_path / "2024" / "npb" / ("2024" + table + ".csv")
+        df = pd.read_csv(csvFile, dtype=str, keep_default_na=False)
+        response = requests.get(endpoint + "/tables/2024" + table, timeout=5)
+        rows = [
+            [row["values"][col] for col in df.columns]
+            for row in response.json()["rows"]
+        ]
+        assert sorted(rows) == sorted(df.values.tolist())
+
+    # Nothing changed, so nothing is sent again
+    def fail_request(session, endpoint, request):
+        raise AssertionError("unchanged table sent: " + request[1])
+
+    monkeypatch.setattr(scraper, "send_publish_request", fail_request)
+    assert scraper.run_publish(str(tmp_path), args) == 0
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+import pytest
+
+import npbPlayoffScraper as scraper
+
+from conftest import copy_season
+
+
+def test_rankings_orient_and_index_seasons(statsDir, capsys):
+    scraper.run_rankings(statsDir, scraper.parse_args(["rankings"]))
+
+    cache = scraper.StatCache(statsDir)
+    statDf, qualified = cache.get_ranking_stats("2024", "PP")
+    rankDf = pd.read_csv(
+        os.path.join(statsDir, "2024", "2024RankingsPP.csv")
+    )
+    assert len(rankDf) == len(statDf)
+    # Lower is better for ERA, so the best qualified ERA ranks highest
+    bestEra = statDf.loc[qualified, "ERA"].idxmin()
+    assert rankDf["ERA Pct"].idxmax() == bestEra
+    assert rankDf.loc[~qualified, "ERA Pct"].isna().all()
+    assert rankDf.loc[qualified, "ERA Z"].mean() == pytest.approx(0, abs=0.01)
+    # Counting stats rank every pitcher
+    assert rankDf["SO Pct"].notna().all()
+    assert rankDf["SO Pct"].idxmax() == statDf["SO"].idxmax()
+    out = capsys.readouterr().out
+    size = len(statDf)
+    assert "PP ranking population: " + str(size) + " player seasons" in out
+
+    # Only the new season is merged in
+    copy_season(statsDir, "2023")
+    scraper.run_rankings(statsDir, scraper.parse_args(["rankings", "2023"]))
+    out = capsys.readouterr().out
+    assert "2023 PP added to the ranking index" in out
+    assert "2024 PP added" not in out
+    assert "PP ranking population: " + str(2 * size) in out
+    assert os.path.exists(
+        os.path.join(statsDir, "2023", "2023RankingsPP.csv")
+    )
+
@@ -0,0 +1,61 @@
+import os
+
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+from conftest import get_stat_pages
+
+
+def read_raw_file(statsDir, suffix):
+    rawFile = os.path.join(statsDir, "2024", "2024StatsRaw" + suffix + ".csv")
+    with open(rawFile, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_reparse_rebuilds_raw_files_from_archive(statsDir, capsys):
+    pages = get_stat_pages(statsDir)
+    yearDir = os.path.join(statsDir, "2024")
+    # The committed raw files have no Series column, it's derived from the
+    # page order (see get_raw_series()) and written out by the re-parse
+    original = {
+        suffix: scraper.get_split_player_df(yearDir, suffix, "2024")
+        for suffix in ["BP", "PP"]
+    }
+    archive = scraper.PageArchive(statsDir)
+    for url, content in pages.items():
+        archive.store(url, content, "2024-11-01T00:00:00+00:00")
+    # An older fetch of a page is ignored, only the newest is parsed
+    firstUrl = next(iter(pages))
+    archive.store(firstUrl, b"<html></html>", "2024-10-01T00:00:00+00:00")
+    for suffix in ["BP", "PP"]:
+        os.remove(
+            os.path.join(statsDir, "2024", "2024StatsRaw" + suffix + ".csv")
+        )
+
+    args = scraper.parse_args(["reparse", "--workers", "1"])
+    assert scraper.run_reparse(statsDir, args) == 0
+
+    assert "2 of 2 raw files rebuilt" in capsys.readouterr().out
+    for suffix in ["BP", "PP"]:
+        assert "Series" in read_raw_file(statsDir, suffix).splitlines()[0]
+        splitDf = scraper.get_split_player_df(yearDir, suffix, "2024")
+        pd.testing.assert_frame_equal(splitDf, original[suffix])
+
+
+def test_reparse_keeps_raw_file_with_unarchived_pages(statsDir, capsys):
+    pages = get_stat_pages(statsDir)
+    original = read_raw_file(statsDir, "PP")
+    archive = scraper.PageArchive(statsDir)
+    ppUrls = list(scraper.get_stat_urls("PP", "2024"))
+    for url, content in pages.items():
+        if url != ppUrls[0]:
+            archive.store(url, content)
+
+    args = scraper.parse_args(["reparse", "2024", "--workers", "1"])
+    assert scraper.run_reparse(statsDir, args) == 1
+
+    out = capsys.readouterr().out
+    assert "2024PP kept as it is, pages never archived: " + ppUrls[0] in out
+    assert "1 of 2 raw files rebuilt" in out
+    assert read_raw_file(statsDir, "PP") == original
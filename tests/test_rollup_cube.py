@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+import pytest
+
+import npbPlayoffScraper as scraper
+
+
+def test_cube_woba_matches_season_calculation(statsDir):
+    yearDir = os.path.join(statsDir, "2024")
+    splitDf = scraper.get_split_player_df(yearDir, "BP", "2024")
+    # Two series with the same rows, so the cube has to sum the partials
+    secondDf = splitDf.copy()
+    secondDf["Series"] = "2"
+    splitDf = pd.concat([splitDf, secondDf], ignore_index=True)
+    partialDf = scraper.get_season_partials(splitDf, "BP", "2024")
+    cube = scraper.build_rollup_cube(partialDf, "BP")
+    cubeDf = cube.rates("player").set_index(["Team", "Name"]).sort_index()
+
+    keyCols = ["Team", "Name", "League"]
+    seasonDf = splitDf.groupby(keyCols, as_index=False)[
+        scraper.TEAM_COUNT_COLS["BP"]
+    ].sum()
+    seasonDf = scraper.select_park_factor(seasonDf, "BP", "2024")
+    seasonDf["ParkF"] = seasonDf["ParkF"].fillna(1.0)
+    seasonDf = scraper.calc_woba_stats(
+        seasonDf, scraper.get_league_weights(seasonDf, "2024")
+    )
+    seasonDf = seasonDf.set_index(["Team", "Name"]).sort_index()
+
+    for col in ["wOBA", "wRAA", "wRC+"]:
+        pd.testing.assert_series_equal(
+            cubeDf[col].astype(float),
+            seasonDf[col].astype(float),
+            check_names=False,
+        )
+
+
+@pytest.mark.parametrize(
+    "suffix,cols",
+    [
+        ("BP", ["OPS+", "wOBA", "wRAA", "wRC+", "BABIP", "K%"]),
+        ("PP", ["ERA", "FIP", "ERA+", "FIP-", "kwERA-", "K-BB%"]),
+    ],
+)
+def test_cube_team_grain_matches_team_data(statsDir, suffix, cols):
+    yearDir = os.path.join(statsDir, "2024")
+    splitDf = scraper.get_split_player_df(yearDir, suffix, "2024")
+    partialDf = scraper.get_season_partials(splitDf, suffix, "2024")
+    cube = scraper.build_rollup_cube(partialDf, suffix)
+    cubeDf = cube.rates("team").set_index("Team").sort_index()
+
+    playerData = scraper.PlayerData(statsDir, yearDir, suffix, "2024")
+    # Same as StatCache, the team file reads the series split cube
+    teamData = scraper.TeamData(
+        playerData.df, statsDir, yearDir, suffix, "2024", cube
+    )
+    teamDf = scraper.convert_stats_to_numeric(teamData.df.copy())
+    teamDf = teamDf.set_index("Team").drop("League Average").sort_index()
+
+    pd.testing.assert_index_equal(cubeDf.index, teamDf.index)
+    for col in cols:
+        pd.testing.assert_series_equal(
+            cubeDf[col].astype(float),
+            teamDf[col].astype(float),
+            check_names=False,
+            atol=0.0006,
+        )
+
+
+def test_regenerate_reads_raw_once_without_cube_file(statsDir, monkeypatch):
+    readRaw = scraper.read_raw_stats
+    reads = []
+
+    def count_reads(yearDir, suffix, year, report=True):
+        reads.append(suffix)
+        return readRaw(yearDir, suffix, year, report)
+
+    monkeypatch.setattr(scraper, "read_raw_stats", count_reads)
+    cache = scraper.StatCache(statsDir)
+    cache.regenerate("2024")
+
+    assert reads == ["BP", "PP"]
+    assert cache.entries[("2024", "BP")]["cube"] is not None
+    cubeFile = os.path.join(statsDir, "2024", "2024CubeBP.csv")
+    assert not os.path.exists(cubeFile)
+    cache.output_cube("2024", "BP")
+    assert reads == ["BP", "PP"]
+    assert os.path.exists(cubeFile)
+
+
+def test_series_derived_from_playoff_url_order(statsDir):
+    yearDir = os.path.join(statsDir, "2024")
+    splitDf = scraper.get_split_player_df(yearDir, "BP", "2024")
+
+    teamSeries = splitDf.groupby("Team")["Series"].unique()
+    assert sorted(teamSeries["DeNA BayStars"]) == ["ns", "s1", "s2"]
+    assert sorted(teamSeries["Yomiuri Giants"]) == ["s2"]
+    assert sorted(teamSeries["SoftBank Hawks"]) == ["ns", "s2"]
+
+    # Rows that don't line up with the pages stay in a single series
+    rawDf = scraper.read_raw_stats(yearDir, "BP", "2024", report=False)
+    rawDf = rawDf.iloc[::-1].reset_index(drop=True)
+    series = scraper.get_raw_series(rawDf, "Player", "BP", "2024")
+    assert (series == "").all()
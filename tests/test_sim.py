@@ -0,0 +1,138 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import npbPlayoffScraper as scraper
+
+# 2024 final regular season records (G, W, L, T, RS, RA)
+STANDINGS = {
+    "C": {
+        "Yomiuri Giants": (143, 77, 59, 7, 462, 374),
+        "Hanshin Tigers": (143, 74, 63, 6, 485, 398),
+        "DeNA BayStars": (143, 71, 69, 3, 522, 506),
+        "Hiroshima Carp": (143, 68, 70, 5, 415, 405),
+        "Yakult Swallows": (143, 62, 77, 4, 518, 576),
+        "Chunichi Dragons": (143, 60, 75, 8, 373, 435),
+    },
+    "P": {
+        "SoftBank Hawks": (143, 91, 49, 3, 607, 373),
+        "Nipponham Fighters": (143, 75, 60, 8, 532, 448),
+        "Lotte Marines": (143, 71, 66, 6, 493, 472),
+        "Rakuten Eagles": (143, 67, 72, 4, 484, 528),
+        "ORIX Buffaloes": (143, 63, 77, 3, 410, 463),
+        "Seibu Lions": (143, 49, 91, 3, 350, 512),
+    },
+}
+
+
+def write_standings(statsDir):
+    """Writes CL (C) and PL (P) final standings files to the 2024 year
+    directory (head to head records are left at 0-0)"""
+    teamCodes = {team: code for code, team in scraper.get_team_codes().items()}
+    for division, records in STANDINGS.items():
+        rows = []
+        for team, (g, w, l, t, rs, ra) in records.items():
+            vsCols = {
+                "vs " + teamCodes[opponent].upper(): (
+                    "--" if opponent == team else "0-0"
+                )
+                for opponent in records
+            }
+            rows.append(
+                {
+                    "#": "",
+                    "Team": team,
+                    "G": g,
+                    "W": w,
+                    "L": l,
+                    "T": t,
+                    "PCT": "{:.3f}".format(w / (w + l)),
+                    "GB": "--",
+                    "RS": rs,
+                    "RA": ra,
+                    "Diff": rs - ra,
+                    "XPCT": "0.500",
+                    "Home": "",
+                    "Road": "",
+                    **vsCols,
+                    "Inter": "",
+                }
+            )
+        fileName = "2024StandingsFinal" + division + ".csv"
+        pd.DataFrame(rows).to_csv(
+            os.path.join(statsDir, "2024", fileName), index=False
+        )
+
+
+def load_year_standings(statsDir, divisions):
+    standingsFiles = {
+        key: fileName
+        for key, fileName in scraper.find_standings_files(statsDir).items()
+        if key[0] == "2024" and key[1] in divisions
+    }
+    standingsDf, h2hDf = scraper.load_standings(statsDir, standingsFiles)
+    return standingsDf
+
+
+def test_bracket_rejects_farm_standings(statsDir):
+    # The committed E/W files are the Eastern/Western farm standings
+    standingsDf = load_year_standings(statsDir, ["E", "W"])
+    assert "Oisix Albirex" in set(standingsDf["Team"])
+
+    with pytest.raises(ValueError, match="farm standings"):
+        scraper.get_bracket_teams(standingsDf)
+
+
+def test_sim_seeds_league_standings_beside_farm_standings(statsDir):
+    write_standings(statsDir)
+    args = scraper.parse_args(["sim", "2024", "--sims", "1000", "--seed", "1"])
+
+    scraper.run_sim(statsDir, args)
+
+    oddsDf = pd.read_csv(os.path.join(statsDir, "2024", "2024BracketOdds.csv"))
+    assert list(oddsDf["League"]) == ["CL"] * 3 + ["PL"] * 3
+    npbTeams = scraper.get_team_registry("2024", ["NPB"])["Team"]
+    assert oddsDf["Team"].isin(npbTeams).all()
+    # One champion per bracket
+    assert oddsDf["Champion"].sum() == pytest.approx(1.0)
+
+
+def test_bracket_seeds_leagues_with_run_environment(statsDir):
+    write_standings(statsDir)
+    standingsDf = load_year_standings(statsDir, ["C", "P"])
+    yearDir = os.path.join(statsDir, "2024")
+    # Stand in regular season files with the same format
+    for suffix in ["BP", "PP"]:
+        shutil.copy(
+            os.path.join(yearDir, "2024StatsRaw" + suffix + ".csv"),
+            os.path.join(yearDir, "2024StatsRaw" + suffix[0] + "R.csv"),
+        )
+    envDf = scraper.get_team_run_environment(
+        scraper.StatCache(statsDir), "2024"
+    )
+
+    bracketDf = scraper.get_bracket_teams(standingsDf, envDf)
+
+    assert list(bracketDf["Team"]) == [
+        "Yomiuri Giants",
+        "Hanshin Tigers",
+        "DeNA BayStars",
+        "SoftBank Hawks",
+        "Nipponham Fighters",
+        "Lotte Marines",
+    ]
+    envPcts = scraper.calc_expected_records(envDf.copy()).set_index("Team")
+    expected = bracketDf["Team"].map(envPcts["PythagenpatPCT"])
+    pd.testing.assert_series_equal(
+        bracketDf["WinPct"], expected, check_names=False
+    )
+    # Without regular season stats the standings' runs are used
+    standingsPcts = standingsDf.set_index("Team")["PythagenpatPCT"]
+    bracketDf = scraper.get_bracket_teams(standingsDf)
+    pd.testing.assert_series_equal(
+        bracketDf["WinPct"],
+        bracketDf["Team"].map(standingsPcts),
+        check_names=False,
+    )
@@ -0,0 +1,47 @@
+import json
+import os
+import re
+
+import npbPlayoffScraper as scraper
+
+
+def get_page_sort(pageFile):
+    """Reads the sort indexes embedded in a site page"""
+    with open(pageFile, encoding="utf-8") as pageIn:
+        page = pageIn.read()
+    return json.loads(re.search(r"const SORT = (.*);", page).group(1))
+
+
+def test_site_renders_sortable_pages_once(statsDir, capsys):
+    args = scraper.parse_args(["site"])
+    scraper.run_site(statsDir, args)
+
+    siteDir = os.path.join(statsDir, "site")
+    assert sorted(os.listdir(os.path.join(siteDir, "2024"))) == [
+        "Batting.html",
+        "Pitching.html",
+        "TeamBatting.html",
+        "TeamPitching.html",
+    ]
+    with open(os.path.join(siteDir, "index.html")) as indexIn:
+        index = indexIn.read()
+    assert '<a href="2024/Pitching.html">' in index
+    assert "4 changed pages rendered" in capsys.readouterr().out
+
+    pageFile = os.path.join(siteDir, "2024", "TeamPitching.html")
+    sortIndexes = get_page_sort(pageFile)
+    tables = scraper.StatCache(statsDir).get_site_tables("2024")
+    teamDf = tables["Team Pitching"][1]
+    # Lower ERA is better, so the page sorts it ascending first
+    eraSort = sortIndexes["ERA"]
+    assert eraSort["first"] == "asc"
+    eras = [float(teamDf["ERA"][i]) for i in eraSort["order"]]
+    assert eras == sorted(eras)
+    assert sortIndexes["W"]["first"] == "desc"
+    assert "TeamLink" not in sortIndexes
+
+    # Unchanged data isn't rendered again
+    mtime = os.stat(pageFile).st_mtime_ns
+    scraper.run_site(statsDir, args)
+    assert "0 changed pages rendered" in capsys.readouterr().out
+    assert os.stat(pageFile).st_mtime_ns == mtime
@@ -0,0 +1,35 @@
+import os
+
+import npbPlayoffScraper as scraper
+
+
+def test_standings_expected_records_and_head_to_head(statsDir, capsys):
+    standingsFiles = {
+        key: fileName
+        for key, fileName in scraper.find_standings_files(statsDir).items()
+        if key[0] == "2024"
+    }
+    assert sorted(standingsFiles) == [("2024", "E"), ("2024", "W")]
+    standingsDf, h2hDf = scraper.load_standings(statsDir, standingsFiles)
+
+    deNA = standingsDf.set_index("Team").loc["DeNA BayStars"]
+    assert (deNA["W"], deNA["L"], deNA["T"]) == (69, 48, 9)
+    pythagPct = 533**1.83 / (533**1.83 + 436**1.83)
+    assert deNA["PythagPCT"] == round(pythagPct, 3)
+    runsPerGame = (533 + 436) / 126
+    assert deNA["PythagenpatExp"] == round(runsPerGame**0.287, 3)
+
+    h2hDf = h2hDf.set_index(["Team", "Opponent"])
+    record = h2hDf.loc[("DeNA BayStars", "Yomiuri Giants")]
+    assert (record["W"], record["L"], record["T"]) == (11, 8, 1)
+    # Each pairing is recorded from both sides
+    reverse = h2hDf.loc[("Yomiuri Giants", "DeNA BayStars")]
+    assert (reverse["W"], reverse["L"]) == (record["L"], record["W"])
+
+    # Seasons are cached in the year directory and reused
+    calcFile = os.path.join(statsDir, "2024", "2024StandingsCalcE.csv")
+    calcMtime = os.stat(calcFile).st_mtime_ns
+    args = scraper.parse_args(["standings", "2024"])
+    scraper.run_standings(statsDir, args)
+    assert os.stat(calcFile).st_mtime_ns == calcMtime
+    assert "2024 E head to head wins" in capsys.readouterr().out
@@ -0,0 +1,51 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import npbPlayoffScraper as scraper
+
+
+def read_final(statsDir, fileName):
+    df = pd.read_csv(os.path.join(statsDir, "2024", "npb", fileName))
+    # Team names without their links ("League Average" has none)
+    teams = df["Team"].str.extract(r">(.*)</a>", expand=False)
+    df["Team"] = teams.fillna(df["Team"])
+    return df.set_index("Team")
+
+
+def test_farm_suffixes_share_the_pipeline(statsDir, capsys):
+    yearDir = os.path.join(statsDir, "2024")
+    # Farm stand ins with the post season rows
+    for suffix, farmSuffix in [("BP", "BF"), ("PP", "PF")]:
+        shutil.copy(
+            os.path.join(yearDir, "2024StatsRaw" + suffix + ".csv"),
+            os.path.join(yearDir, "2024StatsRaw" + farmSuffix + ".csv"),
+        )
+
+    rebuilt = scraper.regenerate_suffixes(
+        statsDir, "2024", list(scraper.STAT_SUFFIXES), jobs=2
+    )
+
+    assert rebuilt == [
+        suffix + " " + stage
+        for suffix in ["BP", "PP", "BF", "PF"]
+        for stage in ["org", "playerOut", "teamOut"]
+    ]
+    assert "skipping BR" in capsys.readouterr().out
+    postDf = read_final(statsDir, "2024TeamPP.csv")
+    farmDf = read_final(statsDir, "2024TeamPF.csv")
+    pd.testing.assert_index_equal(farmDf.index, postDf.index)
+    # Farm rows use the farm leagues and FIP constant
+    farmLeagues = scraper.map_team_column(
+        farmDf.index.to_series().drop("League Average"), "FarmLeague"
+    )
+    assert (farmDf["League"].drop("League Average") == farmLeagues).all()
+    assert farmDf.loc["DeNA BayStars", "League"] == "EL"
+    assert postDf.loc["DeNA BayStars", "League"] == "CL"
+    fipDiff = farmDf["FIP"] - postDf["FIP"]
+    assert fipDiff.to_numpy() == pytest.approx(3.460 - 3.088, abs=0.011)
+    pd.testing.assert_series_equal(farmDf["ERA"], postDf["ERA"])
+    farmBatDf = read_final(statsDir, "2024StatsFinalBF.csv")
+    assert set(farmBatDf["League"]) <= {"EL", "WL"}
@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+import pytest
+
+import npbPlayoffScraper as scraper
+
+
+@pytest.mark.parametrize("suffix,col", [("BP", "H"), ("PP", "SO")])
+def test_update_team_matches_full_rebuild(statsDir, suffix, col):
+    yearDir = os.path.join(statsDir, "2024")
+    playerData = scraper.PlayerData(statsDir, yearDir, suffix, "2024")
+    teamData = scraper.TeamData(
+        playerData.df, statsDir, yearDir, suffix, "2024"
+    )
+    playerDf = playerData.df.copy()
+    team = playerDf["Team"].iloc[0]
+    row = playerDf.index[playerDf["Team"] == team][0]
+    playerDf.loc[row, col] = playerDf.loc[row, col] + 5
+
+    teamData.update_team(team, playerDf)
+    fullData = scraper.TeamData(playerDf, statsDir, yearDir, suffix, "2024")
+
+    pd.testing.assert_series_equal(
+        teamData.store.league, fullData.store.league
+    )
+    pd.testing.assert_frame_equal(teamData.df, fullData.df)
@@ -0,0 +1,56 @@
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+FARM_CLUBS = ["Oisix Albirex", "HAYATE Ventures"]
+
+
+def test_registry_filters_by_year_and_level():
+    allTeams = list(scraper.get_team_registry()["Team"])
+    assert len(allTeams) == 14
+    npbTeams = scraper.get_team_registry("2024", ["NPB"])["Team"]
+    assert list(npbTeams) == allTeams[:12]
+    farmTeams = scraper.get_team_registry("2024", ["NPB", "Farm"])["Team"]
+    assert list(farmTeams) == allTeams
+    # The new farm clubs only joined in 2024
+    teams2023 = list(scraper.get_team_registry("2023")["Team"])
+    assert teams2023 == allTeams[:12]
+    assert not set(FARM_CLUBS) & set(teams2023)
+
+
+def test_map_team_column_looks_up_every_team():
+    teams = pd.Series(
+        ["DeNA BayStars", "Oisix Albirex", "Unknown Club", "DeNA BayStars"],
+        index=[3, 1, 7, 0],
+    )
+    abbs = scraper.map_team_column(teams, "Abb")
+    pd.testing.assert_index_equal(abbs.index, teams.index)
+    assert list(abbs.loc[[3, 1, 0]]) == ["DeNA", "Oisix", "DeNA"]
+    assert pd.isna(abbs.loc[7])
+    leagues = scraper.map_team_column(teams, "League")
+    assert list(leagues.loc[[3, 1]]) == ["CL", "EL"]
+    assert pd.isna(leagues.loc[7])
+
+    # Farm suffixes assign the farm leagues, unknown teams keep theirs
+    df = pd.DataFrame({"Team": teams, "League": ["", "", "XL", ""]})
+    assert list(scraper.select_league(df.copy(), "BP")["League"]) == [
+        "CL",
+        "EL",
+        "XL",
+        "CL",
+    ]
+    assert list(scraper.select_league(df.copy(), "BF")["League"]) == [
+        "EL",
+        "EL",
+        "XL",
+        "EL",
+    ]
+
+
+def test_team_lookups_split_short_names():
+    teamDf = scraper.get_team_registry()
+    shortNames = scraper.build_team_dict(teamDf, "Short", "Team")
+    assert shortNames["巨人"] == shortNames["読売"] == "Yomiuri Giants"
+    assert shortNames["ハヤテ"] == "HAYATE Ventures"
+    # Clubs without an npb.jp stat page code are left out
+    assert set(scraper.get_team_codes().values()) == set(teamDf["Team"][:12])
@@ -0,0 +1,38 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+ROWS = 5000
+
+
+def test_validate_raw_stats_catches_injected_faults():
+    content, badRows, teams = scraper.make_validate_sample(ROWS)
+    fieldCounts = scraper.get_raw_field_counts(content)
+    # Only the short row at the end has the wrong field count
+    assert np.flatnonzero(fieldCounts != fieldCounts[0]).tolist() == [ROWS + 1]
+
+    df = pd.read_csv(io.BytesIO(content), skiprows=[ROWS + 1])
+    failures = scraper.validate_raw_stats(df, "BP", teams)
+    failed = np.zeros(ROWS, dtype=bool)
+    for checkFailed in failures.values():
+        failed |= checkFailed
+    np.testing.assert_array_equal(np.flatnonzero(failed), badRows)
+    assert failures["team"][500]
+    assert failures["H >= 2B + 3B + HR"][0]
+
+
+def test_read_raw_stats_quarantines_bad_rows(tmp_path):
+    content, badRows, teams = scraper.make_validate_sample(ROWS)
+    yearDir = tmp_path / "2024"
+    yearDir.mkdir()
+    (yearDir / "2024StatsRawBP.csv").write_bytes(content)
+
+    df = scraper.read_raw_stats(str(yearDir), "BP", "2024")
+
+    assert len(df) == ROWS - len(badRows)
+    quarantineDf = pd.read_csv(yearDir / "quarantine" / "2024StatsRawBP.csv")
+    # Lines count from the header (line 1), the short row is last
+    assert quarantineDf["Line"].tolist() == list(badRows + 2) + [ROWS + 2]
@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+
+import npbPlayoffScraper as scraper
+
+from conftest import copy_season
+
+
+def load_two_seasons(statsDir):
+    """Loads the 2024 raw files as both the 2023 and 2024 seasons"""
+    copy_season(statsDir, "2023")
+    warehouse = scraper.Warehouse(os.path.join(statsDir, "npbPostseason.db"))
+    cache = scraper.StatCache(statsDir)
+    for year in ["2023", "2024"]:
+        assert warehouse.load_season(cache, year) == ["BP", "PP"]
+    return warehouse
+
+
+def test_player_totals_merge_romanizations(statsDir):
+    warehouse = load_two_seasons(statsDir)
+    seasonDf = warehouse.query(
+        "SELECT PlayerID, PA FROM player_bat WHERE Name = 'Austin Tyler'"
+    )
+    playerId = seasonDf["PlayerID"].iloc[0]
+    # The same player romanized differently in one season
+    warehouse.conn.execute(
+        "UPDATE player_bat SET Name = 'Austin Ty' WHERE Year = 2023 AND "
+        "PlayerID = ?",
+        (playerId,),
+    )
+
+    for lookup in [playerId, "Austin Tyler", "Austin Ty"]:
+        df = warehouse.player_totals(lookup)
+        assert len(df) == 1
+        assert df["Seasons"].iloc[0] == 2
+        assert df["PA"].iloc[0] == seasonDf["PA"].sum()
+    assert len(warehouse.player_history("Austin Tyler")) == 2
+    warehouse.close()
+
+
+def test_pitching_ip_sums_in_thirds(statsDir):
+    warehouse = load_two_seasons(statsDir)
+    # Stored in thirds, so two seasons of 16.1 IP sum to 32.2
+    totalDf = warehouse.query(
+        "SELECT SUM(IP) AS IP FROM player_pitch WHERE Name = 'Kay Anthony'"
+    )
+    assert scraper.convert_ip_column_out(totalDf).iloc[0] == 32.2
+
+    historyDf = warehouse.player_history("Kay Anthony", "PP")
+    assert list(historyDf["IP"]) == [16.1, 16.1]
+    teamDf = warehouse.team_history("DeNA", "PP")
+    pd.testing.assert_series_equal(
+        teamDf["IP"], pd.Series([124.0, 124.0]), check_names=False
+    )
+    warehouse.close()
@@ -0,0 +1,71 @@
+import os
+import shutil
+
+import npbPlayoffScraper as scraper
+
+from conftest import REPO_DIR
+
+
+def edit_raw_hits(statsDir, suffix):
+    """Adds a hit to the first row of a copied raw stat file and moves its
+    mtime forward so the edit is always seen"""
+    rawFile = os.path.join(statsDir, "2024", "2024StatsRaw" + suffix + ".csv")
+    with open(rawFile, encoding="utf-8") as f:
+        header, first, *rows = f.read().splitlines()
+    fields = first.split(",")
+    fields[5] = str(int(fields[5]) + 1)
+    with open(rawFile, "w", encoding="utf-8") as f:
+        f.write("\n".join([header, ",".join(fields)] + rows) + "\n")
+    mtime = os.stat(rawFile).st_mtime_ns + 10**9
+    os.utime(rawFile, ns=(mtime, mtime))
+
+
+def test_watch_rebuilds_only_edited_raw_file(statsDir, monkeypatch, capsys):
+    calls = []
+
+    def fake_sleep(seconds):
+        calls.append(seconds)
+        if len(calls) == 1:
+            edit_raw_hits(statsDir, "BP")
+        elif len(calls) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(scraper, "sleep", fake_sleep)
+    scraper.run_watch(statsDir, 0.5, 0)
+
+    out = capsys.readouterr().out
+    assert "2024 rebuilt: BP org, BP playerOut, BP teamOut" in out
+    assert "PP" not in out
+    assert "Stopped watching" in out
+    finalDir = os.path.join(statsDir, "2024", "npb")
+    assert sorted(os.listdir(finalDir)) == [
+        "2024StatsFinalBP.csv",
+        "2024TeamBP.csv",
+    ]
+
+
+def test_watch_plans_input_edits_by_year(tmp_path):
+    rawSuffixes = {"2023": ["BP", "PP"], "2024": ["BP", "PP"]}
+    fipFile = str(tmp_path / "fipConst.csv")
+    shutil.copy(os.path.join(REPO_DIR, "input", "fipConst.csv"), fipFile)
+    oldYearRows = {"fipConst.csv": scraper.get_year_rows(fipFile)}
+    with open(fipFile, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    lines = [
+        line.replace(",NPB", ",Post") if line.startswith("2024,") else line
+        for line in lines
+    ]
+    with open(fipFile, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    plan = scraper.plan_watch_rebuild([fipFile], oldYearRows, rawSuffixes)
+
+    # FIP constants only affect the edited year's pitching
+    assert plan == {("2024", "PP"): {"org"}}
+    translationFile = str(tmp_path / "nameTranslations.csv")
+    plan = scraper.plan_watch_rebuild([translationFile], {}, rawSuffixes)
+    assert plan == {
+        (year, suffix): {"playerOut"}
+        for year in rawSuffixes
+        for suffix in ["BP", "PP"]
+    }